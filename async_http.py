@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+asyncio HTTP 유틸리티 모듈
+LLM 클라이언트, 목업 서버, HTTP 서비스가 함께 쓰는 최소한의 HTTP/1.1 처리
+"""
+
+import asyncio
+import json
+import ssl
+from urllib.parse import urlsplit
+
+from records import json_default
+
+STATUS_TEXT = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    429: 'Too Many Requests',
+    500: 'Internal Server Error',
+    503: 'Service Unavailable'
+}
+
+MAX_BODY_SIZE = 16 * 1024 * 1024
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+_ssl_context = None
+
+
+class HTTPError(Exception):
+    """HTTP 상태 코드가 있는 오류"""
+
+    def __init__(self, status, message='', headers=None):
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+
+async def _read_headers(reader):
+    """상태/요청 줄과 헤더 읽기"""
+    start_line = await reader.readline()
+    if not start_line:
+        return None, None
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    return start_line.decode('latin-1').rstrip('\r\n'), headers
+
+
+async def _read_body(reader, headers):
+    length = int(headers.get('content-length', 0) or 0)
+    if length > MAX_BODY_SIZE:
+        raise HTTPError(413, "요청 본문이 너무 큽니다.")
+    return await reader.readexactly(length) if length else b''
+
+
+async def _read_response_body(reader, headers):
+    """응답 본문 읽기 (Content-Length, chunked, 또는 연결 종료까지)"""
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        chunks = []
+        size = 0
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise asyncio.IncompleteReadError(b''.join(chunks), None)
+            length = int(line.split(b';', 1)[0].strip() or b'0', 16)
+            if length == 0:
+                # 트레일러 헤더는 버림
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return b''.join(chunks)
+            size += length
+            if size > MAX_BODY_SIZE:
+                raise HTTPError(413, "응답 본문이 너무 큽니다.")
+            chunks.append(await reader.readexactly(length))
+            await reader.readexactly(2)
+    if 'content-length' in headers:
+        return await _read_body(reader, headers)
+    body = await reader.read(MAX_BODY_SIZE + 1)
+    if len(body) > MAX_BODY_SIZE:
+        raise HTTPError(413, "응답 본문이 너무 큽니다.")
+    return body
+
+
+def _get_ssl_context():
+    """https 요청용 공용 SSL 컨텍스트 (시스템 인증서로 검증)"""
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = ssl.create_default_context()
+    return _ssl_context
+
+
+async def read_request(reader):
+    """요청 하나 읽기: (method, path, headers, body), 연결 종료 시 None"""
+    start_line, headers = await _read_headers(reader)
+    if start_line is None:
+        return None
+
+    parts = start_line.split(' ')
+    if len(parts) != 3:
+        raise HTTPError(400, "잘못된 요청 줄")
+    method, path, version = parts
+    headers[':version'] = version
+    body = await _read_body(reader, headers)
+    return method, path, headers, body
+
+
+def wants_keep_alive(headers):
+    """HTTP/1.1 기본 keep-alive, Connection 헤더 우선"""
+    connection = headers.get('connection', '').lower()
+    if headers.get(':version') == 'HTTP/1.0':
+        return connection == 'keep-alive'
+    return connection != 'close'
+
+
+def build_response(status, payload, keep_alive=True, headers=None):
+    """JSON 응답 바이트 생성"""
+    body = json.dumps(payload, ensure_ascii=False, default=json_default).encode('utf-8')
+    lines = [
+        f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'Unknown')}",
+        "Content-Type: application/json; charset=utf-8",
+        f"Content-Length: {len(body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}"
+    ]
+    for name, value in (headers or {}).items():
+        lines.append(f"{name}: {value}")
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+
+def split_url(url):
+    """http/https URL을 (scheme, host, port, 경로+쿼리)로 분리 (그 외는 ValueError)"""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        raise ValueError(f"지원하지 않는 URL: {url} (http/https만 가능)")
+    path = parts.path or '/'
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    return scheme, parts.hostname, parts.port or DEFAULT_PORTS[scheme], path
+
+
+async def post_json(url, payload, timeout=30.0, headers=None):
+    """JSON POST 요청 후 (status, headers, 파싱된 본문) 반환 (http/https, 본문이 없으면 None)
+
+    본문이 JSON이 아니면 ValueError를 낸다.
+    """
+    scheme, host, port, path = split_url(url)
+    ssl_context = _get_ssl_context() if scheme == 'https' else None
+
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    request_lines = [
+        f"POST {path} HTTP/1.1",
+        f"Host: {host}" if port == DEFAULT_PORTS[scheme] else f"Host: {host}:{port}",
+        "Content-Type: application/json; charset=utf-8",
+        f"Content-Length: {len(body)}",
+        "Connection: close"
+    ]
+    for name, value in (headers or {}).items():
+        request_lines.append(f"{name}: {value}")
+    request = ('\r\n'.join(request_lines) + '\r\n\r\n').encode('latin-1') + body
+
+    async def exchange():
+        reader, writer = await asyncio.open_connection(host, port, ssl=ssl_context)
+        try:
+            writer.write(request)
+            await writer.drain()
+            status_line, response_headers = await _read_headers(reader)
+            if status_line is None:
+                raise ConnectionError("응답 없이 연결이 종료되었습니다.")
+            status = int(status_line.split(' ')[1])
+            response_body = await _read_response_body(reader, response_headers)
+            return status, response_headers, json.loads(response_body) if response_body else None
+        finally:
+            writer.close()
+
+    return await asyncio.wait_for(exchange(), timeout)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+카탈로그 일괄 처리 모듈
+JSONL/CSV 카탈로그를 한 줄씩 읽어 결과를 JSONL(또는 컬럼형)로 스트리밍 저장
+"""
+
+import csv
+import json
+import logging
+import os
+import time
+
+from records import json_default
+
+logger = logging.getLogger('casatrade.batch')
+
+NUMERIC_FIELDS = {
+    'auction_price': float,
+    'price_unit': float,
+    'auction_price_jpy': float,
+    'domestic_price_krw': int,
+    'month': int
+}
+
+
+def iter_items(path):
+    """카탈로그 파일에서 아이템을 하나씩 읽는 제너레이터"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        yield from _iter_csv(path)
+    elif ext in ('.jsonl', '.ndjson', '.json'):
+        yield from _iter_jsonl(path)
+    else:
+        raise ValueError(f"지원하지 않는 카탈로그 형식: {path}")
+
+
+def _iter_jsonl(path):
+    with open(path, encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_no} JSON 파싱 오류: {e}") from e
+
+
+def _iter_csv(path):
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            yield _coerce_row(row)
+
+
+def _coerce_row(row):
+    """CSV 문자열 값을 숫자로 변환 (빈 값은 누락 처리)"""
+    item = {}
+    for key, value in row.items():
+        if value is None or value == '':
+            continue
+        converter = NUMERIC_FIELDS.get(key)
+        if converter is not None:
+            number = float(value)
+            value = int(number) if converter is int or number.is_integer() else number
+        item[key] = value
+    return item
+
+
+def process_item_safely(marketer, item, process_options=None):
+    """아이템 하나를 처리하고, 실패하면 카탈로그 전체를 멈추지 않도록 오류 레코드 반환"""
+    try:
+        return marketer.process_item(item, **(process_options or {}))
+    except Exception as e:
+        lot_id = item.get('lot_id') if isinstance(item, dict) else None
+        logger.warning("⚠️ 아이템 처리 실패 (lot_id=%s): %s: %s", lot_id, type(e).__name__, e)
+        return {'error': f"{type(e).__name__}: {e}", 'lot_id': lot_id}
+
+
+def write_results(results, output_path, dedup=None):
+    """결과를 생성되는 즉시 JSONL로 기록하고 처리 통계 반환 (.cols 경로는 컬럼형 저장)
+
+    dedup(PostDeduplicator)을 주면 기록 전에 게시물 중복 클러스터를 배정한다.
+    'error' 키가 있는 오류 레코드는 그대로 기록하고 통계의 errors로 센다.
+    """
+    if dedup is not None:
+        results = dedup.process(results)
+    if os.path.splitext(output_path)[1].lower() == '.cols':
+        from columnar_store import write_columnar
+        return write_columnar(results, output_path)
+
+    count = 0
+    errors = 0
+    start = time.perf_counter()
+
+    with open(output_path, 'w', encoding='utf-8') as out:
+        for result in results:
+            out.write(json.dumps(result, ensure_ascii=False, default=json_default))
+            out.write('\n')
+            count += 1
+            if 'error' in result:
+                errors += 1
+
+    elapsed = time.perf_counter() - start
+    return {
+        'items': count,
+        'errors': errors,
+        'elapsed_sec': elapsed,
+        'items_per_sec': count / elapsed if elapsed > 0 else 0.0
+    }
+
+
+def run_batch(marketer, input_path, output_path, dedup=None, process_options=None):
+    """카탈로그 파일 전체를 스트리밍 처리 (process_options는 process_item 인자)"""
+    results = (process_item_safely(marketer, item, process_options) for item in iter_items(input_path))
+    return write_results(results, output_path, dedup)
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+벤치마크 모듈
+합성 카탈로그로 모듈별/전체 처리량과 메모리 피크를 측정하고 기준값과 비교
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from synthetic_catalog import generate_items, generate_sales, mix_currencies
+
+logger = logging.getLogger('casatrade.benchmark')
+
+DEFAULT_SIZES = [1000, 100000, 1000000]
+POOL_SIZE = 10000  # 미리 만들어 두고 순환 사용할 아이템 수
+MEMORY_SAMPLE = 10000  # tracemalloc 측정에 사용할 최대 아이템 수
+REPEAT = 3  # 처리량은 반복 실행 중 가장 빠른 값 (첫 실행의 지연 임포트·캐시 워밍업 제외)
+SALES_SIZE = 200000  # 시세 조회 벤치마크 인덱스의 판매 기록 수
+MIXED_CURRENCY_SHARE = 0.75  # 다통화 배치 벤치마크에서 엔화가 아닌 아이템 비율
+DEFAULT_BASELINE = 'bench_baseline.json'  # 저장소에 커밋된 기준값 (--save-baseline으로 갱신)
+
+
+class BenchmarkContext:
+    """벤치마크에서 공유하는 모듈 인스턴스와 사전 계산 결과"""
+
+    def __init__(self, pool, with_price_index=False):
+        from calculator import PriceCalculator
+        from cta_manager import CTAManager
+        from main import CasaTradeAIMarketer
+        from master_prompt_system import MasterPromptSystem
+        from persona_generator import PersonaGenerator
+        from records import Item
+        from strategy_analyzer import StrategyAnalyzer
+
+        self.pool = pool
+        self.mixed_pool = list(mix_currencies(pool, share=MIXED_CURRENCY_SHARE))
+        self.calculator = PriceCalculator()
+        self.strategy_analyzer = StrategyAnalyzer()
+        self.persona_generator = PersonaGenerator()
+        self.cta_manager = CTAManager()
+        self.master_prompt_system = MasterPromptSystem()
+        self.marketer = CasaTradeAIMarketer()
+
+        # 하위 단계 벤치마크용 입력 (측정 시간에서 제외)
+        self.prices = [self.calculator.calculate_total_cost(item) for item in pool]
+        self.items = [Item.from_dict(item) for item in pool]
+        self.strategies = [
+            self.strategy_analyzer.analyze_strategy(item, price) for item, price in zip(pool, self.prices)
+        ]
+
+        # 시세 조회 벤치마크용 인덱스 (합성 판매 기록으로 생성, 메모 없이 매번 검색)
+        self.price_index = None
+        if with_price_index:
+            from price_index import DomesticPriceIndex
+            sales = ((sale['brand'], sale['model'], sale['rank'], sale['price_krw'])
+                     for sale in generate_sales(SALES_SIZE))
+            self.price_index = DomesticPriceIndex.from_rows(sales, memo_size=0)
+
+    def iter_indices(self, count):
+        """풀 인덱스를 count번 순환 (추가 메모리 없이)"""
+        size = len(self.pool)
+        return (index % size for index in range(count))
+
+    def iter_batches(self, count, pool=None):
+        """count개를 풀 크기 단위 묶음으로 나눠 반환"""
+        pool = self.pool if pool is None else pool
+        remaining = count
+        while remaining > 0:
+            size = min(remaining, len(pool))
+            yield pool[:size]
+            remaining -= size
+
+
+def bench_calculator(ctx, count):
+    calculate = ctx.calculator.calculate_total_cost
+    pool = ctx.pool
+    for index in ctx.iter_indices(count):
+        calculate(pool[index])
+
+
+def bench_calculator_records(ctx, count):
+    calculate = ctx.calculator.calculate_breakdown
+    items = ctx.items
+    for index in ctx.iter_indices(count):
+        calculate(items[index])
+
+
+def bench_retain_price_dicts(ctx, count):
+    """가격 계산 결과를 dict로 보관 (메모리 피크 = 결과 보관 비용)"""
+    calculate = ctx.calculator.calculate_total_cost
+    pool = ctx.pool
+    results = [calculate(pool[index]) for index in ctx.iter_indices(count)]
+    return sum(result['total_cost_krw'] for result in results)
+
+
+def bench_retain_price_records(ctx, count):
+    """가격 계산 결과를 PriceBreakdown 레코드로 보관"""
+    calculate = ctx.calculator.calculate_breakdown
+    items = ctx.items
+    results = [calculate(items[index]) for index in ctx.iter_indices(count)]
+    return sum(result.total_cost_krw for result in results)
+
+
+def bench_calculator_batch(ctx, count):
+    for batch in ctx.iter_batches(count):
+        ctx.calculator.calculate_total_cost_batch(batch)
+
+
+def bench_calculator_batch_mixed(ctx, count):
+    """엔화/달러/유로/홍콩달러가 섞인 묶음 (교차 환율 행렬 인덱싱)"""
+    for batch in ctx.iter_batches(count, ctx.mixed_pool):
+        ctx.calculator.calculate_total_cost_batch(batch)
+
+
+def bench_strategy(ctx, count):
+    analyze = ctx.strategy_analyzer.analyze_strategy
+    pool, prices = ctx.pool, ctx.prices
+    for index in ctx.iter_indices(count):
+        analyze(pool[index], prices[index])
+
+
+def bench_strategy_batch(ctx, count):
+    for batch in ctx.iter_batches(count):
+        prices = ctx.calculator.calculate_total_cost_batch(batch)
+        ctx.strategy_analyzer.classify_batch(batch, prices['total_cost_krw'])
+
+
+def bench_persona(ctx, count):
+    generate = ctx.persona_generator.generate_content
+    pool, prices, strategies = ctx.pool, ctx.prices, ctx.strategies
+    for index in ctx.iter_indices(count):
+        strategy = strategies[index]
+        for persona in strategy['recommended_personas']:
+            generate(pool[index], prices[index], strategy, persona)
+
+
+def bench_cta(ctx, count):
+    get_cta = ctx.cta_manager.get_cta
+    strategies = ctx.strategies
+    for index in ctx.iter_indices(count):
+        strategy = strategies[index]
+        for persona in strategy['recommended_personas']:
+            get_cta(persona, strategy)
+
+
+def bench_master_prompt(ctx, count):
+    for batch in ctx.iter_batches(count):
+        ctx.master_prompt_system.generate_master_prompts(batch)
+
+
+def bench_creative_analysis(ctx, count):
+    analyze = ctx.master_prompt_system.analyze_creative_potential
+    pool = ctx.pool
+    for index in ctx.iter_indices(count):
+        analyze(pool[index])
+
+
+def bench_end_to_end(ctx, count):
+    """추천 페르소나 콘텐츠까지 모두 렌더링"""
+    process = ctx.marketer.process_item
+    pool = ctx.pool
+    for index in ctx.iter_indices(count):
+        dict(process(pool[index])['contents'])
+
+
+def bench_single_persona(ctx, count):
+    """채널 하나(페르소나 하나)만 렌더링"""
+    process = ctx.marketer.process_item
+    pool = ctx.pool
+    for index in ctx.iter_indices(count):
+        dict(process(pool[index], personas=('mz',))['contents'])
+
+
+def bench_pricing_strategy(ctx, count):
+    """콘텐츠 생성 없이 가격 계산과 전략 분석만"""
+    process = ctx.marketer.process_item
+    pool = ctx.pool
+    for index in ctx.iter_indices(count):
+        process(pool[index], generate_content=False)
+
+
+def bench_price_lookup(ctx, count):
+    """국내 시세 인덱스 퍼지 검색 (메모 없이)"""
+    estimate = ctx.price_index.estimate
+    items = ctx.items
+    for index in ctx.iter_indices(count):
+        item = items[index]
+        estimate(item.name, item.brand, item.rank)
+
+
+BENCHMARKS = {
+    'calculator': bench_calculator,
+    'calculator_records': bench_calculator_records,
+    'retain_price_dicts': bench_retain_price_dicts,
+    'retain_price_records': bench_retain_price_records,
+    'calculator_batch': bench_calculator_batch,
+    'calculator_batch_mixed': bench_calculator_batch_mixed,
+    'strategy': bench_strategy,
+    'strategy_batch': bench_strategy_batch,
+    'persona': bench_persona,
+    'cta': bench_cta,
+    'master_prompt': bench_master_prompt,
+    'creative_analysis': bench_creative_analysis,
+    'end_to_end': bench_end_to_end,
+    'single_persona': bench_single_persona,
+    'pricing_strategy': bench_pricing_strategy,
+    'price_lookup': bench_price_lookup
+}
+
+
+def run_benchmark(ctx, name, count, memory_sample=MEMORY_SAMPLE, repeat=REPEAT):
+    """처리량(repeat회 중 최소 시간)과 메모리 피크(tracemalloc, 별도 실행)를 측정"""
+    bench = BENCHMARKS[name]
+
+    elapsed = float('inf')
+    for _ in range(max(repeat, 1)):
+        gc.collect()
+        start = time.perf_counter()
+        bench(ctx, count)
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    memory_items = min(count, memory_sample)
+    gc.collect()
+    tracemalloc.start()
+    bench(ctx, memory_items)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'items': count,
+        'seconds': elapsed,
+        'items_per_sec': count / elapsed if elapsed > 0 else 0.0,
+        'peak_bytes': peak,
+        'memory_items': memory_items
+    }
+
+
+def compare_with_baseline(results, baseline, tolerance, memory_tolerance):
+    """기준값 대비 처리량 하락/메모리 증가가 허용치를 넘는 항목 반환"""
+    regressions = []
+    for key, result in results.items():
+        reference = baseline.get('results', {}).get(key)
+        if reference is None:
+            continue
+        if result['items_per_sec'] < reference['items_per_sec'] * (1 - tolerance):
+            regressions.append(f"{key}: 처리량 {result['items_per_sec']:,.0f}/s "
+                               f"< 기준 {reference['items_per_sec']:,.0f}/s")
+        if result['peak_bytes'] > reference['peak_bytes'] * (1 + memory_tolerance):
+            regressions.append(f"{key}: 메모리 피크 {result['peak_bytes']:,}B "
+                               f"> 기준 {reference['peak_bytes']:,}B")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="까사트레이드 AI 마케터 벤치마크")
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help="아이템 수 목록 (쉼표 구분)")
+    parser.add_argument('--only', help=f"실행할 벤치마크 (쉼표 구분): {', '.join(BENCHMARKS)}")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--memory-sample', type=int, default=MEMORY_SAMPLE)
+    parser.add_argument('--repeat', type=int, default=REPEAT, help="처리량 측정 반복 횟수 (최소 시간 사용)")
+    parser.add_argument('--output', default='bench_results.json', help="결과 JSON 파일")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="비교할 기준 결과 JSON")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="비교하지 않고 이번 결과를 --baseline 파일에 기준값으로 저장")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="허용 처리량 하락 비율")
+    parser.add_argument('--memory-tolerance', type=float, default=0.5, help="허용 메모리 증가 비율")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """벤치마크 실행"""
+    args = parse_args(argv)
+    # 측정 대상 모듈의 아이템별 진행 로그는 끄고 벤치마크 보고만 출력
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+    logger.setLevel(logging.INFO)
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    names = args.only.split(',') if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise SystemExit(f"알 수 없는 벤치마크: {', '.join(unknown)}")
+
+    pool = list(generate_items(min(max(sizes), POOL_SIZE), seed=args.seed))
+    ctx = BenchmarkContext(pool, with_price_index='price_lookup' in names)
+
+    results = {}
+    for name in names:
+        for size in sizes:
+            key = f"{name}@{size}"
+            result = run_benchmark(ctx, name, size, args.memory_sample, args.repeat)
+            results[key] = result
+            logger.info("%-28s %14s items/s %9.3fs  peak %10s KiB", key, f"{result['items_per_sec']:,.0f}",
+                        result['seconds'], f"{result['peak_bytes'] / 1024:,.1f}")
+
+    report = {
+        'meta': {
+            'created_at': datetime.now().isoformat(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'pool_size': len(pool)
+        },
+        'results': results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    logger.info("📄 결과 저장 → %s", args.output)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        logger.info("📌 기준값 저장 → %s", args.baseline)
+        return 0
+    if not os.path.exists(args.baseline):
+        logger.warning("⚠️ 기준값 파일이 없어 회귀 검사를 건너뜁니다: %s (--save-baseline으로 생성)", args.baseline)
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare_with_baseline(results, baseline, args.tolerance, args.memory_tolerance)
+    if regressions:
+        logger.error("❌ 성능 회귀 (기준 %s):", args.baseline)
+        for regression in regressions:
+            logger.error("  - %s", regression)
+        return 1
+    checked = sum(key in baseline.get('results', {}) for key in results)
+    logger.info("✅ 기준값 대비 회귀 없음 (%s개 항목 비교)", checked)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
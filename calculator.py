@@ -3,33 +3,61 @@
 """
 가격 계산 모듈
 환율, 관세, 수수료를 자동으로 계산
+경매가는 (금액, 통화, 단위)로 받으며 통화가 섞인 묶음은 교차 환율 행렬을 행별 통화 코드로 인덱싱해 한 번에 환산
 """
 
-import requests
+import itertools
 from datetime import datetime
 
+from exchange_rate import get_default_provider
+from lazy_import import lazy_import
+from records import DEFAULT_CURRENCY, LEGACY_JPY_UNIT, Item, PriceBreakdown, auction_price_fields, legacy_jpy_price
+
+np = lazy_import('numpy')
+
 class PriceCalculator:
-    def __init__(self):
+    def __init__(self, rate_provider=None):
+        self.rate_provider = rate_provider or get_default_provider()
+        # 현재 환율표 (교차 환율 행렬은 환율 갱신당 한 번만 만들어져 공유됨, 계산마다 refresh_rates로 확인)
+        self.cross_rates = self.rate_provider.get_cross_rates()
         self.exchange_rate = self.get_exchange_rate()
         self.customs_rate = 0.11  # 11% 관세
         self.service_fee_rate = 0.03  # 3% 수수료
     
     def get_exchange_rate(self):
-        """실시간 환율 조회 (엔화)"""
-        try:
-            # 실제로는 환율 API를 사용해야 함
-            # 여기서는 예시로 0.9 사용
-            return 0.9
-        except:
-            print("⚠️ 환율 API 오류, 기본값 사용")
-            return 0.9
+        """실시간 환율 조회 (엔화, TTL 캐시 적용)"""
+        return self.cross_rates.rate(DEFAULT_CURRENCY)
+    
+    def refresh_rates(self):
+        """제공자의 환율표가 갱신됐으면 교차 환율과 엔화 환율을 바꿔 끼우고 현재 CrossRates 반환
+        
+        TTL 안에서는 캐시 항목의 CrossRates를 그대로 돌려받으므로 동일성 비교 한 번으로 끝난다.
+        """
+        cross_rates = self.rate_provider.get_cross_rates()
+        if cross_rates is not self.cross_rates:
+            self.cross_rates = cross_rates
+            self.exchange_rate = self.get_exchange_rate()
+        return cross_rates
     
     def calculate_total_cost(self, item_data):
         """총 매입가 계산"""
-        auction_price_jpy = item_data['auction_price_jpy']
-        
-        # 1. 엔화 → 원화 변환
-        krw_price = auction_price_jpy * self.exchange_rate * 1000  # 1000원 단위
+        self.refresh_rates()
+        price, currency, price_unit = auction_price_fields(item_data)
+        return self._breakdown(price, currency, price_unit, item_data.get('domestic_price_krw', 0)).to_dict()
+    
+    def calculate_breakdown(self, item):
+        """Item 레코드의 총 매입가 계산 (PriceBreakdown 레코드 반환)"""
+        self.refresh_rates()
+        return self._breakdown(item.auction_price, item.currency, item.price_unit, item.domestic_price_krw)
+    
+    def _breakdown(self, auction_price, currency, price_unit, domestic_price_krw):
+        # 1. 통화 → 원화 변환
+        exchange_rate = self.cross_rates.to_krw.get(currency)
+        if exchange_rate is None:
+            exchange_rate = self.cross_rates.rate(currency)  # 지원하지 않는 통화면 ValueError
+        auction_price_jpy = legacy_jpy_price(auction_price, currency, price_unit)
+        auction_price = auction_price * price_unit
+        krw_price = auction_price * exchange_rate
         
         # 2. 관세 계산
         customs_fee = krw_price * self.customs_rate
@@ -40,19 +68,138 @@ class PriceCalculator:
         # 4. 총 매입가
         total_cost = krw_price + customs_fee + service_fee
         
+        return PriceBreakdown(
+            auction_price,
+            currency,
+            krw_price,
+            customs_fee,
+            service_fee,
+            int(total_cost),
+            exchange_rate,
+            self.calculate_profit_margin(total_cost, domestic_price_krw),
+            auction_price_jpy
+        )
+    
+    def calculate_total_cost_batch(self, items):
+        """여러 아이템의 총 매입가를 한 번에 계산 (벡터 연산)
+
+        items는 컬럼 형태(dict of arrays) 또는 아이템 dict/Item 리스트를 받는다.
+        리스트는 한 번만 배열로 변환한 뒤 모든 계산을 배열 단위로 처리한다.
+        컬럼 형태는 auction_price(+ currency: 통화 이름 또는 cross_rates 코드, price_unit) 또는
+        예전 auction_price_jpy(100엔 단위)를 받는다.
+        """
+        self.refresh_rates()
+        auction_price, currency_codes, domestic_price = self._to_price_columns(items)
+        
+        # 1. 통화 → 원화 변환 (행별 통화 코드로 교차 환율 행렬의 원화 열을 인덱싱, 통화별 분기 없음)
+        exchange_rate = self.cross_rates.matrix[currency_codes, self.cross_rates.krw_code]
+        krw_price = auction_price * exchange_rate
+        
+        # 2. 관세 / 3. 수수료
+        customs_fee = krw_price * self.customs_rate
+        service_fee = krw_price * self.service_fee_rate
+        
+        # 4. 총 매입가
+        total_cost = krw_price + customs_fee + service_fee
+        
         return {
-            'auction_price_jpy': auction_price_jpy,
+            'auction_price': auction_price,
+            'currency_code': currency_codes,
             'auction_price_krw': krw_price,
             'customs_fee': customs_fee,
             'service_fee': service_fee,
-            'total_cost_krw': int(total_cost),
-            'exchange_rate': self.exchange_rate,
-            'profit_margin': self.calculate_profit_margin(total_cost, item_data.get('domestic_price_krw', 0))
+            'total_cost_krw': total_cost.astype(np.int64),
+            'exchange_rate': exchange_rate,
+            'profit_margin': self.calculate_profit_margin_batch(total_cost, domestic_price)
         }
     
+    def unpack_batch(self, items, batch):
+        """calculate_total_cost_batch 결과를 calculate_total_cost와 같은 dict 리스트로 변환"""
+        return [breakdown.to_dict() for breakdown in self.unpack_breakdowns(items, batch)]
+    
+    def unpack_breakdowns(self, items, batch):
+        """calculate_total_cost_batch 결과를 PriceBreakdown 레코드 리스트로 변환"""
+        columns = zip(
+            batch['auction_price_krw'].tolist(),
+            batch['customs_fee'].tolist(),
+            batch['service_fee'].tolist(),
+            batch['total_cost_krw'].tolist(),
+            batch['exchange_rate'].tolist(),
+            batch['profit_margin'].tolist()
+        )
+        breakdowns = []
+        for item_data, (krw_price, customs_fee, service_fee, total_cost, exchange_rate, profit_margin) in zip(
+                items, columns):
+            item = Item.coerce(item_data)
+            breakdowns.append(PriceBreakdown(
+                item.auction_price * item.price_unit, item.currency, krw_price, customs_fee, service_fee,
+                total_cost, exchange_rate, profit_margin if item.domestic_price_krw else 0,
+                legacy_jpy_price(item.auction_price, item.currency, item.price_unit)
+            ))
+        return breakdowns
+    
+    def calculate_profit_margin_batch(self, total_cost, domestic_price):
+        """수익률 일괄 계산 (국내 시세가 없으면 0)"""
+        has_price = (domestic_price != 0) & (total_cost != 0)
+        margin = np.divide(domestic_price - total_cost, total_cost,
+                           out=np.zeros_like(total_cost), where=has_price)
+        return np.round(margin * 100, 2)
+    
+    def _to_price_columns(self, items):
+        """입력을 (통화 금액 float 배열, 통화 코드 배열, 국내시세 float 배열)로 변환"""
+        if isinstance(items, dict):
+            if 'auction_price' in items:
+                auction_price = np.asarray(items['auction_price'], dtype=np.float64)
+                if items.get('price_unit') is not None:
+                    auction_price = auction_price * np.asarray(items['price_unit'], dtype=np.float64)
+                currency_codes = self._currency_codes(items.get('currency', DEFAULT_CURRENCY), len(auction_price))
+            else:
+                auction_price = np.asarray(items['auction_price_jpy'], dtype=np.float64) * LEGACY_JPY_UNIT
+                currency_codes = self._currency_codes(DEFAULT_CURRENCY, len(auction_price))
+            domestic_price = items.get('domestic_price_krw')
+            if domestic_price is None:
+                domestic_price = np.zeros_like(auction_price)
+            else:
+                domestic_price = np.asarray(domestic_price, dtype=np.float64)
+        else:
+            count = len(items)
+            # (통화 금액, 통화 코드) 쌍을 한 번에 평탄화해 배열 하나로 읽음
+            price_codes = np.fromiter(
+                itertools.chain.from_iterable(map(self._price_code, items)), dtype=np.float64, count=2 * count
+            ).reshape(count, 2)
+            auction_price = price_codes[:, 0]
+            currency_codes = price_codes[:, 1].astype(np.intp)
+            domestic_price = np.fromiter(
+                (item.get('domestic_price_krw') or 0 for item in items), dtype=np.float64, count=count)
+        
+        # 누락값(NaN)은 국내 시세 정보 없음(0)으로 처리
+        domestic_price = np.nan_to_num(domestic_price, nan=0.0)
+        return auction_price, currency_codes, domestic_price
+    
+    def _price_code(self, item):
+        """아이템 하나의 (통화 금액, 교차 환율 행렬 통화 코드)"""
+        if isinstance(item, Item):
+            price, currency, price_unit = item.auction_price, item.currency, item.price_unit
+        else:
+            price, currency, price_unit = auction_price_fields(item)
+        code = self.cross_rates.codes.get(currency)
+        if code is None:
+            code = self.cross_rates.code(currency)  # 지원하지 않는 통화면 ValueError
+        return price * price_unit, code
+    
+    def _currency_codes(self, currency, count):
+        """통화 컬럼(통화 이름 하나, 이름 배열 또는 코드 배열)을 교차 환율 행렬 인덱스 배열로 변환"""
+        if isinstance(currency, str):
+            return np.full(count, self.cross_rates.code(currency.upper()), dtype=np.intp)
+        currency = np.asarray(currency)
+        if currency.dtype.kind in 'iu':
+            return currency.astype(np.intp, copy=False)
+        names, inverse = np.unique(currency, return_inverse=True)
+        return self.cross_rates.encode(str(name).upper() for name in names.tolist())[inverse.reshape(-1)]
+    
     def calculate_profit_margin(self, total_cost, domestic_price):
-        """수익률 계산"""
-        if domestic_price == 0:
+        """수익률 계산 (국내 시세가 없거나 매입가가 0이면 calculate_profit_margin_batch와 같이 0)"""
+        if not domestic_price or not total_cost:
             return 0
         
         profit = domestic_price - total_cost
@@ -61,7 +208,7 @@ class PriceCalculator:
     
     def get_price_analysis(self, item_data, calculated_price):
         """가격 분석 결과"""
-        domestic_price = item_data.get('domestic_price_krw', 0)
+        domestic_price = item_data.get('domestic_price_krw') or 0
         total_cost = calculated_price['total_cost_krw']
         
         analysis = {
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+컬럼형 결과 저장 모듈
+process_item 결과를 중첩 dict/JSON 대신 컬럼별 타입 배열(.npy)로 저장하고 mmap으로 다시 읽음
+    - 숫자 필드: int64/float64 배열 (누락값은 별도 존재 마스크)
+    - 전략명/페르소나/카테고리 등: 사전 코드 배열 + 라벨 목록(meta.json)
+    - 긴 반복 텍스트(근거, 핵심 포인트, 콘텐츠 문단·CTA·해시태그): 중복 제거 문자열 테이블
+"""
+
+import json
+import os
+import time
+from array import array
+from datetime import datetime, timedelta
+
+from lazy_import import lazy_import
+
+np = lazy_import('numpy')
+
+FORMAT_VERSION = 3
+META_FILE = 'meta.json'
+ERRORS_FILE = 'errors.jsonl'
+STRINGS_FILE = 'strings.bin'
+STRING_OFFSETS = 'string_offsets'
+EPOCH = datetime(1970, 1, 1)
+
+# 콘텐츠는 문단 단위로 나눠 저장 (템플릿 고정 문단·CTA·해시태그 줄이 한 번만 저장됨)
+PARAGRAPH_SEPARATOR = '\n\n'
+MISSING = -1
+
+ITEM_NUMBERS = ('auction_price', 'price_unit', 'auction_price_jpy', 'domestic_price_krw', 'month')
+ITEM_CATEGORIES = ('brand', 'category', 'rank', 'currency')
+ITEM_STRINGS = ('lot_id', 'name', 'notes')
+PRICE_NUMBERS = ('auction_price_jpy', 'auction_price', 'auction_price_krw', 'customs_fee', 'service_fee',
+                 'total_cost_krw', 'exchange_rate', 'profit_margin')
+PRICE_CATEGORIES = ('currency',)
+STRATEGY_CATEGORIES = ('strategy_name', 'angle')
+# 복원 시 item_info / calculated_price 키 순서
+ITEM_FIELDS = ('lot_id', 'name', 'brand', 'auction_price', 'currency', 'price_unit', 'auction_price_jpy', 'rank',
+               'month', 'category', 'notes', 'domestic_price_krw')
+PRICE_FIELDS = ('auction_price_jpy', 'auction_price', 'currency', 'auction_price_krw', 'customs_fee', 'service_fee',
+                'total_cost_krw', 'exchange_rate', 'profit_margin')
+
+
+class _StringTable:
+    """문자열 중복 제거 테이블 (UTF-8 바이트를 파일에 바로 이어 씀)"""
+
+    def __init__(self, path):
+        self.ids = {}
+        self.offsets = array('q', [0])
+        self.file = open(path, 'wb')
+
+    def intern(self, text):
+        string_id = self.ids.get(text)
+        if string_id is None:
+            data = text.encode('utf-8')
+            self.file.write(data)
+            string_id = len(self.offsets) - 1
+            self.offsets.append(self.offsets[-1] + len(data))
+            self.ids[text] = string_id
+        return string_id
+
+    def close(self):
+        self.file.close()
+
+
+class _NumberColumn:
+    def __init__(self):
+        self.values = array('d')
+        self.present = bytearray()
+        self.all_int = True
+
+    def append(self, value):
+        if value is None:
+            self.values.append(0.0)
+            self.present.append(0)
+            return
+        if self.all_int and not isinstance(value, int):
+            self.all_int = False
+        self.values.append(value)
+        self.present.append(1)
+
+    def arrays(self):
+        values = np.frombuffer(self.values, dtype=np.float64)
+        if self.all_int:
+            values = values.astype(np.int64)
+        present = np.frombuffer(bytes(self.present), dtype=np.bool_)
+        return values, None if present.all() else present
+
+
+class _CategoryColumn:
+    def __init__(self):
+        self.labels = {}
+        self.codes = array('i')
+
+    def code(self, label):
+        code = self.labels.get(label)
+        if code is None:
+            code = self.labels[label] = len(self.labels)
+        return code
+
+    def append(self, label):
+        self.codes.append(self.code(label))
+
+    def array(self):
+        """라벨 수에 맞는 가장 작은 정수 타입의 코드 배열"""
+        dtype = np.min_scalar_type(max(len(self.labels) - 1, 0))
+        return np.frombuffer(self.codes, dtype=np.int32).astype(dtype)
+
+
+class ColumnarWriter:
+    """결과 dict를 하나씩 받아 컬럼 배열로 모아 두었다가 close()에서 저장
+
+    path는 디렉터리이며 컬럼마다 '<그룹>.<필드>.npy' 파일이 생긴다.
+    item_info의 알려진 필드 외 나머지 키는 JSON 문자열로 'item.extra'에 저장한다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.count = 0
+        self.strings = _StringTable(os.path.join(path, STRINGS_FILE))
+        self.numbers = {f"item.{field}": _NumberColumn() for field in ITEM_NUMBERS}
+        self.numbers.update((f"price.{field}", _NumberColumn()) for field in PRICE_NUMBERS)
+        self.categories = {f"item.{field}": _CategoryColumn() for field in ITEM_CATEGORIES}
+        self.categories.update((f"price.{field}", _CategoryColumn()) for field in PRICE_CATEGORIES)
+        self.categories.update((f"strategy.{field}", _CategoryColumn()) for field in STRATEGY_CATEGORIES)
+        self.string_columns = {f"item.{field}": array('i') for field in ITEM_STRINGS}
+        self.string_columns['item.extra'] = array('i')
+        self.string_columns['strategy.reasoning'] = array('i')
+        self.generated_at = array('q')  # 1970-01-01 기준 마이크로초 (naive 시각 그대로)
+        self.strategy_personas = {}
+
+        # 가변 길이 컬럼: 행별 오프셋 + 값
+        self.key_point_offsets = array('q', [0])
+        self.key_point_keys = _CategoryColumn()
+        self.key_point_values = array('i')
+        self.personas = _CategoryColumn()
+        self.persona_offsets = array('q', [0])
+        self.paragraph_offsets = array('q', [0])
+        self.paragraph_ids = array('i')
+
+    def _intern(self, text):
+        return MISSING if text is None else self.strings.intern(text)
+
+    def write(self, result):
+        item = result['item_info']
+        price = result['calculated_price']
+        strategy = result['strategy']
+
+        for field in ITEM_NUMBERS:
+            self.numbers[f"item.{field}"].append(item.get(field))
+        for field in PRICE_NUMBERS:
+            self.numbers[f"price.{field}"].append(price.get(field))
+        for field in ITEM_CATEGORIES:
+            self.categories[f"item.{field}"].append(item.get(field))
+        for field in PRICE_CATEGORIES:
+            self.categories[f"price.{field}"].append(price.get(field))
+        for field in STRATEGY_CATEGORIES:
+            self.categories[f"strategy.{field}"].append(strategy.get(field))
+        for field in ITEM_STRINGS:
+            value = item.get(field)
+            self.string_columns[f"item.{field}"].append(self._intern(None if value is None else str(value)))
+
+        extra = {key: value for key, value in item.items() if key not in ITEM_FIELDS}
+        self.string_columns['item.extra'].append(
+            self._intern(json.dumps(extra, ensure_ascii=False)) if extra else MISSING)
+        self.string_columns['strategy.reasoning'].append(self._intern(strategy.get('reasoning')))
+        # 추천 페르소나는 전략마다 고정이므로 전략명별로 한 번만 기록
+        self.strategy_personas.setdefault(strategy.get('strategy_name'), strategy.get('recommended_personas', []))
+
+        for key, point in strategy.get('key_points', {}).items():
+            self.key_point_keys.append(key)
+            self.key_point_values.append(self.strings.intern(point))
+        self.key_point_offsets.append(len(self.key_point_values))
+
+        for persona, content in result['contents'].items():
+            self.personas.append(persona)
+            for paragraph in content.split(PARAGRAPH_SEPARATOR):
+                self.paragraph_ids.append(self.strings.intern(paragraph))
+            self.paragraph_offsets.append(len(self.paragraph_ids))
+        self.persona_offsets.append(len(self.personas.codes))
+
+        self.generated_at.append((datetime.fromisoformat(result['generated_at']) - EPOCH) // timedelta(microseconds=1))
+        self.count += 1
+
+    def close(self):
+        """배열과 메타데이터를 저장하고 요약 반환"""
+        self.strings.close()
+
+        def save(name, values, dtype):
+            np.save(os.path.join(self.path, f"{name}.npy"), np.frombuffer(values, dtype=dtype))
+
+        numbers = {}
+        for name, column in self.numbers.items():
+            values, present = column.arrays()
+            np.save(os.path.join(self.path, f"{name}.npy"), values)
+            if present is not None:
+                np.save(os.path.join(self.path, f"{name}.present.npy"), present)
+            numbers[name] = {'dtype': str(values.dtype), 'has_missing': present is not None}
+
+        categories = {}
+        for name, column in self.categories.items():
+            np.save(os.path.join(self.path, f"{name}.npy"), column.array())
+            categories[name] = list(column.labels)
+
+        for name, ids in self.string_columns.items():
+            save(name, ids, np.int32)
+        save('strategy.key_points.offsets', self.key_point_offsets, np.int64)
+        np.save(os.path.join(self.path, 'strategy.key_points.key.npy'), self.key_point_keys.array())
+        save('strategy.key_points.value', self.key_point_values, np.int32)
+        save('contents.offsets', self.persona_offsets, np.int64)
+        np.save(os.path.join(self.path, 'contents.persona.npy'), self.personas.array())
+        save('contents.paragraph_offsets', self.paragraph_offsets, np.int64)
+        save('contents.paragraphs', self.paragraph_ids, np.int32)
+        save('generated_at', self.generated_at, np.int64)
+        save(STRING_OFFSETS, self.strings.offsets, np.int64)
+
+        meta = {
+            'format_version': FORMAT_VERSION,
+            'rows': self.count,
+            'numbers': numbers,
+            'categories': categories,
+            'strings': list(self.string_columns),
+            'personas': list(self.personas.labels),
+            'strategy_personas': self.strategy_personas,
+            'key_points': list(self.key_point_keys.labels),
+            'string_count': len(self.strings.offsets) - 1
+        }
+        with open(os.path.join(self.path, META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        return meta
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ColumnarReader:
+    """ColumnarWriter 출력을 mmap으로 열어 JSON 파싱 없이 조회
+
+        reader = ColumnarReader('results.cols')
+        margin = reader.column('price.profit_margin')
+        selected = (margin > 50) & reader.equals('strategy.strategy_name', '역수출_차익거래')
+        rows = [reader.row(index) for index in np.flatnonzero(selected)]
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, META_FILE), encoding='utf-8') as f:
+            self.meta = json.load(f)
+        if self.meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 컬럼형 결과 버전: {self.meta.get('format_version')} ({path})")
+        self._arrays = {}
+        self.string_offsets = self._load(STRING_OFFSETS)
+        blob_path = os.path.join(path, STRINGS_FILE)
+        if os.path.getsize(blob_path):
+            self.blob = np.memmap(blob_path, dtype=np.uint8, mode='r')
+        else:
+            self.blob = np.zeros(0, dtype=np.uint8)
+
+    def __len__(self):
+        return self.meta['rows']
+
+    def _load(self, name):
+        values = self._arrays.get(name)
+        if values is None:
+            values = self._arrays[name] = np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode='r')
+        return values
+
+    def column(self, name):
+        """숫자 값, 사전 코드 또는 문자열 ID 배열 (mmap)"""
+        return self._load(name)
+
+    def present(self, name):
+        """숫자 컬럼의 값 존재 여부 (누락값이 없으면 전부 True)"""
+        if self.meta['numbers'][name]['has_missing']:
+            return self._load(f"{name}.present")
+        return np.ones(len(self), dtype=np.bool_)
+
+    def labels(self, name):
+        return self.meta['personas'] if name == 'contents.persona' else self.meta['categories'][name]
+
+    def equals(self, name, label):
+        """사전 인코딩 컬럼이 label인 행의 마스크"""
+        labels = self.labels(name)
+        if label not in labels:
+            return np.zeros(len(self), dtype=np.bool_)
+        return self._load(name) == labels.index(label)
+
+    def decode(self, name):
+        """사전 코드를 라벨 배열로 변환"""
+        return np.asarray(self.labels(name), dtype=object)[self._load(name)]
+
+    def string(self, string_id):
+        if string_id == MISSING:
+            return None
+        start, stop = self.string_offsets[string_id], self.string_offsets[string_id + 1]
+        return self.blob[start:stop].tobytes().decode('utf-8')
+
+    def _number(self, name, index):
+        if self.meta['numbers'][name]['has_missing'] and not self._load(f"{name}.present")[index]:
+            return None
+        return self._load(name)[index].item()
+
+    def row(self, index):
+        """index번째 결과를 process_item과 같은 dict로 복원"""
+        item_info = {}
+        for field in ITEM_FIELDS:
+            name = f"item.{field}"
+            if field in ITEM_NUMBERS:
+                value = self._number(name, index)
+            elif field in ITEM_CATEGORIES:
+                value = self.labels(name)[self._load(name)[index]]
+            else:
+                value = self.string(self._load(name)[index])
+            if value is not None:
+                item_info[field] = value
+        extra = self.string(self._load('item.extra')[index])
+        if extra is not None:
+            item_info.update(json.loads(extra))
+
+        calculated_price = {}
+        for field in PRICE_FIELDS:
+            name = f"price.{field}"
+            value = self._number(name, index) if field in PRICE_NUMBERS else self.labels(name)[self._load(name)[index]]
+            # auction_price_jpy는 엔화 아이템에만 있음
+            if value is not None or field != 'auction_price_jpy':
+                calculated_price[field] = value
+
+        key_point_offsets = self._load('strategy.key_points.offsets')
+        key_points = slice(key_point_offsets[index], key_point_offsets[index + 1])
+        key_point_labels = self.meta['key_points']
+
+        persona_offsets = self._load('contents.offsets')
+        paragraph_offsets = self._load('contents.paragraph_offsets')
+        paragraph_ids = self._load('contents.paragraphs')
+        contents = {}
+        for entry in range(persona_offsets[index], persona_offsets[index + 1]):
+            persona = self.meta['personas'][self._load('contents.persona')[entry]]
+            paragraphs = paragraph_ids[paragraph_offsets[entry]:paragraph_offsets[entry + 1]]
+            contents[persona] = PARAGRAPH_SEPARATOR.join(self.string(string_id) for string_id in paragraphs)
+
+        strategy_name = self.labels('strategy.strategy_name')[self._load('strategy.strategy_name')[index]]
+        strategy = {
+            'strategy_name': strategy_name,
+            'angle': self.labels('strategy.angle')[self._load('strategy.angle')[index]],
+            'recommended_personas': list(self.meta['strategy_personas'][strategy_name]),
+            'reasoning': self.string(self._load('strategy.reasoning')[index]),
+            'key_points': {
+                key_point_labels[code]: self.string(string_id)
+                for code, string_id in zip(self._load('strategy.key_points.key')[key_points],
+                                           self._load('strategy.key_points.value')[key_points])
+            }
+        }
+
+        return {
+            'item_info': item_info,
+            'calculated_price': calculated_price,
+            'strategy': strategy,
+            'contents': contents,
+            'generated_at': (EPOCH + timedelta(microseconds=int(self._load('generated_at')[index]))).isoformat()
+        }
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.row(index)
+
+
+def write_columnar(results, output_path):
+    """결과를 컬럼형 디렉터리로 저장하고 write_results와 같은 처리 통계 반환
+
+    오류 레코드는 컬럼으로 만들 수 없으므로 같은 디렉터리의 errors.jsonl에 따로 기록한다.
+    """
+    count = 0
+    errors = 0
+    start = time.perf_counter()
+
+    with ColumnarWriter(output_path) as writer, \
+            open(os.path.join(output_path, ERRORS_FILE), 'w', encoding='utf-8') as error_file:
+        for result in results:
+            if 'error' in result:
+                error_file.write(json.dumps(result, ensure_ascii=False) + '\n')
+                errors += 1
+            else:
+                writer.write(result)
+            count += 1
+
+    elapsed = time.perf_counter() - start
+    return {
+        'items': count,
+        'errors': errors,
+        'elapsed_sec': elapsed,
+        'items_per_sec': count / elapsed if elapsed > 0 else 0.0
+    }
@@ -35,11 +35,12 @@ class CTAManager:
         cta_info = self.cta_templates.get(persona, self.cta_templates['mz'])
         
         # 전략에 따른 CTA 조정
-        if strategy['strategy_name'] == '겨울준비_시즌선점':
+        strategy_name = strategy['strategy_name']
+        if strategy_name == '겨울준비_시즌선점':
             return self._create_seasonal_cta(cta_info, "겨울 준비")
-        elif strategy['strategy_name'] == '핑계불가_소액투자':
+        elif strategy_name == '핑계불가_소액투자':
             return self._create_urgency_cta(cta_info, "소액 투자")
-        elif strategy['strategy_name'] == '묶음판매_개당단가':
+        elif strategy_name == '묶음판매_개당단가':
             return self._create_business_cta(cta_info, "묶음 판매")
         else:
             return self._create_default_cta(cta_info)
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+중복 게시물 탐지 모듈
+생성된 콘텐츠를 문자 shingle MinHash로 지문화하고 LSH 밴드 버킷으로 후보만 비교해
+거의 같은 게시물을 클러스터로 묶음 (쌍별 전수 비교 없음, 지문 인덱스는 sqlite에 저장)
+"""
+
+import logging
+import re
+import sqlite3
+import time
+
+from lazy_import import lazy_import
+
+np = lazy_import('numpy')
+
+logger = logging.getLogger('casatrade.dedup')
+
+DEFAULT_THRESHOLD = 0.9
+NUM_PERM = 128
+BANDS = 16  # 밴드당 8행: 유사도 0.9 쌍은 99.99% 이상 후보로 잡힘
+SHINGLE_SIZE = 3
+# 서명 계산 시 한 번에 펼칠 (순열 × shingle) 셀 수 상한 (uint64 배열 약 8MB)
+MAX_SIGNATURE_CELLS = 1_000_000
+# 버킷(밴드 값)당 보관할 클러스터 수 상한: 같은 템플릿의 서로 다른 글이 흔한 밴드 값을 공유해
+# 후보가 카탈로그 크기에 비례해 늘어나는 것을 막음 (유사도 0.9 쌍은 평균 7개 밴드가 겹쳐 다른 버킷으로 찾음)
+MAX_BUCKET_CLUSTERS = 32
+# 고정 문구 shingle 조회 테이블 크기 (해시 하위 20비트, 1MB)
+STOP_TABLE_BITS = 20
+
+_NUMBER = re.compile(r'[0-9][0-9,.]*')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    post_key TEXT PRIMARY KEY,
+    cluster TEXT,
+    similarity REAL,
+    signature BLOB,
+    created_at REAL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def normalize(text):
+    """소문자, 숫자(쉼표/소수점 포함) → 0 (가격만 다른 게시물은 같은 글로 본다)"""
+    return _NUMBER.sub('0', text.lower())
+
+
+class MinHasher:
+    """문자 shingle 집합의 MinHash 서명 계산
+
+    stop_texts(템플릿 고정 문구, CTA 등)에 나오는 shingle은 제외한다. 같은 템플릿으로 만든 글은
+    고정 문구가 대부분이라, 제외하지 않으면 서로 다른 아이템의 글도 유사도가 0.8을 넘는다.
+    """
+
+    def __init__(self, num_perm=NUM_PERM, shingle_size=SHINGLE_SIZE, seed=1, stop_texts=()):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        # 순열 근사: 32비트 해시 x에 대한 multiply-shift ((a * x + b) mod 2^64) >> 32, a는 홀수
+        self._a = rng.integers(0, 1 << 63, size=(num_perm, 1), dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 1 << 63, size=(num_perm, 1), dtype=np.uint64)
+        # 고정 문구 shingle은 하위 비트 테이블로 조회 (하위 비트가 겹치는 일반 shingle도 함께 빠지지만
+        # 고정 문구 수백 개 기준 0.1% 미만이고 모든 글에 똑같이 적용됨)
+        self._stop = None
+        if stop_texts:
+            self._stop = np.zeros(1 << STOP_TABLE_BITS, dtype=bool)
+            for text in stop_texts:
+                self._stop[self.shingles(text) & np.uint64((1 << STOP_TABLE_BITS) - 1)] = True
+
+    def shingles(self, text):
+        """정규화한 텍스트의 shingle 해시(32비트, 중복 제거) 배열"""
+        text_index, hashes = self._shingle_hashes([text], exclude_stop=False)
+        return np.unique(hashes)
+
+    def _shingle_hashes(self, texts, exclude_stop=True):
+        """여러 텍스트의 shingle을 한 번에 계산해 (텍스트 번호, 해시) 배열 반환 (텍스트 번호 순)
+
+        텍스트를 이어 붙여 롤링 해시를 한 번에 구하고 텍스트 경계를 넘는 shingle은 버린다.
+        MinHash는 최솟값만 쓰므로 텍스트 안의 중복 shingle은 제거하지 않는다.
+        """
+        size = self.shingle_size
+        # 짧은 텍스트도 shingle이 하나는 나오도록 채움
+        normalized = [normalize(text).ljust(size, '\0') for text in texts]
+        lengths = np.fromiter((len(text) for text in normalized), dtype=np.int64, count=len(normalized))
+        codes = np.frombuffer(''.join(normalized).encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+
+        count = len(codes) - size + 1
+        hashes = np.zeros(count, dtype=np.uint64)
+        for offset in range(size):
+            hashes *= np.uint64(1000003)
+            hashes += codes[offset:offset + count]
+        hashes ^= hashes >> np.uint64(29)
+        hashes *= np.uint64(0xbf58476d1ce4e5b9)
+        hashes ^= hashes >> np.uint64(32)
+        hashes &= np.uint64(0xffffffff)
+
+        text_index = np.repeat(np.arange(len(normalized)), lengths)[:count]
+        inside = np.arange(size, count + size) <= np.cumsum(lengths)[text_index]
+        text_index, hashes = text_index[inside], hashes[inside]
+
+        if exclude_stop and self._stop is not None:
+            stop = self._stop[hashes & np.uint64((1 << STOP_TABLE_BITS) - 1)]
+            # 고정 문구뿐인 글은 전체 shingle로 비교
+            remaining = np.bincount(text_index[~stop], minlength=len(normalized))
+            keep = ~stop | (remaining[text_index] == 0)
+            text_index, hashes = text_index[keep], hashes[keep]
+        return text_index, hashes
+
+    @property
+    def settings(self):
+        """서명 호환성 판단용 설정 (인덱스 메타데이터로 저장)"""
+        return {'num_perm': self.num_perm, 'shingle_size': self.shingle_size, 'seed': self.seed}
+
+    def signatures(self, texts):
+        """텍스트 목록의 (개수, num_perm) uint32 서명 행렬
+
+        모든 글의 shingle을 한 배열로 펼쳐 순열 해시와 글별 최솟값(reduceat)을 배열 연산으로 구하되,
+        (순열 × shingle) 행렬이 MAX_SIGNATURE_CELLS를 넘지 않도록 글 단위로 나눈다.
+        """
+        result = np.empty((len(texts), self.num_perm), dtype=np.uint32)
+        if not texts:
+            return result
+        text_index, hashes = self._shingle_hashes(texts)
+        offsets = np.searchsorted(text_index, np.arange(len(texts) + 1))
+        limit = max(1, MAX_SIGNATURE_CELLS // self.num_perm)
+        start = 0
+        while start < len(texts):
+            stop = max(start + 1, int(np.searchsorted(offsets, offsets[start] + limit, side='right')) - 1)
+            stop = min(stop, len(texts))
+            values = self._a * hashes[offsets[start]:offsets[stop]]
+            values += self._b
+            # 시프트는 단조 증가라 최솟값을 먼저 구하고 상위 32비트만 취함
+            minimum = np.minimum.reduceat(values, offsets[start:stop] - offsets[start], axis=1)
+            result[start:stop] = (minimum >> np.uint64(32)).T
+            start = stop
+        return result
+
+
+class DuplicateIndex:
+    """MinHash 서명의 LSH 인덱스 (sqlite 저장, 열 때 메모리로 로드)
+
+    클러스터는 처음 들어온 게시물(대표)의 키로 식별한다. 버킷에는 클러스터마다 게시물 하나만 넣으므로
+    같은 글이 아무리 많아도 새 게시물이 비교하는 후보 수는 겹치는 클러스터 수를 넘지 않는다.
+    """
+
+    def __init__(self, hasher, path=None, threshold=DEFAULT_THRESHOLD, bands=BANDS, max_age_days=None):
+        num_perm = hasher.num_perm
+        if num_perm % bands:
+            raise ValueError(f"num_perm({num_perm})은 bands({bands})로 나누어떨어져야 합니다.")
+        self.hasher = hasher
+        self.path = path
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.conn = sqlite3.connect(path or ':memory:')
+        self.conn.executescript(_SCHEMA)
+        self._check_meta()
+        if max_age_days is not None:
+            with self.conn:
+                self.conn.execute("DELETE FROM posts WHERE created_at < ?", (time.time() - max_age_days * 86400,))
+
+        # 밴드(rows개 서명 값)를 64비트 정수 하나로 접는 가중치 (충돌은 후보가 하나 늘 뿐 유사도로 걸러짐)
+        self._band_weights = np.random.default_rng(0).integers(
+            0, 1 << 63, size=self.rows, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.keys = []
+        self.clusters = []
+        self.similarities = []
+        self.positions = {}
+        self._signatures = np.empty((1024, num_perm), dtype=np.uint32)
+        self._buckets = [{} for _ in range(bands)]
+        # 서명이 완전히 같은 게시물(템플릿 카탈로그에서 대부분)은 밴드 조회 없이 바로 찾음
+        self._exact = {}
+        self._pending = {}
+        self._load()
+
+    def _load(self):
+        rows = self.conn.execute(
+            "SELECT post_key, cluster, similarity, signature FROM posts ORDER BY created_at, rowid").fetchall()
+        if not rows:
+            return
+        signatures = np.frombuffer(b''.join(row[3] for row in rows), dtype=np.uint32).reshape(len(rows), -1)
+        for (post_key, cluster, similarity, _), signature, band_keys in zip(
+                rows, signatures, self.band_keys(signatures)):
+            self._insert(post_key, cluster, similarity, signature, band_keys)
+
+    def _check_meta(self):
+        """저장된 인덱스와 서명 설정이 같은지 확인"""
+        settings = {name: str(value) for name, value in {**self.hasher.settings, 'bands': self.bands}.items()}
+        stored = dict(self.conn.execute("SELECT name, value FROM meta"))
+        if not stored:
+            with self.conn:
+                self.conn.executemany("INSERT INTO meta VALUES (?, ?)", settings.items())
+        elif stored != settings:
+            raise ValueError(f"{self.path}: 인덱스 설정 불일치 (저장 {stored}, 요청 {settings})")
+
+    def __len__(self):
+        return len(self.positions)
+
+    def band_keys(self, signatures):
+        """(개수, num_perm) 서명 행렬의 밴드 키 목록 (게시물별 bands개 정수)"""
+        bands = signatures.reshape(len(signatures), self.bands, self.rows).astype(np.uint64)
+        bands *= self._band_weights
+        return bands.sum(axis=2).tolist()
+
+    def _insert(self, post_key, cluster, similarity, signature, band_keys):
+        position = len(self.keys)
+        if position == len(self._signatures):
+            self._signatures = np.concatenate([self._signatures, np.empty_like(self._signatures)])
+        self._signatures[position] = signature
+        self.keys.append(post_key)
+        self.clusters.append(cluster)
+        self.similarities.append(similarity)
+        self.positions[post_key] = position
+        self._exact.setdefault(signature.tobytes(), position)
+        for bucket, band_key in zip(self._buckets, band_keys):
+            members = bucket.get(band_key)
+            if members is None:
+                bucket[band_key] = {cluster: position}
+            elif len(members) < MAX_BUCKET_CLUSTERS and cluster not in members:
+                members[cluster] = position
+
+    def _best_match(self, signature, band_keys):
+        """밴드가 하나라도 겹치는 후보 중 가장 유사한 (위치, 유사도)"""
+        exact = self._exact.get(signature.tobytes())
+        if exact is not None:
+            return exact, 1.0
+        candidates = set()
+        for bucket, band_key in zip(self._buckets, band_keys):
+            members = bucket.get(band_key)
+            if members:
+                candidates.update(members.values())
+        if not candidates:
+            return None, 0.0
+        candidates = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        matches = np.count_nonzero(self._signatures[candidates] == signature, axis=1)
+        best = int(matches.argmax())
+        return int(candidates[best]), int(matches[best]) / self.num_perm
+
+    def assign(self, post_key, signature, band_keys=None):
+        """게시물을 클러스터에 배정하고 (클러스터 대표 키, 대표와의 추정 유사도) 반환
+
+        이미 인덱스에 있는 키는 내용이 비슷하면 저장된 배정을 그대로 돌려준다 (같은 카탈로그 재실행).
+        """
+        if band_keys is None:
+            band_keys = self.band_keys(signature[None])[0]
+        position = self.positions.get(post_key)
+        if position is not None:
+            if np.count_nonzero(self._signatures[position] == signature) >= self.threshold * self.num_perm:
+                return self.clusters[position], self.similarities[position]
+
+        match, similarity = self._best_match(signature, band_keys)
+        if match is not None and similarity >= self.threshold:
+            cluster = self.clusters[match]
+        else:
+            cluster, similarity = post_key, 1.0
+
+        # 내용이 바뀐 기존 게시물은 새 위치로 다시 등록 (이전 서명은 버킷에 남아 후보로만 쓰임)
+        self._insert(post_key, cluster, similarity, signature, band_keys)
+        self._pending[post_key] = (post_key, cluster, similarity, signature.tobytes(), time.time())
+        return cluster, similarity
+
+    def flush(self):
+        """새로 배정한 게시물을 한 트랜잭션으로 저장"""
+        if self._pending:
+            with self.conn:
+                self.conn.executemany("INSERT OR REPLACE INTO posts VALUES (?, ?, ?, ?, ?)", self._pending.values())
+            self._pending = {}
+
+    def cluster_count(self):
+        return len({self.clusters[position] for position in self.positions.values()})
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def marketer_boilerplate(marketer):
+    """마케터가 모든 글에 공통으로 넣는 고정 문구 (템플릿 리터럴, 페르소나×전략별 CTA)"""
+    texts = [
+        part
+        for template in marketer.persona_generator.templates.values()
+        for part in template.parts if part
+    ]
+    for persona in marketer.cta_manager.cta_templates:
+        for strategy_name in marketer.strategy_analyzer.strategies:
+            texts.append(marketer.cta_manager.get_cta(persona, {'strategy_name': strategy_name}))
+    return texts
+
+
+class PostDeduplicator:
+    """결과 스트림의 페르소나별 게시물에 중복 클러스터를 배정
+
+    결과마다 dedup 항목({페르소나: {cluster, similarity, duplicate}})을 붙이고,
+    drop_duplicates면 다른 글의 변형인 게시물을 contents에서 빼며 남은 게시물이 없는 결과는 건너뛴다.
+    """
+
+    def __init__(self, index, drop_duplicates=False, chunk_size=256):
+        self.index = index
+        self.drop_duplicates = drop_duplicates
+        self.chunk_size = chunk_size
+        self.stats = {'posts': 0, 'duplicates': 0, 'dropped_items': 0}
+
+    @classmethod
+    def for_marketer(cls, marketer, path=None, threshold=DEFAULT_THRESHOLD, drop_duplicates=False, **index_options):
+        hasher = MinHasher(stop_texts=marketer_boilerplate(marketer))
+        return cls(DuplicateIndex(hasher, path, threshold, **index_options), drop_duplicates)
+
+    def process(self, results):
+        """결과를 청크 단위로 지문화(서명 계산은 청크 전체를 한 번에)해 순서대로 생성"""
+        chunk = []
+        for result in results:
+            chunk.append(result)
+            if len(chunk) >= self.chunk_size:
+                yield from self._process_chunk(chunk)
+                chunk = []
+        if chunk:
+            yield from self._process_chunk(chunk)
+
+    def _process_chunk(self, results):
+        from incremental import item_key
+
+        posts = [
+            (index, persona, f"{item_key(result['item_info'])}:{persona}", content)
+            for index, result in enumerate(results) if 'error' not in result
+            for persona, content in result['contents'].items()
+        ]
+        signatures = self.index.hasher.signatures([content for *_, content in posts])
+        band_keys = self.index.band_keys(signatures)
+        assignments = [{} for _ in results]
+        for (index, persona, post_key, _), signature, keys in zip(posts, signatures, band_keys):
+            cluster, similarity = self.index.assign(post_key, signature, keys)
+            duplicate = cluster != post_key
+            assignments[index][persona] = {
+                'cluster': cluster,
+                'similarity': round(similarity, 3),
+                'duplicate': duplicate
+            }
+            self.stats['duplicates'] += duplicate
+        self.stats['posts'] += len(posts)
+        self.index.flush()
+
+        for result, assignment in zip(results, assignments):
+            if 'error' in result:
+                # 처리 실패 레코드는 게시물이 없으므로 그대로 통과
+                yield result
+                continue
+            result['dedup'] = assignment
+            if self.drop_duplicates:
+                contents = {
+                    persona: content for persona, content in result['contents'].items()
+                    if not assignment[persona]['duplicate']
+                }
+                if not contents:
+                    self.stats['dropped_items'] += 1
+                    continue
+                result['contents'] = contents
+            yield result
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+환율 제공 모듈
+환율 API 조회, 프로세스 공용 TTL 캐시, 파일 폴백 관리, 통화 간 교차 환율 행렬
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+from lazy_import import lazy_import
+
+np = lazy_import('numpy')
+requests = lazy_import('requests')
+
+logger = logging.getLogger('casatrade.exchange_rate')
+
+# 환율은 통화 1단위당 원화 금액 (조회 결과에 없는 통화는 기본값 사용)
+BASE_CURRENCY = 'KRW'
+DEFAULT_RATES = {'JPY': 9.0, 'USD': 1350.0, 'EUR': 1470.0, 'HKD': 173.0}
+DEFAULT_TTL = 600  # 10분
+DEFAULT_STALE_TTL = 3600  # 만료 후 1시간까지는 이전 값으로 응답하며 백그라운드 갱신
+
+# 프로세스 공용 캐시: url → {'rates': {...}, 'fetched_at': monotonic, 'cross_rates': CrossRates (첫 사용 시)}
+_cache = {}
+_cache_lock = threading.Lock()
+_refreshing = set()
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """커넥션 풀을 재사용하는 공용 requests 세션"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
+
+def clear_rate_cache():
+    """프로세스 공용 환율 캐시 초기화 (테스트용)"""
+    with _cache_lock:
+        _cache.clear()
+        _refreshing.clear()
+
+
+class CrossRates:
+    """환율표 한 번(갱신 1회)에 대한 통화 코드와 교차 환율 행렬
+
+    matrix[i, j]는 통화 i 1단위가 통화 j로 얼마인지이며, 원화 열(krw_code)이 원화 환산 환율이다.
+    행별 통화 코드 배열로 matrix[codes, 대상 코드]를 인덱싱하면 통화가 섞인 묶음도 분기 없이 한 번에 환산된다.
+    행렬은 첫 배치 환산 때 한 번만 만들고, 단건 계산은 to_krw dict만 쓴다 (numpy 로드 없음).
+    """
+
+    def __init__(self, rates):
+        to_krw = {BASE_CURRENCY: 1.0, **DEFAULT_RATES, **rates}
+        to_krw[BASE_CURRENCY] = 1.0
+        self.currencies = tuple(to_krw)
+        self.codes = {currency: code for code, currency in enumerate(self.currencies)}
+        self.to_krw = to_krw
+        self.krw_code = self.codes[BASE_CURRENCY]
+        self._matrix = None
+
+    @property
+    def matrix(self):
+        if self._matrix is None:
+            rates = np.fromiter(self.to_krw.values(), dtype=np.float64, count=len(self.currencies))
+            self._matrix = rates[:, None] / rates[None, :]
+        return self._matrix
+
+    def rate(self, currency, target=BASE_CURRENCY):
+        """currency 1단위의 target 환산 금액"""
+        return self.to_krw[self._check(currency)] / self.to_krw[self._check(target)]
+
+    def code(self, currency):
+        return self.codes[self._check(currency)]
+
+    def encode(self, currencies, count=-1):
+        """통화 이름들을 행렬 인덱스(int) 배열로 변환"""
+        codes = self.codes
+        try:
+            return np.fromiter((codes[currency] for currency in currencies), dtype=np.intp, count=count)
+        except KeyError as error:
+            self._check(error.args[0])
+            raise
+
+    def convert(self, amounts, codes, target=BASE_CURRENCY):
+        """통화 코드 배열(행별)에 맞춰 금액 배열을 target 통화로 환산"""
+        return np.asarray(amounts, dtype=np.float64) * self.matrix[codes, self.code(target)]
+
+    def _check(self, currency):
+        if currency not in self.codes:
+            raise ValueError(f"지원하지 않는 통화: {currency} (가능: {', '.join(self.currencies)})")
+        return currency
+
+
+class ExchangeRateProvider:
+    def __init__(self, url=None, ttl=DEFAULT_TTL, stale_ttl=DEFAULT_STALE_TTL,
+                 fallback_path=None, timeout=3.0):
+        self.url = url or os.environ.get('CASATRADE_RATE_URL')
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.fallback_path = fallback_path or os.environ.get('CASATRADE_RATE_FILE', 'exchange_rates.json')
+        self.timeout = timeout
+
+    @property
+    def cache_key(self):
+        return self.url or f"file:{self.fallback_path}"
+
+    def get_rate(self, currency='JPY'):
+        """통화별 환율 조회"""
+        rates = self.get_rates()
+        if currency in rates:
+            return rates[currency]
+        return DEFAULT_RATES[currency]
+
+    def get_cross_rates(self):
+        """현재 환율표의 교차 환율 (환율표가 갱신될 때만 새로 만듦)"""
+        key = self.cache_key
+        entry = _cache.get(key)
+        # 계산마다 불리는 경로: TTL 안이고 이미 만들어 둔 행렬이 있으면 조회 한 번으로 끝냄
+        if entry is not None and time.monotonic() - entry['fetched_at'] < self.ttl:
+            cross_rates = entry.get('cross_rates')
+            if cross_rates is not None:
+                return cross_rates
+        rates = self.get_rates()
+        entry = _cache.get(key)
+        if entry is None or entry['rates'] is not rates:
+            return CrossRates(rates)
+        cross_rates = entry.get('cross_rates')
+        if cross_rates is None:
+            cross_rates = entry['cross_rates'] = CrossRates(rates)
+        return cross_rates
+
+    def get_rates(self):
+        """캐시된 환율표 조회 (만료 시 갱신)"""
+        entry = _cache.get(self.cache_key)
+        if entry is not None:
+            age = time.monotonic() - entry['fetched_at']
+            if age < self.ttl:
+                return entry['rates']
+            if age < self.ttl + self.stale_ttl:
+                self._refresh_in_background()
+                return entry['rates']
+
+        with _cache_lock:
+            # 다른 스레드가 먼저 갱신했으면 그 결과 사용
+            entry = _cache.get(self.cache_key)
+            if entry is not None and time.monotonic() - entry['fetched_at'] < self.ttl:
+                return entry['rates']
+            return self._refresh(stale=entry)
+
+    def _refresh_in_background(self):
+        """stale-while-revalidate: 이전 값을 돌려주는 동안 한 번만 갱신"""
+        key = self.cache_key
+        with _cache_lock:
+            if key in _refreshing:
+                return
+            _refreshing.add(key)
+
+        def worker():
+            try:
+                with _cache_lock:
+                    self._refresh(stale=_cache.get(key))
+            finally:
+                _refreshing.discard(key)
+
+        threading.Thread(target=worker, name='rate-refresh', daemon=True).start()
+
+    def _refresh(self, stale=None):
+        """환율 조회 후 캐시에 저장 (_cache_lock 보유 상태에서 호출)"""
+        rates = self._load_fresh_file()
+        if rates is None and self.url:
+            rates = self._fetch()
+            if rates is not None:
+                self._save_file(rates)
+
+        if rates is None:
+            if stale is not None:
+                logger.warning("⚠️ 환율 API 오류, 이전 환율 사용")
+                rates = stale['rates']
+            else:
+                rates = self._load_file()
+                if rates is None:
+                    if self.url:
+                        logger.warning("⚠️ 환율 API 오류, 기본값 사용")
+                    rates = dict(DEFAULT_RATES)
+
+        _cache[self.cache_key] = {'rates': rates, 'fetched_at': time.monotonic()}
+        return rates
+
+    def _fetch(self):
+        """환율 API 조회"""
+        try:
+            response = get_session().get(self.url, timeout=self.timeout)
+            response.raise_for_status()
+            return self._parse_rates(response.json())
+        except (requests.RequestException, ValueError):
+            return None
+
+    def _parse_rates(self, payload):
+        """{'rates': {'JPY': 9.0, ...}} 형식 검증"""
+        rates = payload.get('rates') if isinstance(payload, dict) else None
+        if not isinstance(rates, dict) or not rates:
+            raise ValueError("환율 응답 형식 오류")
+        return {currency: float(rate) for currency, rate in rates.items()}
+
+    def _load_fresh_file(self):
+        """TTL 이내에 다른 프로세스가 저장한 환율 파일이 있으면 사용"""
+        if not self.url:
+            return None
+        try:
+            age = time.time() - os.path.getmtime(self.fallback_path)
+        except OSError:
+            return None
+        if age >= self.ttl:
+            return None
+        return self._load_file()
+
+    def _load_file(self):
+        """파일 폴백 환율 로드"""
+        try:
+            with open(self.fallback_path, encoding='utf-8') as f:
+                return self._parse_rates(json.load(f))
+        except (OSError, ValueError):
+            return None
+
+    def _save_file(self, rates):
+        """조회한 환율을 폴백 파일에 저장"""
+        tmp_path = f"{self.fallback_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'rates': rates, 'saved_at': time.time()}, f)
+            os.replace(tmp_path, self.fallback_path)
+        except OSError:
+            pass
+
+
+_default_provider = None
+
+
+def get_default_provider():
+    """환경 변수 설정을 따르는 기본 환율 제공자"""
+    global _default_provider
+    if _default_provider is None:
+        _default_provider = ExchangeRateProvider()
+    return _default_provider
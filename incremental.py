@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+증분 처리 모듈
+아이템 입력과 설정을 단계별로 해시해 로컬 상태 DB(sqlite)에 저장하고,
+다시 실행할 때 의존성이 바뀐 단계만 재계산
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+
+from records import Item, PriceBreakdown, StrategyDecision
+
+logger = logging.getLogger('casatrade.incremental')
+
+# 코드 로직(계산식, 근거 문구 등)을 바꿨으면 올려서 저장된 결과를 모두 무효화
+STATE_VERSION = 3
+
+DEFAULT_STATE_PATH = 'casatrade_state.sqlite'
+
+STAGES = ('pricing', 'strategy', 'content')
+
+# 단계별로 직접 읽는 아이템 필드 (앞 단계 결과는 출력 해시로 연결)
+#   pricing  ← 경매가, 국내 시세 + 환율/관세/수수료
+#   strategy ← 전략 조건 필드 + pricing 결과 + 전략 설정
+#   content  ← 브랜드/이름/국내 시세 + pricing/strategy 결과 + 템플릿/CTA
+STAGE_INPUTS = {
+    'pricing': ('auction_price', 'currency', 'price_unit', 'auction_price_jpy', 'domestic_price_krw'),
+    'strategy': ('name', 'notes', 'category', 'month', 'rank', 'domestic_price_krw'),
+    'content': ('brand', 'name', 'domestic_price_krw')
+}
+
+KEY_FIELDS = ('lot_id', 'id')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    item_key TEXT PRIMARY KEY,
+    pricing_hash TEXT,
+    pricing TEXT,
+    strategy_hash TEXT,
+    strategy TEXT,
+    content_hash TEXT,
+    contents TEXT,
+    updated_at REAL
+)
+"""
+
+
+def _encode(value):
+    """저장용 JSON (키 순서 유지: 재사용 결과가 새로 계산한 결과와 같은 모양이 되도록)"""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def digest(*values):
+    """값들을 정렬된 JSON으로 직렬화해 128비트 해시 반환"""
+    text = json.dumps(values, ensure_ascii=False, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def item_key(item_data):
+    """아이템 식별 키 (lot_id/id가 없으면 입력 전체의 해시)"""
+    for field in KEY_FIELDS:
+        value = item_data.get(field)
+        if value not in (None, ''):
+            return f"{field}:{value}"
+    return 'hash:' + digest(item_data)
+
+
+class StateStore:
+    """아이템별 단계 해시와 결과를 저장하는 sqlite 상태 DB"""
+
+    def __init__(self, path=DEFAULT_STATE_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(_SCHEMA)
+        self.conn.commit()
+
+    def load(self, keys):
+        """키 목록에 해당하는 저장 행을 {키: 행} 으로 반환"""
+        rows = {}
+        keys = list(dict.fromkeys(keys))
+        # sqlite 바인딩 변수 수 제한(기본 999) 안에서 나눠 조회
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            cursor = self.conn.execute(
+                f"SELECT item_key, pricing_hash, pricing, strategy_hash, strategy, content_hash, contents "
+                f"FROM items WHERE item_key IN ({placeholders})", chunk)
+            for row in cursor:
+                rows[row[0]] = row[1:]
+        return rows
+
+    def save(self, rows):
+        """(키, 단계 해시/결과 JSON...) 행들을 한 트랜잭션으로 저장"""
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(*row, now) for row in rows])
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class IncrementalProcessor:
+    """CasaTradeAIMarketer 결과를 단계별로 캐시하고 바뀐 단계만 재계산"""
+
+    def __init__(self, marketer, store, chunk_size=256):
+        self.marketer = marketer
+        self.store = store
+        self.chunk_size = chunk_size
+        self.stats = {'items': 0, **{f"{stage}_reused": 0 for stage in STAGES},
+                      **{f"{stage}_computed": 0 for stage in STAGES}}
+        self.cross_rates = marketer.calculator.refresh_rates()
+        self.fingerprints = self._config_fingerprints()
+
+    def _config_fingerprints(self):
+        """단계별 설정 해시 (환율이 바뀌면 pricing부터 전부 다시 계산됨)"""
+        marketer = self.marketer
+        calculator = marketer.calculator
+        templates = {
+            persona: [template.parts, template.slots]
+            for persona, template in marketer.persona_generator.templates.items()
+        }
+        return {
+            'pricing': digest(STATE_VERSION, calculator.cross_rates.to_krw,
+                              calculator.customs_rate, calculator.service_fee_rate),
+            'strategy': digest(STATE_VERSION, marketer.strategy_analyzer.strategies,
+                               marketer.strategy_analyzer.demand_curves),
+            'content': digest(STATE_VERSION, templates, marketer.cta_manager.cta_templates)
+        }
+
+    def _stage_hash(self, stage, item_data, upstream):
+        fields = [item_data.get(field) for field in STAGE_INPUTS[stage]]
+        return digest(self.fingerprints[stage], fields, upstream)
+
+    def process_items(self, items):
+        """아이템을 청크 단위로 처리하며 결과를 순서대로 생성"""
+        chunk = []
+        for item_data in items:
+            chunk.append(item_data)
+            if len(chunk) >= self.chunk_size:
+                yield from self._process_chunk(chunk)
+                chunk = []
+        if chunk:
+            yield from self._process_chunk(chunk)
+
+    def _process_chunk(self, items):
+        marketer = self.marketer
+        stats = self.stats
+        # 실행 중 환율표가 갱신되면 pricing 지문도 새 환율로 다시 계산
+        cross_rates = marketer.calculator.refresh_rates()
+        if cross_rates is not self.cross_rates:
+            self.cross_rates = cross_rates
+            self.fingerprints = self._config_fingerprints()
+        if marketer.price_index is not None:
+            # 추정 시세도 단계 입력으로 해시해 인덱스를 다시 만들면 해당 아이템만 재계산
+            items = [item.source for item in marketer.fill_domestic_prices(items)]
+        keys = [item_key(item_data) for item_data in items]
+        stored = self.store.load(keys)
+        updates = {}
+        results = []
+
+        for key, item_data in zip(keys, items):
+            row = stored.get(key) or (None,) * 6
+            changed = False
+            marketer._start_item()
+            item = Item.coerce(item_data)
+
+            pricing_hash = self._stage_hash('pricing', item_data, None)
+            if pricing_hash == row[0]:
+                pricing_json = row[1]
+                price = PriceBreakdown.from_dict(json.loads(pricing_json))
+                stats['pricing_reused'] += 1
+            else:
+                with marketer._stage('pricing'):
+                    price = marketer.calculator.calculate_breakdown(item)
+                pricing_json = _encode(price.to_dict())
+                stats['pricing_computed'] += 1
+                changed = True
+
+            strategy_hash = self._stage_hash('strategy', item_data, pricing_hash)
+            if strategy_hash == row[2]:
+                strategy_json = row[3]
+                strategy = StrategyDecision.from_dict(json.loads(strategy_json))
+                stats['strategy_reused'] += 1
+            else:
+                with marketer._stage('strategy'):
+                    strategy = marketer.strategy_analyzer.decide(item, price)
+                strategy_json = _encode(strategy.to_dict())
+                stats['strategy_computed'] += 1
+                changed = True
+
+            # 전략 결과 자체가 같으면(예: 비고만 바뀜) 콘텐츠는 재사용
+            content_hash = self._stage_hash('content', item_data, [pricing_hash, strategy_json])
+            if content_hash == row[4]:
+                contents_json = row[5]
+                contents = json.loads(contents_json)
+                stats['content_reused'] += 1
+            else:
+                contents = marketer.render_contents(item, price, strategy)
+                contents_json = _encode(contents)
+                stats['content_computed'] += 1
+                changed = True
+
+            if changed:
+                updates[key] = (key, pricing_hash, pricing_json, strategy_hash, strategy_json,
+                                content_hash, contents_json)
+            stats['items'] += 1
+            results.append(marketer._build_result(item, price, strategy, contents=contents))
+
+        if updates:
+            self.store.save(updates.values())
+        return results
+
+
+def run_incremental_batch(marketer, input_path, output_path, state_path=DEFAULT_STATE_PATH, dedup=None):
+    """카탈로그 파일을 증분 처리해 JSONL로 기록하고 (처리 통계, 단계별 재사용 통계) 반환"""
+    from batch_processor import iter_items, write_results
+
+    with StateStore(state_path) as store:
+        processor = IncrementalProcessor(marketer, store)
+        stats = write_results(processor.process_items(iter_items(input_path)), output_path, dedup)
+    return stats, processor.stats
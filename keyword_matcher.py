@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+다중 키워드 매칭 모듈
+Aho-Corasick 오토마톤으로 텍스트를 한 번만 훑어 모든 키워드 위치를 찾음
+"""
+
+from collections import deque
+
+
+class KeywordMatcher:
+    def __init__(self, keywords=()):
+        # 노드별 전이 테이블, 실패 링크, 출력(키워드 인덱스 목록)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        self.keywords = []
+        for keyword in keywords:
+            self.add(keyword)
+        self._built = False
+
+    def add(self, keyword):
+        """키워드 추가 후 인덱스 반환 (build 전에만 가능)"""
+        if not keyword:
+            raise ValueError("빈 키워드는 추가할 수 없습니다.")
+        node = 0
+        for char in keyword:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+
+        index = len(self.keywords)
+        self.keywords.append(keyword)
+        self._output[node].append(index)
+        self._built = False
+        return index
+
+    def build(self):
+        """실패 링크 계산 (BFS)"""
+        queue = deque(self._goto[0].values())
+        for node in queue:
+            self._fail[node] = 0
+
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+        self._built = True
+        return self
+
+    def iter_matches(self, text):
+        """(끝 위치, 키워드 인덱스) 쌍을 텍스트 순서대로 반환"""
+        if not self._built:
+            self.build()
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for index in output[node]:
+                yield position + 1, index
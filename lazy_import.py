@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+지연 임포트 모듈
+무거운 의존성(numpy, requests)을 실제로 사용할 때까지 로드하지 않음
+"""
+
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """첫 속성 접근 시점에 실제로 로드되는 모듈 객체 반환"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+비동기 LLM 클라이언트 모듈
+마스터 프롬프트를 동시성/토큰 속도 제한, 재시도, 타임아웃을 지키며 전송
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+
+from async_http import HTTPError, post_json, split_url
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class LLMRequestError(Exception):
+    """재시도 후에도 실패한 LLM 요청"""
+
+    def __init__(self, message, status=None, attempts=0):
+        super().__init__(message)
+        self.status = status
+        self.attempts = attempts
+
+
+def estimate_tokens(text):
+    """토큰 수 추정 (한글 기준 대략 2글자당 1토큰)"""
+    return len(text) // 2 + 1
+
+
+class TokenRateLimiter:
+    """분당 토큰 수 제한 (토큰 버킷)"""
+
+    def __init__(self, tokens_per_minute):
+        self.capacity = float(tokens_per_minute)
+        self.rate = tokens_per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens):
+        """토큰이 충분해질 때까지 대기"""
+        tokens = min(tokens, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+
+class AsyncLLMClient:
+    def __init__(self, url, model='default', max_concurrency=8, tokens_per_minute=None,
+                 max_tokens=1024, max_retries=3, backoff_base=0.5, backoff_max=8.0, timeout=60.0, headers=None):
+        split_url(url)  # 잘못된 URL은 요청 전에 ValueError
+        self.url = url
+        # 요청마다 붙일 헤더 (예: {'Authorization': 'Bearer ...'})
+        self.headers = dict(headers or {})
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.max_tokens = max_tokens
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.rate_limiter = TokenRateLimiter(tokens_per_minute) if tokens_per_minute else None
+        self._semaphore = None
+
+    def _build_payload(self, prompt):
+        """프롬프트를 요청 본문으로 변환
+
+        (고정 프롬프트, 아이템 블록) 쌍이면 고정 부분을 system으로 보내 제공자 측 캐싱을 활용한다.
+        """
+        if isinstance(prompt, tuple):
+            system, user = prompt
+        else:
+            system, user = None, prompt
+
+        payload = {'model': self.model, 'prompt': user, 'max_tokens': self.max_tokens}
+        if system is not None:
+            payload['system'] = system
+        return payload
+
+    def _backoff_delay(self, attempt, retry_after=None):
+        """지수 백오프 + 지터 (Retry-After 우선)"""
+        if retry_after is not None:
+            try:
+                return min(self.backoff_max, float(retry_after))
+            except ValueError:
+                pass
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def complete(self, prompt):
+        """프롬프트 하나를 전송하고 응답 반환 (재시도 포함)"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        payload = self._build_payload(prompt)
+        if self.rate_limiter is not None:
+            text = payload['prompt'] + payload.get('system', '')
+            await self.rate_limiter.acquire(estimate_tokens(text) + self.max_tokens)
+
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            started = time.perf_counter()
+            try:
+                async with self._semaphore:
+                    status, headers, body = await post_json(self.url, payload, timeout=self.timeout,
+                                                            headers=self.headers)
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError, OSError, ValueError, HTTPError) as e:
+                last_error = LLMRequestError(f"요청 실패: {e!r}", attempts=attempt + 1)
+            else:
+                if status == 200 and not isinstance(body, dict):
+                    # 본문이 없거나 JSON 객체가 아닌 200 응답은 재시도
+                    last_error = LLMRequestError("응답 본문 없음 또는 형식 오류", status=status, attempts=attempt + 1)
+                elif status == 200:
+                    return {
+                        'text': body.get('text', ''),
+                        'usage': body.get('usage', {}),
+                        'attempts': attempt + 1,
+                        'latency_sec': time.perf_counter() - started
+                    }
+                else:
+                    last_error = LLMRequestError(f"HTTP {status}", status=status, attempts=attempt + 1)
+                    if status not in RETRYABLE_STATUS:
+                        raise last_error
+                    retry_after = headers.get('retry-after')
+
+            if attempt < self.max_retries:
+                await asyncio.sleep(self._backoff_delay(attempt, retry_after))
+
+        raise last_error
+
+    async def stream_completions(self, prompts):
+        """여러 프롬프트를 동시에 전송하고 완료되는 순서대로 반환
+
+        (index, 결과 dict 또는 LLMRequestError)를 내보낸다.
+        대기 중인 작업 수를 제한하므로 프롬프트 이터러블을 미리 모두 읽지 않는다.
+        """
+        iterator = enumerate(prompts)
+        max_pending = self.max_concurrency * 2
+        pending = {}
+
+        def submit_next():
+            for index, prompt in iterator:
+                pending[asyncio.ensure_future(self.complete(prompt))] = index
+                return True
+            return False
+
+        while len(pending) < max_pending and submit_next():
+            pass
+
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index = pending.pop(task)
+                    submit_next()
+                    try:
+                        yield index, task.result()
+                    except LLMRequestError as e:
+                        yield index, e
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+def _parse_headers(values):
+    """'이름: 값' 목록을 dict로 (값의 $환경변수는 치환)"""
+    headers = {}
+    for value in values or ():
+        name, separator, header_value = value.partition(':')
+        if not separator or not name.strip():
+            raise SystemExit(f"잘못된 헤더: {value} ('이름: 값' 형식)")
+        headers[name.strip()] = os.path.expandvars(header_value.strip())
+    return headers
+
+
+async def _generate_catalog_threads(args):
+    from batch_processor import iter_items
+    from master_prompt_system import MasterPromptSystem
+
+    system = MasterPromptSystem()
+    client = AsyncLLMClient(args.url, max_concurrency=args.concurrency,
+                            tokens_per_minute=args.tokens_per_minute, max_retries=args.retries,
+                            timeout=args.timeout, headers=_parse_headers(args.header))
+    prompts = (system.generate_prompt_parts(item) for item in iter_items(args.input))
+
+    count = failed = 0
+    started = time.perf_counter()
+    with open(args.output, 'w', encoding='utf-8') as out:
+        async for index, result in client.stream_completions(prompts):
+            if isinstance(result, LLMRequestError):
+                failed += 1
+                record = {'index': index, 'error': str(result), 'attempts': result.attempts}
+            else:
+                record = {'index': index, **result}
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            count += 1
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ {count:,}개 응답 ({failed:,}개 실패), {elapsed:.2f}초")
+
+
+def main():
+    """카탈로그의 마스터 프롬프트를 LLM으로 전송"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="마스터 프롬프트 일괄 전송")
+    parser.add_argument('--input', required=True, help="카탈로그 파일 (JSONL 또는 CSV)")
+    parser.add_argument('--output', default='threads.jsonl', help="응답 JSONL 파일")
+    parser.add_argument('--url', required=True, help="LLM API 주소")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--tokens-per-minute', type=int, default=None)
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--header', action='append', metavar='"NAME: VALUE"',
+                        help="요청 헤더 (여러 번 지정 가능, 예: 'Authorization: Bearer $LLM_API_KEY')")
+    asyncio.run(_generate_catalog_threads(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,61 +5,476 @@
 명품 리셀 전략 분석 및 콘텐츠 생성 도구
 """
 
+import argparse
 import json
+import logging
+import os
+from collections.abc import Mapping
+from contextlib import nullcontext
 from datetime import datetime
 from calculator import PriceCalculator
 from strategy_analyzer import StrategyAnalyzer
 from persona_generator import PersonaGenerator
 from cta_manager import CTAManager
+from render_cache import RenderCache
+from records import Item
+
+logger = logging.getLogger('casatrade')
+# 아이템별 진행 메시지 (일괄 처리에서는 기본으로 꺼짐)
+progress_logger = logging.getLogger('casatrade.progress')
+
+_NO_TIMER = nullcontext()
+
+class LazyContents(Mapping):
+    """페르소나별 콘텐츠+CTA를 처음 읽을 때 렌더링하는 읽기 전용 Mapping
+
+    키(선택된 페르소나) 순회와 len()은 렌더링하지 않는다. dict(contents)나 JSON 직렬화(json_default)는
+    전부 렌더링하고, 프로세스 간 전달(pickle)은 전부 렌더링한 dict로 보낸다.
+    """
+    __slots__ = ('_marketer', '_item', '_price', '_strategy', '_personas', '_verbose', '_values', '_rendered')
+
+    def __init__(self, marketer, item, price, strategy, personas, verbose=False):
+        self._marketer = marketer
+        self._item = item
+        self._price = price
+        self._strategy = strategy
+        self._personas = personas
+        self._verbose = verbose
+        self._values = None
+        self._rendered = {}
+
+    def __getitem__(self, persona):
+        content = self._rendered.get(persona)
+        if content is None:
+            if persona not in self._personas:
+                raise KeyError(persona)
+            marketer = self._marketer
+            if self._values is None:
+                self._values = marketer.persona_generator.record_values(
+                    self._item, self._price.total_cost_krw, self._strategy)
+            content = self._rendered[persona] = marketer._render_persona(persona, self._values, self._strategy)
+            if self._verbose:
+                progress_logger.info("📝 %s 콘텐츠 생성 완료", persona)
+        return content
+
+    def __iter__(self):
+        return iter(self._personas)
+
+    def __len__(self):
+        return len(self._personas)
+
+    def __repr__(self):
+        return f"LazyContents(personas={list(self._personas)}, rendered={list(self._rendered)})"
+
+    def rendered(self):
+        """지금까지 렌더링된 페르소나만 dict로 반환 (새로 렌더링하지 않음)"""
+        return dict(self._rendered)
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
 
 class CasaTradeAIMarketer:
-    def __init__(self):
+    def __init__(self, render_cache_size=0, metrics=None, channels=None, price_index=None, sales_history=None,
+                 profiler=None):
         self.calculator = PriceCalculator()
-        self.strategy_analyzer = StrategyAnalyzer()
+        # 판매 이력(SalesHistory 또는 디렉터리 경로)이 있으면 시즌 판단에 카테고리별 수요 곡선 사용
+        demand_curves = None
+        if sales_history is not None:
+            if isinstance(sales_history, str):
+                from sales_history import SalesHistory
+                sales_history = SalesHistory(sales_history)
+            demand_curves = sales_history.demand_curves()
+        self.strategy_analyzer = StrategyAnalyzer(demand_curves=demand_curves)
         self.persona_generator = PersonaGenerator()
         self.cta_manager = CTAManager()
+        self.render_cache = RenderCache(render_cache_size) if render_cache_size else None
+        self.metrics = metrics
+        # 채널 → 게시 페르소나 목록 (예: {'instagram': ['mz'], 'blog': ['business', 'startup']})
+        self.channels = channels or {}
+        # 국내 시세가 없는 아이템에 추정값을 채울 DomesticPriceIndex (워커에는 .npz 경로로 전달)
+        if isinstance(price_index, str):
+            from price_index import DomesticPriceIndex
+            price_index = DomesticPriceIndex.load(price_index)
+        self.price_index = price_index
+        # 단계별 cProfile/tracemalloc 샘플링 (지정하지 않으면 CASATRADE_PROFILE 환경 변수로 켬, 없으면 모듈도 불러오지 않음)
+        if profiler is None and os.environ.get('CASATRADE_PROFILE'):
+            from profiling import StageProfiler
+            profiler = StageProfiler.from_env()
+        self.profiler = profiler
+    
+    def _stage(self, name, **labels):
+        """단계별 실행 시간 측정과 프로파일링 (둘 다 꺼져 있으면 아무것도 하지 않음)"""
+        timer = _NO_TIMER
+        if self.metrics is not None:
+            labels['stage'] = name
+            timer = self.metrics.timer('stage_seconds', labels)
+        if self.profiler is not None:
+            return self.profiler.stage(name, timer)
+        return timer
     
-    def process_item(self, item_data):
-        """아이템 정보를 처리하여 마케팅 콘텐츠 생성"""
-        print("🔄 아이템 분석 시작...")
+    def _start_item(self):
+        """아이템(또는 묶음) 처리 시작: 프로파일링 샘플링 여부 결정"""
+        if self.profiler is not None:
+            self.profiler.start_item()
+    
+    def process_item(self, item_data, personas=None, channels=None, generate_content=True, lazy_contents=False):
+        """아이템 정보를 처리하여 마케팅 콘텐츠 생성 (결과는 일반 dict)
+
+        contents는 추천 페르소나(personas/channels를 주면 그중 요청한 것만)의 콘텐츠+CTA dict이다.
+        lazy_contents=True면 대신 처음 읽을 때 렌더링하는 LazyContents(읽기 전용 Mapping)를 담는다.
+        generate_content=False면 가격 계산과 전략 분석만 하고 contents는 빈 dict이다.
+        """
+        verbose = progress_logger.isEnabledFor(logging.INFO)
+        if verbose:
+            progress_logger.info("🔄 아이템 분석 시작...")
+        self._start_item()
+        item = Item.coerce(item_data)
+        if self.price_index is not None and not item.domestic_price_krw:
+            item = self.fill_domestic_prices([item])[0]
         
         # 1. 가격 계산
-        calculated_price = self.calculator.calculate_total_cost(item_data)
-        print(f"💰 총 매입가: {calculated_price['total_cost_krw']:,}원")
+        with self._stage('pricing'):
+            price = self.calculator.calculate_breakdown(item)
+        if verbose:
+            progress_logger.info("💰 총 매입가: %s원", f"{price.total_cost_krw:,}")
         
         # 2. 전략 분석
-        strategy = self.strategy_analyzer.analyze_strategy(item_data, calculated_price)
-        print(f"🎯 추천 전략: {strategy['strategy_name']}")
+        with self._stage('strategy'):
+            strategy = self.strategy_analyzer.decide(item, price)
+        if verbose:
+            progress_logger.info("🎯 추천 전략: %s", strategy.strategy_name)
         
-        # 3. 페르소나별 콘텐츠 생성
-        personas = strategy['recommended_personas']
-        contents = {}
+        return self._build_result(item, price, strategy, verbose, personas=personas, channels=channels,
+                                  generate_content=generate_content, lazy_contents=lazy_contents)
+    
+    def process_items(self, items, personas=None, channels=None, generate_content=True, lazy_contents=False):
+        """여러 아이템을 일괄 처리 (가격 계산과 전략 분석은 배열 연산으로 한 번에, 인자는 process_item과 같음)"""
+        self._start_item()
+        items = self.fill_domestic_prices([Item.coerce(item_data) for item_data in items])
+        if not items:
+            return []
         
-        for persona in personas:
-            content = self.persona_generator.generate_content(
-                item_data, calculated_price, strategy, persona
-            )
-            contents[persona] = content
-            print(f"📝 {persona} 콘텐츠 생성 완료")
+        with self._stage('pricing_batch'):
+            batch = self.calculator.calculate_total_cost_batch(items)
+            prices = self.calculator.unpack_breakdowns(items, batch)
+        with self._stage('strategy_batch'):
+            strategies = self.strategy_analyzer.decide_batch(items, batch)
         
-        # 4. CTA 추가
-        final_contents = {}
-        for persona, content in contents.items():
-            cta = self.cta_manager.get_cta(persona, strategy)
-            final_contents[persona] = content + "\n\n" + cta
+        verbose = progress_logger.isEnabledFor(logging.INFO)
+        return [
+            self._build_result(item, price, strategy, verbose, personas=personas, channels=channels,
+                               generate_content=generate_content, lazy_contents=lazy_contents)
+            for item, price, strategy in zip(items, prices, strategies)
+        ]
+    
+    def fill_domestic_prices(self, items):
+        """시세 인덱스가 있으면 국내 시세가 없는 아이템에 추정값을 채운 Item 목록 반환 (없으면 그대로)"""
+        if self.price_index is None:
+            return items
+        with self._stage('price_index'):
+            return self.price_index.fill_missing(items)
+    
+    def select_personas(self, strategy, personas=None, channels=None):
+        """추천 페르소나 중 요청한 페르소나/채널에 해당하는 것만 추천 순서대로 반환 (둘 다 없으면 전부)"""
+        recommended = strategy.recommended_personas
+        if personas is None and channels is None:
+            return tuple(recommended)
+        
+        templates = self.persona_generator.templates
+        for persona in personas or ():
+            if persona not in templates:
+                raise ValueError(f"알 수 없는 페르소나: {persona} (가능: {', '.join(templates)})")
+        wanted = set(personas or ())
+        for channel in channels or ():
+            if channel not in self.channels:
+                raise ValueError(f"알 수 없는 채널: {channel} (가능: {', '.join(self.channels) or '없음'})")
+            wanted.update(self.channels[channel])
+        return tuple(persona for persona in recommended if persona in wanted)
+    
+    def _build_result(self, item, price, strategy, verbose=False, contents=None, personas=None, channels=None,
+                      generate_content=True, lazy_contents=False):
+        """페르소나별 콘텐츠와 CTA를 붙여 최종 결과 생성 (contents가 주어지면 그대로 사용)
+
+        내부에서 쓰던 PriceBreakdown/StrategyDecision 레코드는 공개 결과에서 일반 dict로 바꾼다
+        (수정, isinstance(..., dict), json.dumps가 예전처럼 동작).
+        """
+        # 3. 페르소나별 콘텐츠 + CTA
+        if contents is None:
+            if generate_content:
+                selected = self.select_personas(strategy, personas, channels)
+                if lazy_contents:
+                    contents = LazyContents(self, item, price, strategy, selected, verbose)
+                else:
+                    contents = self._render_contents(item, price, strategy, selected, verbose)
+            else:
+                contents = {}
+        
+        if self.metrics is not None:
+            self.metrics.increment('items')
+            self.metrics.increment('strategy', {'strategy': strategy.strategy_name})
         
         return {
-            'item_info': item_data,
-            'calculated_price': calculated_price,
-            'strategy': strategy,
-            'contents': final_contents,
+            'item_info': item.source,
+            'calculated_price': price.to_dict(),
+            'strategy': strategy.to_dict(),
+            'contents': contents,
             'generated_at': datetime.now().isoformat()
         }
 
-def main():
+    def render_contents(self, item, price, strategy, verbose=False):
+        """Item/PriceBreakdown/StrategyDecision 레코드로 추천 페르소나별 콘텐츠+CTA를 모두 생성해 dict로 반환"""
+        return self._render_contents(item, price, strategy, strategy.recommended_personas, verbose)
+    
+    def _render_contents(self, item, price, strategy, personas, verbose=False):
+        """선택한 페르소나 콘텐츠+CTA를 바로 렌더링 (템플릿 입력값은 한 번만 계산)"""
+        if not personas:
+            return {}
+        values = self.persona_generator.record_values(item, price.total_cost_krw, strategy)
+        contents = {}
+        if self.render_cache is None and self.metrics is None and self.profiler is None and not verbose:
+            # 캐시·측정·진행 로그가 없으면 단계 컨텍스트 없이 바로 렌더링 (아이템마다 페르소나 수만큼 도는 경로)
+            render, get_cta = self.persona_generator.render, self.cta_manager.get_cta
+            for persona in personas:
+                contents[persona] = render(persona, values) + "\n\n" + get_cta(persona, strategy)
+            return contents
+        for persona in personas:
+            contents[persona] = self._render_persona(persona, values, strategy)
+            if verbose:
+                progress_logger.info("📝 %s 콘텐츠 생성 완료", persona)
+        return contents
+    
+    def _render_persona(self, persona, values, strategy):
+        """콘텐츠와 CTA 렌더링 (캐시 사용 시 템플릿 입력값이 같으면 재사용)
+
+        페르소나 카운터는 여기서 올리므로 LazyContents는 실제로 읽힌 페르소나만 센다.
+        """
+        if self.metrics is not None:
+            self.metrics.increment('persona', {'persona': persona})
+        if self.render_cache is None:
+            return self._render_content_with_cta(persona, values, strategy)
+        
+        key = (persona, strategy.strategy_name, *values.values())
+        return self.render_cache.get_or_render(
+            key, lambda: self._render_content_with_cta(persona, values, strategy))
+    
+    def _render_content_with_cta(self, persona, values, strategy):
+        with self._stage('persona', persona=persona):
+            content = self.persona_generator.render(persona, values)
+        with self._stage('cta', persona=persona):
+            cta = self.cta_manager.get_cta(persona, strategy)
+        return content + "\n\n" + cta
+
+def run_batch_mode(args):
+    """카탈로그 일괄 처리 실행"""
+    from batch_processor import iter_items, run_batch, write_results
+    
+    metrics = None
+    if args.metrics_out:
+        from metrics import MetricsRegistry
+        metrics = MetricsRegistry()
+    
+    if args.workers > 1 and args.state_db:
+        logger.warning("⚠️ --state-db는 --workers 1에서만 사용됩니다. 단일 프로세스로 처리합니다.")
+        args.workers = 1
+    if args.top_k and (args.workers > 1 or args.state_db):
+        logger.warning("⚠️ --top-k는 단일 프로세스로 처리하며 --state-db와 함께 쓸 수 없습니다.")
+        args.workers = 1
+        args.state_db = None
+    
+    process_options = {
+        'personas': args.personas.split(',') if args.personas else None,
+        'generate_content': not args.no_content
+    }
+    if args.state_db and (args.personas or args.no_content):
+        logger.warning("⚠️ --state-db는 모든 추천 페르소나 콘텐츠를 저장하므로 --personas/--no-content를 무시합니다.")
+    
+    dedup = None
+    if args.dedup_db:
+        from dedup import PostDeduplicator
+        # 워커도 같은 기본 템플릿을 쓰므로 고정 문구는 부모 프로세스의 마케터로 수집
+        dedup = PostDeduplicator.for_marketer(
+            CasaTradeAIMarketer(), args.dedup_db, args.dedup_threshold, args.drop_duplicates,
+            max_age_days=args.dedup_days)
+    
+    if args.workers > 1:
+        if metrics is not None:
+            logger.warning("⚠️ --metrics-out은 --workers 1에서만 수집됩니다.")
+        from parallel_processor import process_catalog_parallel
+        
+        results = process_catalog_parallel(
+            iter_items(args.input),
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            ordered=not args.unordered,
+            marketer_options={'render_cache_size': args.render_cache, 'price_index': args.price_index,
+                              'sales_history': args.sales_history},
+            process_options=process_options
+        )
+        stats = write_results(results, args.output, dedup)
+    else:
+        marketer = CasaTradeAIMarketer(render_cache_size=args.render_cache, metrics=metrics,
+                                       price_index=args.price_index, sales_history=args.sales_history)
+        if args.top_k:
+            from ranking import run_ranking_batch
+            stats, rank_stats = run_ranking_batch(marketer, args.input, args.output, args.top_k, args.rank_by,
+                                                  args.strategy_top_k, dedup, process_options)
+            logger.info("🏆 %s개 중 상위 %s개 선별 (후보 %s개, 시세 없음 %s개, 스캔 %.2f초)",
+                        f"{rank_stats['scanned']:,}", f"{rank_stats['survivors']:,}",
+                        f"{rank_stats['candidates']:,}", f"{rank_stats['unscored']:,}", rank_stats['scan_sec'])
+        elif args.state_db:
+            from incremental import run_incremental_batch
+            stats, stage_stats = run_incremental_batch(marketer, args.input, args.output, args.state_db, dedup)
+            for stage in ('pricing', 'strategy', 'content'):
+                logger.info("♻️ %s: 재사용 %s / 재계산 %s", stage,
+                            f"{stage_stats[stage + '_reused']:,}", f"{stage_stats[stage + '_computed']:,}")
+        else:
+            stats = run_batch(marketer, args.input, args.output, dedup, process_options)
+        if marketer.render_cache is not None:
+            cache_stats = marketer.render_cache.stats()
+            logger.info("🗂️ 렌더 캐시: 히트 %s / 미스 %s / 제거 %s (히트율 %.1f%%)",
+                        f"{cache_stats['hits']:,}", f"{cache_stats['misses']:,}",
+                        f"{cache_stats['evictions']:,}", cache_stats['hit_rate'] * 100)
+        if metrics is not None:
+            metrics.write(args.metrics_out)
+            logger.info("📈 지표 저장 → %s", args.metrics_out)
+        if marketer.profiler is not None and marketer.profiler.write():
+            logger.info("🔬 프로파일: 아이템 %s개 중 %s개 샘플링 → %s", f"{marketer.profiler.items:,}",
+                        f"{marketer.profiler.sampled_items:,}", marketer.profiler.output_dir)
+    
+    if dedup is not None:
+        dedup.index.close()
+        logger.info("🧬 게시물 %s개 중 중복 %s개 (클러스터 %s개, 제외된 아이템 %s개, 인덱스 %s개)",
+                    f"{dedup.stats['posts']:,}", f"{dedup.stats['duplicates']:,}",
+                    f"{dedup.index.cluster_count():,}", f"{dedup.stats['dropped_items']:,}", f"{len(dedup.index):,}")
+    
+    logger.info("=" * 50)
+    logger.info("✅ %s개 처리 완료 → %s", f"{stats['items']:,}", args.output)
+    if stats.get('errors'):
+        logger.warning("⚠️ %s개 아이템 처리 실패 (error 레코드로 기록됨)", f"{stats['errors']:,}")
+    logger.info("⏱️ %.2f초, %s items/s", stats['elapsed_sec'], f"{stats['items_per_sec']:,.1f}")
+
+def run_worker_mode(args):
+    """상주 워커 실행: 마케터를 한 번만 생성하고 stdin/소켓 요청 처리"""
+    import worker
+    
+    marketer = CasaTradeAIMarketer(render_cache_size=args.render_cache, price_index=args.price_index,
+                                   sales_history=args.sales_history)
+    if args.serve_socket:
+        worker.serve_socket(marketer, args.serve_socket)
+    else:
+        worker.serve_stdin(marketer)
+
+def run_service_mode(args):
+    """HTTP 서비스 실행"""
+    import asyncio
+    from service import MarketerService
+    
+    marketer_options = {'render_cache_size': args.render_cache, 'price_index': args.price_index,
+                        'sales_history': args.sales_history}
+    service = MarketerService(
+        lambda: CasaTradeAIMarketer(**marketer_options),
+        host=args.host,
+        port=args.port,
+        max_batch_size=args.batch_size,
+        batch_wait_ms=args.batch_wait_ms,
+        max_queue=args.max_queue,
+        executor='process' if args.workers > 1 else 'thread',
+        workers=args.workers,
+        marketer_options=marketer_options
+    )
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+def parse_args(argv=None):
+    """커맨드라인 인자 파싱"""
+    parser = argparse.ArgumentParser(description="까사트레이드 AI 마케터")
+    parser.add_argument('--input', help="카탈로그 파일 (JSONL 또는 CSV)")
+    parser.add_argument('--output', default='results.jsonl', help="결과 JSONL 파일 (.cols 디렉터리면 컬럼형 저장)")
+    parser.add_argument('--workers', type=int, default=1, help="병렬 처리 프로세스 수")
+    parser.add_argument('--chunk-size', type=int, default=64, help="워커에 한 번에 보낼 아이템 수")
+    parser.add_argument('--unordered', action='store_true', help="완료되는 순서대로 결과 기록")
+    parser.add_argument('--render-cache', type=int, default=0, help="콘텐츠+CTA LRU 캐시 크기 (0이면 사용 안 함)")
+    parser.add_argument('--state-db', metavar='PATH', help="증분 처리 상태 DB (sqlite): 바뀐 아이템/단계만 재계산")
+    parser.add_argument('--personas', help="생성할 페르소나 (쉼표 구분, 추천 페르소나 중 해당하는 것만)")
+    parser.add_argument('--no-content', action='store_true', help="가격 계산과 전략 분석만 하고 콘텐츠 생성 생략")
+    parser.add_argument('--top-k', type=int, default=0, help="점수 상위 K개(전체/전략별)만 콘텐츠까지 생성해 기록")
+    parser.add_argument('--rank-by', default='margin', choices=('margin', 'profit', 'combined'),
+                        help="--top-k 점수: 수익률, 예상 이익, 이익×수익률")
+    parser.add_argument('--strategy-top-k', type=int, help="전략별 상위 개수 (기본값 --top-k, 0이면 전체 순위만)")
+    parser.add_argument('--dedup-db', metavar='PATH', help="게시물 중복 지문 인덱스 (sqlite): 이전 실행 게시물까지 비교")
+    parser.add_argument('--dedup-threshold', type=float, default=0.9, help="중복으로 볼 추정 유사도 (MinHash)")
+    parser.add_argument('--dedup-days', type=float, help="이 기간(일)보다 오래된 지문은 인덱스에서 삭제")
+    parser.add_argument('--drop-duplicates', action='store_true', help="다른 글의 변형인 게시물은 결과에서 제외")
+    parser.add_argument('--price-index', metavar='PATH',
+                        help="국내 시세 인덱스 (.npz): 국내 시세가 없는 아이템에 과거 판매 기반 추정값 사용")
+    parser.add_argument('--build-price-index', metavar='CSV',
+                        help="과거 판매 CSV(brand, model, rank, price_krw)로 --price-index 파일 생성")
+    parser.add_argument('--sales-history', metavar='DIR',
+                        help="판매 이력 저장소: 시즌 선점 판단과 시즌 시세 보정에 카테고리 × 월 수요 곡선 사용")
+    parser.add_argument('--append-sales', metavar='CSV',
+                        help="판매 기록 CSV(brand, category, month, price_krw, days_to_sell)를 --sales-history에 추가")
+    parser.add_argument('--profile', metavar='DIR',
+                        help="샘플링한 아이템의 단계별 cProfile(pstats, collapsed stack)과 tracemalloc 상위 할당 저장")
+    parser.add_argument('--profile-rate', type=float, default=0.01, help="--profile 샘플링 비율 (0~1)")
+    parser.add_argument('--metrics-out', help="단계별 지표 저장 파일 (.json 또는 Prometheus 텍스트)")
+    parser.add_argument('--serve-stdin', action='store_true', help="상주 워커: stdin JSONL 입력, stdout JSONL 출력")
+    parser.add_argument('--serve-socket', metavar='PATH', help="상주 워커: 유닉스 소켓으로 요청 처리")
+    parser.add_argument('--serve-http', action='store_true', help="HTTP 서비스 (POST /items, POST /items:batch)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--batch-size', type=int, default=64, help="마이크로 배치 최대 크기")
+    parser.add_argument('--batch-wait-ms', type=float, default=5.0, help="마이크로 배치 대기 시간(ms)")
+    parser.add_argument('--max-queue', type=int, default=1024, help="대기열 크기 (초과 시 503)")
+    parser.add_argument('--log-level', default='INFO', help="로그 레벨")
+    parser.add_argument('--progress', action='store_true', help="일괄 처리에서도 아이템별 진행 메시지 출력")
+    parser.add_argument('--quiet', action='store_true', help="진행 메시지 출력 끄기")
+    return parser.parse_args(argv)
+
+def configure_logging(args):
+    """콘솔 출력 설정 (--quiet면 완전히 끔)"""
+    if args.quiet:
+        logging.disable(logging.CRITICAL)
+        return
+    logging.basicConfig(level=args.log_level.upper(), format='%(message)s')
+    if (args.input or args.serve_stdin or args.serve_socket or args.serve_http) and not args.progress:
+        progress_logger.setLevel(logging.WARNING)
+
+def main(argv=None):
     """메인 실행 함수"""
-    print("🏠 까사트레이드 AI 마케터 시작!")
-    print("=" * 50)
+    args = parse_args(argv)
+    configure_logging(args)
+    if args.profile:
+        # 워커 프로세스도 같은 설정으로 켜지도록 환경 변수로 전달
+        from profiling import PROFILE_ENV, PROFILE_RATE_ENV
+        os.environ[PROFILE_ENV] = args.profile
+        os.environ[PROFILE_RATE_ENV] = str(args.profile_rate)
+    if args.build_price_index:
+        from price_index import DEFAULT_INDEX_PATH, build_index
+        args.price_index = args.price_index or DEFAULT_INDEX_PATH
+        build_index(args.build_price_index, args.price_index)
+        if not (args.input or args.serve_stdin or args.serve_socket or args.serve_http or args.append_sales):
+            return
+    if args.append_sales:
+        from sales_history import DEFAULT_HISTORY_PATH, SalesHistory, append_sales_csv
+        args.sales_history = args.sales_history or DEFAULT_HISTORY_PATH
+        append_sales_csv(SalesHistory(args.sales_history), args.append_sales)
+        if not (args.input or args.serve_stdin or args.serve_socket or args.serve_http):
+            return
+    if args.serve_http:
+        run_service_mode(args)
+        return
+    if args.serve_stdin or args.serve_socket:
+        run_worker_mode(args)
+        return
+    if args.input:
+        run_batch_mode(args)
+        return
+    
+    logger.info("🏠 까사트레이드 AI 마케터 시작!")
+    logger.info("=" * 50)
     
     # 샘플 아이템 데이터
     sample_item = {
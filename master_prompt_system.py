@@ -6,35 +6,94 @@ AI의 창의성을 폭발시키는 프롬프트 엔지니어링 기반 콘텐츠
 """
 
 import json
+import os
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
+
+from exchange_rate import get_default_provider
+from keyword_matcher import KeywordMatcher
+from records import DEFAULT_CURRENCY, auction_price_fields, legacy_jpy_price
+
+KEYWORD_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'creative_keywords.json')
+
+# 키워드를 찾을 아이템 필드 (한 문자열로 이어 붙여 한 번에 스캔)
+KEYWORD_FIELDS = ('name', 'notes', 'brand')
+FIELD_SEPARATOR = '\x00'
 
 class MasterPromptSystem:
-    def __init__(self):
+    def __init__(self, keyword_table_path=KEYWORD_TABLE_PATH, rate_provider=None):
+        # 엔화가 아닌 경매가를 가격 기준(100엔 단위)으로 환산할 때 쓰는 환율
+        self.rate_provider = rate_provider or get_default_provider()
         self.master_prompt_template = self._load_master_prompt_template()
+        self.item_prompt_template = self._load_item_prompt_template()
         self.success_cases = self._load_success_cases()
         self.creative_missions = self._load_creative_missions()
+        # 아이템과 무관한 앞부분은 한 번만 만들어 그대로 재사용 (프롬프트 캐싱 대상)
+        self.static_prefix = self._build_static_prefix()
+        self.keyword_rules, self.keyword_matcher, self.keyword_entries = self._load_keyword_table(keyword_table_path)
+    
+    def _load_keyword_table(self, path):
+        """키워드→트렌드/스토리/페르소나 테이블을 로드해 단일 매처로 컴파일"""
+        with open(path, encoding='utf-8') as f:
+            table = json.load(f)
+        
+        matcher = KeywordMatcher()
+        keyword_index = {}
+        entries = []  # 키워드 인덱스 → [(섹션, 규칙 번호, 필드 번호, 정확히 일치)]
+        
+        for section, rules in table.items():
+            for rule_index, rule in enumerate(rules):
+                for field in rule['fields']:
+                    if field not in KEYWORD_FIELDS:
+                        raise ValueError(f"{path}: 지원하지 않는 필드 '{field}'")
+                    field_id = KEYWORD_FIELDS.index(field)
+                    for keyword in rule['keywords']:
+                        keyword = keyword.lower()
+                        index = keyword_index.get(keyword)
+                        if index is None:
+                            index = keyword_index[keyword] = matcher.add(keyword)
+                            entries.append([])
+                        entries[index].append((section, rule_index, field_id, rule.get('exact', False)))
+        
+        return table, matcher.build(), entries
+    
+    def _scan_keywords(self, item_data: Dict[str, Any]) -> Dict[str, List[Any]]:
+        """아이템 텍스트를 한 번 스캔해 섹션별 결과를 규칙 순서대로 반환"""
+        values = [str(item_data.get(field, '')).lower() for field in KEYWORD_FIELDS]
+        text = FIELD_SEPARATOR.join(values)
+        
+        # 필드별 [시작, 끝) 위치
+        bounds = []
+        start = 0
+        for value in values:
+            bounds.append((start, start + len(value)))
+            start += len(value) + 1
+        
+        hits = set()
+        for end, index in self.keyword_matcher.iter_matches(text):
+            begin = end - len(self.keyword_matcher.keywords[index])
+            for section, rule_index, field_id, exact in self.keyword_entries[index]:
+                field_start, field_end = bounds[field_id]
+                if exact:
+                    matched = begin == field_start and end == field_end
+                else:
+                    matched = field_start <= begin and end <= field_end
+                if matched:
+                    hits.add((section, rule_index))
+        
+        # 걸린 규칙만 (섹션, 규칙 순서)로 정렬해 모음 (규칙 표 크기와 무관)
+        results = {section: [] for section in self.keyword_rules}
+        for section, rule_index in sorted(hits):
+            results[section].extend(self.keyword_rules[section][rule_index]['outputs'])
+        return results
     
     def _load_master_prompt_template(self) -> str:
-        """마스터 프롬프트 템플릿 로드"""
+        """마스터 프롬프트 템플릿 로드 (아이템과 무관한 고정 부분)"""
         return """
 너는 대한민국 1등 명품 리셀 마케터이자, 트렌드 분석가, 카피라이터, 심리학자다. 
 너의 목표는 단순히 제품을 설명하는 것이 아니라, 사람들의 숨겨진 욕망을 자극하고, 
 그들이 미처 생각하지 못했던 새로운 관점을 제시하여 행동하게 만드는 것이다.
 
-[데이터 입력]
-아이템: {item_name}
-브랜드: {brand}
-경매가: {auction_price_jpy}엔
-등급: {rank}
-국내시세: {domestic_price_krw}원
-특이사항: {notes}
-
-[컨텍스트 입력]
-현재 날짜: {current_date}
-계절: {season}
-시장 상황: {market_context}
-
 [기존 성공사례 주입]
 참고로, 다음 방식들이 과거에 성공했었다:
 {success_cases}
@@ -43,7 +102,7 @@ class MasterPromptSystem:
 이들의 성공 요인(심리적 자극, 긴급성 부여 등)만 추출하여 완전히 새로운 앵글을 만들어라.
 
 [창의적 발상 명령어]
-위 정보를 바탕으로, 아래의 미션을 수행하여 기존에 우리가 한 번도 시도하지 않았던, 
+맨 아래의 [데이터 입력]과 [컨텍스트 입력]을 바탕으로, 아래의 미션을 수행하여 기존에 우리가 한 번도 시도하지 않았던, 
 완전히 새로운 쓰레드 콘텐츠 2개를 제안하라.
 
 {creative_missions}
@@ -54,6 +113,31 @@ class MasterPromptSystem:
 그리고 '왜 이 전략이 성공할 것 같은지'에 대한 간단한 자기 분석을 덧붙여라.
 """
     
+    def _load_item_prompt_template(self) -> str:
+        """아이템별 데이터 블록 템플릿 로드"""
+        return """
+[데이터 입력]
+아이템: {item_name}
+브랜드: {brand}
+경매가: {auction_price}
+등급: {rank}
+국내시세: {domestic_price_krw}원
+특이사항: {notes}
+
+[컨텍스트 입력]
+현재 날짜: {current_date}
+계절: {season}
+시장 상황: {market_context}
+"""
+    
+    def _build_static_prefix(self) -> str:
+        """성공사례와 미션을 채운 고정 프롬프트"""
+        success_cases_text = "\n".join([f"- {case}" for case in self.success_cases])
+        return self.master_prompt_template.format(
+            success_cases=success_cases_text,
+            creative_missions=self.creative_missions
+        )
+    
     def _load_success_cases(self) -> List[str]:
         """과거 성공사례 로드"""
         return [
@@ -80,24 +164,46 @@ class MasterPromptSystem:
     
     def generate_master_prompt(self, item_data: Dict[str, Any]) -> str:
         """마스터 프롬프트 생성"""
+        prefix, suffix = self.generate_prompt_parts(item_data)
+        return prefix + suffix
+    
+    def generate_prompt_parts(self, item_data: Dict[str, Any]) -> Tuple[str, str]:
+        """(고정 프롬프트, 아이템 데이터 블록) 쌍 생성"""
         current_date = datetime.now().strftime("%Y년 %m월 %d일")
         season = self._determine_season(item_data.get('month', 9))
+        return self.static_prefix, self._format_item_block(
+            item_data, current_date, season, self._get_market_context())
+    
+    def generate_master_prompts(self, items: List[Dict[str, Any]]) -> List[str]:
+        """여러 아이템의 마스터 프롬프트 일괄 생성 (공통 부분은 한 번만 계산)"""
+        current_date = datetime.now().strftime("%Y년 %m월 %d일")
         market_context = self._get_market_context()
+        seasons = {}
+        prompts = []
         
-        success_cases_text = "\n".join([f"- {case}" for case in self.success_cases])
+        for item_data in items:
+            month = item_data.get('month', 9)
+            season = seasons.get(month)
+            if season is None:
+                season = seasons[month] = self._determine_season(month)
+            prompts.append(self.static_prefix + self._format_item_block(
+                item_data, current_date, season, market_context))
         
-        return self.master_prompt_template.format(
+        return prompts
+    
+    def _format_item_block(self, item_data: Dict[str, Any], current_date: str,
+                           season: str, market_context: str) -> str:
+        """아이템별 데이터 블록 생성"""
+        return self.item_prompt_template.format(
             item_name=item_data.get('name', ''),
             brand=item_data.get('brand', ''),
-            auction_price_jpy=item_data.get('auction_price_jpy', 0),
+            auction_price=self._format_auction_price(item_data),
             rank=item_data.get('rank', ''),
             domestic_price_krw=item_data.get('domestic_price_krw', 0),
             notes=item_data.get('notes', ''),
             current_date=current_date,
             season=season,
-            market_context=market_context,
-            success_cases=success_cases_text,
-            creative_missions=self.creative_missions
+            market_context=market_context
         )
     
     def _determine_season(self, month: int) -> str:
@@ -117,57 +223,59 @@ class MasterPromptSystem:
     
     def analyze_creative_potential(self, item_data: Dict[str, Any]) -> Dict[str, Any]:
         """창의적 잠재력 분석"""
+        keyword_hits = self._scan_keywords(item_data)
+        price = self._legacy_unit_price(item_data)
         analysis = {
-            'weakness_to_strength': self._analyze_weakness_to_strength(item_data),
-            'trend_connections': self._analyze_trend_connections(item_data),
-            'industry_analogies': self._analyze_industry_analogies(item_data),
-            'emotional_storytelling': self._analyze_emotional_storytelling(item_data),
-            'new_personas': self._suggest_new_personas(item_data)
+            'weakness_to_strength': self._analyze_weakness_to_strength(item_data, keyword_hits),
+            'trend_connections': keyword_hits.get('trend_connections', []),
+            'industry_analogies': self._analyze_industry_analogies(item_data, price),
+            'emotional_storytelling': keyword_hits.get('emotional_storytelling', []),
+            'new_personas': self._suggest_new_personas(item_data, keyword_hits, price)
         }
         return analysis
     
-    def _analyze_weakness_to_strength(self, item_data: Dict[str, Any]) -> List[str]:
+    def _analyze_weakness_to_strength(self, item_data: Dict[str, Any],
+                                      keyword_hits: Dict[str, List[Any]]) -> List[str]:
         """단점을 장점으로 승화시키는 방법 분석"""
         rank = item_data.get('rank', '')
-        notes = item_data.get('notes', '').lower()
         
         strategies = []
         
         if rank in ['C', 'D', 'F']:
             strategies.append("낡은 것 = 빈티지, 오래된 것 = 클래식")
         
-        if '수리' in notes or '손상' in notes:
-            strategies.append("수리 필요 = 개인화 기회, 손상 = 스토리텔링 소재")
-        
-        if '비주류' in notes or '희귀' in notes:
-            strategies.append("비주류 = 독점성, 희귀 = 특별함")
-        
+        strategies.extend(keyword_hits.get('weakness_to_strength', []))
         return strategies
     
-    def _analyze_trend_connections(self, item_data: Dict[str, Any]) -> List[str]:
-        """트렌드 연결 분석"""
-        item_name = item_data.get('name', '').lower()
-        brand = item_data.get('brand', '').lower()
-        
-        trends = []
-        
-        if '트렌치' in item_name or '코트' in item_name:
-            trends.extend(['올드머니 룩', '클래식 리바이벌', '지속가능한 패션'])
-        
-        if brand in ['chanel', 'hermes', 'louis vuitton']:
-            trends.extend(['럭셔리 투자', '상품화된 패션', '상징적 가치'])
-        
-        if 'vintage' in item_name or 'retro' in item_name:
-            trends.extend(['Y2K', '빈티지', '지속가능성'])
-        
-        return trends
+    def _format_auction_price(self, item_data: Dict[str, Any]) -> str:
+        """경매가를 통화 금액으로 표시 (예: 2,000,000 JPY)"""
+        if 'auction_price' not in item_data and 'auction_price_jpy' not in item_data:
+            return '0'
+        price, currency, price_unit = auction_price_fields(item_data)
+        return f"{price * price_unit:,} {currency}"
+    
+    def _legacy_unit_price(self, item_data: Dict[str, Any]):
+        """경매가를 가격 기준 단위(예전 auction_price_jpy, 100엔)로 환산 (가격이 없거나 지원하지 않는 통화면 None)
+
+        엔화는 환율과 무관하게 그대로 환산하고, 다른 통화는 현재 교차 환율로 엔화 금액을 구한다.
+        """
+        if item_data.get('auction_price') is None and item_data.get('auction_price_jpy') is None:
+            return None
+        price, currency, price_unit = auction_price_fields(item_data)
+        if currency != DEFAULT_CURRENCY:
+            to_krw = self.rate_provider.get_cross_rates().to_krw
+            if currency not in to_krw:
+                return None
+            price, price_unit = price * price_unit * (to_krw[currency] / to_krw[DEFAULT_CURRENCY]), 1
+        return legacy_jpy_price(price, DEFAULT_CURRENCY, price_unit)
     
-    def _analyze_industry_analogies(self, item_data: Dict[str, Any]) -> List[str]:
-        """산업 유추 분석"""
-        price = item_data.get('auction_price_jpy', 0)
-        domestic_price = item_data.get('domestic_price_krw', 0)
+    def _analyze_industry_analogies(self, item_data: Dict[str, Any], price) -> List[str]:
+        """산업 유추 분석 (price는 100엔 단위 경매가, None이면 가격 유추 생략)"""
+        domestic_price = item_data.get('domestic_price_krw') or 0
         
         analogies = []
+        if price is None:
+            return analogies
         
         if price < 1000:  # 저가
             analogies.append("주식: 페니스톡 투자 - 작은 금액으로 큰 수익 가능")
@@ -179,38 +287,12 @@ class MasterPromptSystem:
         
         return analogies
     
-    def _analyze_emotional_storytelling(self, item_data: Dict[str, Any]) -> List[str]:
-        """감성적 스토리텔링 분석"""
-        item_name = item_data.get('name', '')
-        brand = item_data.get('brand', '')
-        
-        stories = []
-        
-        if '트렌치' in item_name:
-            stories.append("영국 비 속에서의 로맨틱한 이야기")
-            stories.append("클래식 영화 속 주인공의 스타일")
-        
-        if brand.lower() in ['chanel', 'hermes']:
-            stories.append("명품의 역사와 전통")
-            stories.append("세대를 이어가는 가치")
-        
-        return stories
-    
-    def _suggest_new_personas(self, item_data: Dict[str, Any]) -> List[Dict[str, str]]:
-        """새로운 페르소나 제안"""
-        item_name = item_data.get('name', '').lower()
-        price = item_data.get('auction_price_jpy', 0)
-        
-        personas = []
-        
-        if '트렌치' in item_name or '코트' in item_name:
-            personas.append({
-                'name': '올드머니 지망생',
-                'description': '클래식한 스타일을 추구하는 20-30대',
-                'motivation': '세련된 이미지 구축'
-            })
+    def _suggest_new_personas(self, item_data: Dict[str, Any],
+                              keyword_hits: Dict[str, List[Any]], price) -> List[Dict[str, str]]:
+        """새로운 페르소나 제안 (price는 100엔 단위 경매가)"""
+        personas = [dict(persona) for persona in keyword_hits.get('new_personas', [])]
         
-        if price < 2000:
+        if price is not None and price < 2000:
             personas.append({
                 'name': '소액 투자자',
                 'description': '작은 돈으로 큰 수익을 노리는 사람',
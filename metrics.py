@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+지표 수집 모듈
+단계별 타이머, 카운터, 히스토그램(p50/p95/p99)과 Prometheus/JSON 내보내기
+"""
+
+import json
+import random
+import time
+from contextlib import contextmanager
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    """관측값 분포 (고정 크기 저수지 샘플링으로 분위수 추정)"""
+
+    def __init__(self, reservoir_size=10000, seed=None):
+        self.reservoir_size = reservoir_size
+        self.samples = []
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+        self._random = random.Random(seed)
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+        if len(self.samples) < self.reservoir_size:
+            self.samples.append(value)
+        else:
+            slot = self._random.randrange(self.count)
+            if slot < self.reservoir_size:
+                self.samples[slot] = value
+
+    def quantiles(self, quantiles=QUANTILES):
+        """분위수 계산 (최근접 순위 방식)"""
+        if not self.samples:
+            return {q: 0.0 for q in quantiles}
+        ordered = sorted(self.samples)
+        last = len(ordered) - 1
+        return {q: ordered[min(last, int(q * len(ordered)))] for q in quantiles}
+
+    def snapshot(self):
+        quantiles = self.quantiles()
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min or 0.0,
+            'max': self.max or 0.0,
+            'p50': quantiles[0.5],
+            'p95': quantiles[0.95],
+            'p99': quantiles[0.99]
+        }
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+def _format_labels(label_key, extra=()):
+    pairs = list(label_key) + list(extra)
+    if not pairs:
+        return ''
+    body = ','.join(f'{name}="{str(value)}"' for name, value in pairs)
+    return '{' + body + '}'
+
+
+class MetricsRegistry:
+    def __init__(self, namespace='casatrade'):
+        self.namespace = namespace
+        self.counters = {}
+        self.histograms = {}
+
+    def increment(self, name, labels=None, value=1):
+        """카운터 증가"""
+        series = self.counters.setdefault(name, {})
+        key = _label_key(labels)
+        series[key] = series.get(key, 0) + value
+
+    def observe(self, name, value, labels=None):
+        """히스토그램에 값 기록"""
+        series = self.histograms.setdefault(name, {})
+        key = _label_key(labels)
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram()
+        histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name, labels=None):
+        """블록 실행 시간(초)을 히스토그램에 기록"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, labels)
+
+    def snapshot(self):
+        """JSON 직렬화 가능한 현재 지표"""
+        return {
+            'counters': {
+                name: [{'labels': dict(key), 'value': value} for key, value in series.items()]
+                for name, series in self.counters.items()
+            },
+            'histograms': {
+                name: [{'labels': dict(key), **histogram.snapshot()} for key, histogram in series.items()]
+                for name, series in self.histograms.items()
+            }
+        }
+
+    def to_prometheus(self):
+        """Prometheus 텍스트 형식 (히스토그램은 summary로 출력)"""
+        lines = []
+        for name, series in sorted(self.counters.items()):
+            metric = f"{self.namespace}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for key, value in sorted(series.items()):
+                lines.append(f"{metric}{_format_labels(key)} {value}")
+
+        for name, series in sorted(self.histograms.items()):
+            metric = f"{self.namespace}_{name}"
+            lines.append(f"# TYPE {metric} summary")
+            for key, histogram in sorted(series.items()):
+                for q, value in histogram.quantiles().items():
+                    lines.append(f"{metric}{_format_labels(key, [('quantile', q)])} {value:.9f}")
+                lines.append(f"{metric}_sum{_format_labels(key)} {histogram.sum:.9f}")
+                lines.append(f"{metric}_count{_format_labels(key)} {histogram.count}")
+
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        """확장자에 따라 JSON(.json) 또는 Prometheus 텍스트로 저장"""
+        with open(path, 'w', encoding='utf-8') as f:
+            if path.endswith('.json'):
+                json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+            else:
+                f.write(self.to_prometheus())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+목업 LLM 서버
+오프라인 테스트용으로 지연, 실패, 속도 제한을 주입할 수 있는 asyncio HTTP 서버
+"""
+
+import asyncio
+import json
+import random
+
+from async_http import HTTPError, build_response, read_request, wants_keep_alive
+
+
+class MockLLMServer:
+    def __init__(self, host='127.0.0.1', port=0, latency=0.05, jitter=0.0,
+                 failure_rate=0.0, rate_limit_rate=0.0, hang_rate=0.0, seed=None):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.hang_rate = hang_rate
+        self.random = random.Random(seed)
+        self.stats = {'requests': 0, 'completed': 0, 'failed': 0, 'rate_limited': 0, 'hung': 0,
+                      'in_flight': 0, 'max_in_flight': 0}
+        self._server = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/v1/complete"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except HTTPError as e:
+                    writer.write(build_response(e.status, {'error': e.message}, keep_alive=False))
+                    break
+                if request is None:
+                    break
+
+                method, path, headers, body = request
+                keep_alive = wants_keep_alive(headers)
+                status, payload, extra_headers = await self._respond(method, body)
+                writer.write(build_response(status, payload, keep_alive, extra_headers))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, method, body):
+        """주입 설정에 따라 응답 생성"""
+        if method != 'POST':
+            return 405, {'error': 'POST only'}, None
+
+        stats = self.stats
+        stats['requests'] += 1
+        roll = self.random.random()
+
+        if roll < self.rate_limit_rate:
+            stats['rate_limited'] += 1
+            return 429, {'error': 'rate limited'}, {'Retry-After': '0.1'}
+
+        stats['in_flight'] += 1
+        stats['max_in_flight'] = max(stats['max_in_flight'], stats['in_flight'])
+        try:
+            if roll < self.rate_limit_rate + self.hang_rate:
+                stats['hung'] += 1
+                await asyncio.sleep(3600)
+
+            delay = self.latency + self.random.uniform(0, self.jitter)
+            await asyncio.sleep(delay)
+
+            if roll < self.rate_limit_rate + self.hang_rate + self.failure_rate:
+                stats['failed'] += 1
+                return 503, {'error': 'injected failure'}, None
+
+            request = json.loads(body or b'{}')
+            prompt = request.get('prompt', '')
+            system = request.get('system', '')
+            stats['completed'] += 1
+            return 200, {
+                'text': f"[mock] {prompt.strip()[:40]}",
+                'usage': {
+                    'prompt_tokens': (len(prompt) + len(system)) // 2 + 1,
+                    'completion_tokens': 16
+                }
+            }, None
+        finally:
+            stats['in_flight'] -= 1
+
+
+async def _serve(args):
+    server = MockLLMServer(port=args.port, latency=args.latency, jitter=args.jitter,
+                           failure_rate=args.failure_rate, rate_limit_rate=args.rate_limit_rate,
+                           seed=args.seed)
+    await server.start()
+    print(f"🤖 목업 LLM 서버: {server.url}")
+    await asyncio.Event().wait()
+
+
+def main():
+    """목업 서버 단독 실행"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="목업 LLM 서버")
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=None)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+병렬 카탈로그 처리 모듈
+워커 프로세스마다 마케터를 한 번만 생성하고 아이템을 청크 단위로 분배
+"""
+
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+# 워커 프로세스별 마케터 (initializer에서 한 번만 생성)
+_worker_marketer = None
+
+
+def _init_worker(marketer_options):
+    """워커 프로세스 초기화: 계산기/분석기/생성기/CTA 테이블 생성"""
+    global _worker_marketer
+    from main import CasaTradeAIMarketer
+    _worker_marketer = CasaTradeAIMarketer(**marketer_options)
+
+
+def get_worker_marketer():
+    """현재 워커 프로세스의 마케터 (initializer 실행 후에만 유효)"""
+    return _worker_marketer
+
+
+def _process_chunk(chunk, process_options=None):
+    """워커에서 청크 하나를 처리 (콘텐츠는 결과를 부모로 보낼 때 렌더링되고, 실패한 아이템은 오류 레코드)"""
+    from batch_processor import process_item_safely
+    return [process_item_safely(_worker_marketer, item, process_options) for item in chunk]
+
+
+def iter_chunks(items, chunk_size):
+    """아이템 이터러블을 chunk_size 크기의 리스트로 분할"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def process_catalog_parallel(items, workers=None, chunk_size=64, ordered=True, max_pending=None,
+                             marketer_options=None, process_options=None):
+    """아이템을 여러 프로세스에서 처리하여 결과를 하나씩 반환
+
+    ordered=True면 입력 순서대로, False면 완료되는 순서대로 결과를 내보낸다.
+    동시에 대기하는 청크 수를 max_pending으로 제한해 입력을 끝까지 읽어 두지 않는다.
+    marketer_options는 워커별 CasaTradeAIMarketer 생성 인자로, process_options는 process_item 인자로 전달된다.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 4
+    chunks = iter_chunks(items, chunk_size)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(marketer_options or {},)) as pool:
+        if ordered:
+            pending = deque()
+            for chunk in islice(chunks, max_pending):
+                pending.append(pool.submit(_process_chunk, chunk, process_options))
+
+            while pending:
+                results = pending.popleft().result()
+                for chunk in islice(chunks, 1):
+                    pending.append(pool.submit(_process_chunk, chunk, process_options))
+                yield from results
+        else:
+            pending = {pool.submit(_process_chunk, chunk, process_options) for chunk in islice(chunks, max_pending)}
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for _ in range(len(done)):
+                    for chunk in islice(chunks, 1):
+                        pending.add(pool.submit(_process_chunk, chunk, process_options))
+                for future in done:
+                    yield from future.result()
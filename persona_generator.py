@@ -5,8 +5,68 @@
 각 페르소나에 맞는 쓰레드 콘텐츠 생성
 """
 
+import os
+from string import Formatter
+
+from records import Item, StrategyDecision
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates', 'personas')
+
+# 템플릿에서 사용할 수 있는 필드 (아이템당 한 번 계산)
+TEMPLATE_FIELDS = frozenset([
+    'brand', 'item_name', 'total_cost', 'profit', 'margin', 'target_price', 'angle', 'reasoning'
+])
+
+# 템플릿 파일 경로 → (mtime_ns, CompiledTemplate)
+_template_cache = {}
+
+
+class CompiledTemplate:
+    """조각 리스트로 미리 파싱된 템플릿"""
+    __slots__ = ('parts', 'slots')
+    
+    def __init__(self, text, source='<template>'):
+        parts = []
+        slots = []
+        for literal, field_name, format_spec, conversion in Formatter().parse(text):
+            if literal:
+                parts.append(literal)
+            if field_name is None:
+                continue
+            if field_name not in TEMPLATE_FIELDS or format_spec or conversion:
+                raise ValueError(f"{source}: 지원하지 않는 템플릿 필드 {{{field_name}}}")
+            slots.append((len(parts), field_name))
+            parts.append('')
+        self.parts = parts
+        self.slots = tuple(slots)
+    
+    def render(self, values):
+        """필드 값을 채워 한 번에 join"""
+        parts = self.parts.copy()
+        for index, field_name in self.slots:
+            parts[index] = values[field_name]
+        return ''.join(parts)
+
+
+def load_template(path):
+    """템플릿 파일 로드 (수정 시각이 같으면 컴파일 결과 재사용)"""
+    mtime = os.stat(path).st_mtime_ns
+    cached = _template_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    if text.endswith('\n'):
+        text = text[:-1]
+    
+    template = CompiledTemplate(text, source=path)
+    _template_cache[path] = (mtime, template)
+    return template
+
+
 class PersonaGenerator:
-    def __init__(self):
+    def __init__(self, template_dir=TEMPLATE_DIR):
         self.personas = {
             'mz': {
                 'tone': '트렌디하고 유머러스',
@@ -29,129 +89,53 @@ class PersonaGenerator:
                 'style': '데이터 기반의 논리적 설명'
             }
         }
+        self.template_dir = template_dir
+        self.templates = {}
+        self.reload_templates()
+    
+    def reload_templates(self):
+        """템플릿 디렉터리 다시 로드 (변경된 파일만 재컴파일)"""
+        templates = {}
+        for persona in list(self.personas) + ['default']:
+            templates[persona] = load_template(os.path.join(self.template_dir, f"{persona}.txt"))
+        self.templates = templates
     
     def generate_content(self, item_data, calculated_price, strategy, persona):
         """페르소나별 콘텐츠 생성"""
-        persona_info = self.personas[persona]
-        
-        # 기본 정보
-        item_name = item_data['name']
-        brand = item_data.get('brand', '')
-        total_cost = calculated_price['total_cost_krw']
-        domestic_price = item_data.get('domestic_price_krw', 0)
-        profit = domestic_price - total_cost if domestic_price > 0 else 0
-        
-        # 페르소나별 콘텐츠 생성
-        if persona == 'mz':
-            return self._generate_mz_content(item_name, brand, total_cost, profit, strategy)
-        elif persona == 'startup':
-            return self._generate_startup_content(item_name, brand, total_cost, profit, strategy)
-        elif persona == 'sidehustle':
-            return self._generate_sidehustle_content(item_name, brand, total_cost, profit, strategy)
-        elif persona == 'business':
-            return self._generate_business_content(item_name, brand, total_cost, profit, strategy)
-        else:
-            return self._generate_default_content(item_name, brand, total_cost, profit, strategy)
+        values = self.derive_values(item_data, calculated_price, strategy)
+        return self.render(persona, values)
     
-    def _generate_mz_content(self, item_name, brand, total_cost, profit, strategy):
-        """MZ세대용 콘텐츠"""
-        content = f"""🔥 {brand} {item_name} 대박 발견!
-
-💰 매입가: {total_cost:,}원
-📈 예상 수익: {profit:,}원 (수익률: {(profit/total_cost*100):.1f}%)
-
-{strategy['angle']} 전략으로 가져왔는데 진짜 미쳤다... 😱
-
-이거 진짜 핫할 것 같은데? 
-겨울 준비하는 사람들 많을 거 아냐?
-
-#명품리셀 #부업 #투자 #겨울준비"""
-        
-        return content
+    def generate_contents(self, items, calculated_prices, strategies, persona):
+        """여러 아이템의 같은 페르소나 콘텐츠를 한 번에 생성"""
+        template = self.templates.get(persona, self.templates['default'])
+        return [
+            template.render(self.derive_values(item_data, calculated_price, strategy))
+            for item_data, calculated_price, strategy in zip(items, calculated_prices, strategies)
+        ]
     
-    def _generate_startup_content(self, item_name, brand, total_cost, profit, strategy):
-        """창업자용 콘텐츠"""
-        content = f"""🚀 {brand} {item_name} 투자 기회 분석
-
-📊 투자 정보:
-• 매입가: {total_cost:,}원
-• 예상 수익: {profit:,}원
-• 수익률: {(profit/total_cost*100):.1f}%
-• 전략: {strategy['angle']}
-
-이 아이템은 {strategy['reasoning']}
-
-창업 초기 자본이 부족한 상황에서도 
-이런 소액 투자로 시작할 수 있어요.
-
-투자 성공률을 높이려면 
-시장 트렌드를 정확히 파악하는 것이 핵심!
-
-#창업 #투자 #명품리셀 #스타트업"""
-        
-        return content
+    def render(self, persona, values):
+        """derive_values 결과로 템플릿 렌더링"""
+        template = self.templates.get(persona, self.templates['default'])
+        return template.render(values)
     
-    def _generate_sidehustle_content(self, item_name, brand, total_cost, profit, strategy):
-        """부업자용 콘텐츠"""
-        content = f"""💼 {brand} {item_name} 부업 실전 후기
-
-실제 매입가: {total_cost:,}원
-예상 판매가: {total_cost + profit:,}원
-순수익: {profit:,}원
-
-{strategy['angle']} 방식으로 접근했어요.
-
-부업으로 명품 리셀 할 때 
-가장 중요한 건 '타이밍'이에요.
-
-이번엔 겨울 준비 시즌이라 
-수요가 높을 것 같아서 투자했어요.
-
-초보자도 따라할 수 있는 
-실전 팁들 공유할게요!
-
-#부업 #명품리셀 #수익 #실전팁"""
-        
-        return content
+    def derive_values(self, item_data, calculated_price, strategy):
+        """템플릿 필드 값 계산 (아이템당 한 번)"""
+        return self.record_values(Item.coerce(item_data), calculated_price['total_cost_krw'],
+                                  StrategyDecision.coerce(strategy))
     
-    def _generate_business_content(self, item_name, brand, total_cost, profit, strategy):
-        """사업자용 콘텐츠"""
-        content = f"""📈 {brand} {item_name} 사업 분석 보고서
-
-투자 분석:
-• 원가: {total_cost:,}원
-• 목표가: {total_cost + profit:,}원
-• 마진: {profit:,}원 ({(profit/total_cost*100):.1f}%)
-• 전략: {strategy['angle']}
-
-시장 분석:
-{strategy['reasoning']}
-
-사업 관점에서 보면 
-이 아이템은 수익성과 리스크가 
-적절히 균형을 이룬 투자안입니다.
-
-장기적 관점에서 브랜드 가치와 
-시장 수요를 고려했을 때 
-안정적인 수익을 기대할 수 있어요.
-
-#사업 #투자분석 #명품 #마케팅"""
-        
-        return content
-    
-    def _generate_default_content(self, item_name, brand, total_cost, profit, strategy):
-        """기본 콘텐츠"""
-        content = f"""📱 {brand} {item_name} 리셀 정보
-
-매입가: {total_cost:,}원
-예상 수익: {profit:,}원
-전략: {strategy['angle']}
-
-{strategy['reasoning']}
-
-투명한 가격 공개로 
-신뢰할 수 있는 거래를 추구합니다.
-
-#명품리셀 #투명거래 #신뢰"""
+    def record_values(self, item, total_cost, strategy):
+        """Item/StrategyDecision 레코드로 템플릿 필드 값 계산"""
+        domestic_price = item.domestic_price_krw
+        profit = domestic_price - total_cost if domestic_price > 0 else 0
+        margin = profit / total_cost * 100 if total_cost else 0.0
         
-        return content
+        return {
+            'brand': item.brand,
+            'item_name': item.name,
+            'total_cost': f"{total_cost:,}",
+            'profit': f"{profit:,}",
+            'margin': f"{margin:.1f}",
+            'target_price': f"{total_cost + profit:,}",
+            'angle': strategy.angle,
+            'reasoning': strategy.reasoning
+        }
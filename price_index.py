@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+국내 시세 인덱스 모듈
+과거 판매 CSV를 브랜드/모델/랭크별 중앙값으로 모아 두고, 모델명 트라이그램 인덱스로
+비슷한 이름의 새 아이템('버버리 트렌치코트 베이지' 등)에 국내 시세 추정값을 붙임
+    - 온디스크 형식: 압축하지 않은 .npz 하나 (정렬된 트라이그램 키 + CSR 포스팅, 이름 UTF-8 블롭)
+    - 조회: 브랜드로 모델 범위를 좁힌 뒤 쿼리 트라이그램을 이진 탐색해 Dice 유사도가 가장 높은 모델 선택
+"""
+
+import csv
+import json
+import logging
+import math
+import re
+from statistics import median
+
+from lazy_import import lazy_import
+from records import Item, Record
+
+np = lazy_import('numpy')
+
+logger = logging.getLogger('casatrade.price_index')
+
+FORMAT_VERSION = 1
+DEFAULT_INDEX_PATH = 'casatrade_price_index.npz'
+DEFAULT_MIN_SIMILARITY = 0.5
+DEFAULT_MEMO_SIZE = 65536
+
+# 판매 CSV 열 이름 (앞에 있는 것부터 사용)
+NAME_FIELDS = ('model', 'name')
+PRICE_FIELDS = ('price_krw', 'sold_price_krw', 'domestic_price_krw')
+
+# 한글 브랜드 표기 → 영문 (국내 매물명은 한글, 판매 기록은 영문인 경우가 많음)
+BRAND_ALIASES = {
+    '버버리': 'burberry',
+    '샤넬': 'chanel',
+    '에르메스': 'hermes',
+    '루이비통': 'louis vuitton',
+    '구찌': 'gucci',
+    '프라다': 'prada',
+    '롤렉스': 'rolex',
+    '까르띠에': 'cartier',
+    '디올': 'dior',
+    '셀린느': 'celine',
+    '생로랑': 'saint laurent',
+    '보테가베네타': 'bottega veneta',
+    '발렌시아가': 'balenciaga',
+    '몽클레어': 'moncler'
+}
+
+_NON_WORD = re.compile(r'[^0-9a-z가-힣]+')
+# 코드포인트(21비트) 세 개를 int64 하나로
+_SHIFT = 21
+
+
+def normalize_name(text):
+    """소문자 + 기호를 공백으로 + 한글 브랜드 영문화"""
+    tokens = _NON_WORD.sub(' ', str(text).lower()).split()
+    return ' '.join(BRAND_ALIASES.get(token, token) for token in tokens)
+
+
+def strip_brand(text, brand):
+    """정규화된 이름에서 브랜드 단어 제거 (모델 부분만 남김)"""
+    if not brand:
+        return text
+    return ' '.join(f" {text} ".replace(f" {brand} ", ' ').split())
+
+
+def trigram_keys(text):
+    """앞뒤 공백을 붙인 문자열의 트라이그램을 정수 키 집합으로"""
+    codes = [ord(char) for char in f" {text} "]
+    return {(a << 42) | (b << _SHIFT) | c for a, b, c in zip(codes, codes[1:], codes[2:])}
+
+
+class PriceEstimate(Record):
+    """국내 시세 추정 결과"""
+    __slots__ = _fields = ('price_krw', 'matched_name', 'similarity', 'rank_matched', 'sales_count')
+
+    def __init__(self, price_krw, matched_name, similarity, rank_matched, sales_count):
+        self.price_krw = price_krw
+        self.matched_name = matched_name
+        self.similarity = similarity
+        self.rank_matched = rank_matched
+        self.sales_count = sales_count
+
+
+class DomesticPriceIndex:
+    """(브랜드, 모델)별 랭크 중앙값 표 + 모델명 트라이그램 역색인
+
+    모델은 (브랜드, 모델명) 순으로 정렬해 번호를 매기므로 브랜드 하나가 연속 구간이 된다.
+    배열:
+        keys/offsets/postings:  정렬된 트라이그램 키와 CSR 포스팅(키마다 오름차순 모델 번호)
+        gram_counts:            모델별 트라이그램 수 (Dice 분모)
+        brand_starts:           브랜드별 모델 구간 시작 (마지막은 모델 수)
+        name_blob/name_offsets: 브랜드명들 다음 모델명들이 이어진 UTF-8 (매칭된 모델만 디코딩)
+        rank_prices/rank_counts: 모델 × 랭크 중앙값/판매 수 (판매가 없으면 0)
+        prices/counts:          모델 전체 중앙값/판매 수 (해당 랭크 판매가 없을 때 사용)
+    """
+
+    ARRAYS = ('keys', 'offsets', 'postings', 'gram_counts', 'brand_starts', 'name_blob', 'name_offsets',
+              'rank_prices', 'rank_counts', 'prices', 'counts')
+
+    def __init__(self, arrays, ranks, min_similarity=DEFAULT_MIN_SIMILARITY, memo_size=DEFAULT_MEMO_SIZE):
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+        self.ranks = list(ranks)
+        self.rank_index = {rank: index for index, rank in enumerate(self.ranks)}
+        self.min_similarity = min_similarity
+        self.memo_size = memo_size
+        self._memo = {}
+
+        starts = self.brand_starts.tolist()
+        self.brands = {self._text(index): (starts[index], starts[index + 1]) for index in range(len(starts) - 1)}
+        self.brand_words = max((len(brand.split()) for brand in self.brands), default=0)
+
+    def __len__(self):
+        return len(self.prices)
+
+    # ---- 생성 ----
+
+    @classmethod
+    def from_rows(cls, rows, **options):
+        """(브랜드, 모델명, 랭크, 판매가) 행으로 인덱스 생성"""
+        groups = {}
+        keys = {}
+        for brand, name, rank, price in rows:
+            if not price or price <= 0:
+                continue
+            key = keys.get((brand, name))
+            if key is None:
+                brand_text = normalize_name(brand)
+                key = keys[brand, name] = (brand_text, strip_brand(normalize_name(name), brand_text))
+            if key[1]:
+                groups.setdefault(key, {}).setdefault(rank or '', []).append(price)
+
+        models = sorted(groups)
+        ranks = sorted({rank for by_rank in groups.values() for rank in by_rank})
+        rank_index = {rank: index for index, rank in enumerate(ranks)}
+        rank_prices = np.zeros((len(models), len(ranks)), dtype=np.int64)
+        rank_counts = np.zeros((len(models), len(ranks)), dtype=np.int32)
+        prices = np.zeros(len(models), dtype=np.int64)
+        counts = np.zeros(len(models), dtype=np.int32)
+        brands = []
+        brand_starts = []
+        for doc, model in enumerate(models):
+            if not brands or model[0] != brands[-1]:
+                brands.append(model[0])
+                brand_starts.append(doc)
+            by_rank = groups[model]
+            for rank, values in by_rank.items():
+                rank_prices[doc, rank_index[rank]] = round(median(values))
+                rank_counts[doc, rank_index[rank]] = len(values)
+            all_values = [value for values in by_rank.values() for value in values]
+            prices[doc] = round(median(all_values))
+            counts[doc] = len(all_values)
+        brand_starts.append(len(models))
+
+        gram_keys = []
+        gram_docs = []
+        gram_counts = np.zeros(len(models), dtype=np.int32)
+        for doc, (_, model_text) in enumerate(models):
+            grams = trigram_keys(model_text)
+            gram_counts[doc] = len(grams)
+            gram_keys.extend(grams)
+            gram_docs.extend([doc] * len(grams))
+        gram_keys = np.array(gram_keys, dtype=np.int64)
+        gram_docs = np.array(gram_docs, dtype=np.int32)
+        order = np.lexsort((gram_docs, gram_keys))
+        gram_keys = gram_keys[order]
+        keys, starts = np.unique(gram_keys, return_index=True)
+
+        encoded = [text.encode('utf-8') for text in brands + [model_text for _, model_text in models]]
+        name_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(data) for data in encoded], out=name_offsets[1:])
+
+        arrays = {
+            'keys': keys,
+            'offsets': np.append(starts, len(gram_keys)).astype(np.int64),
+            'postings': gram_docs[order],
+            'gram_counts': gram_counts,
+            'brand_starts': np.array(brand_starts, dtype=np.int64),
+            'name_blob': np.frombuffer(b''.join(encoded), dtype=np.uint8),
+            'name_offsets': name_offsets,
+            'rank_prices': rank_prices,
+            'rank_counts': rank_counts,
+            'prices': prices,
+            'counts': counts
+        }
+        return cls(arrays, ranks, **options)
+
+    @classmethod
+    def from_csv(cls, path, **options):
+        """판매 CSV(brand, model 또는 name, rank, price_krw)로 인덱스 생성"""
+        return cls.from_rows(_iter_sales(path), **options)
+
+    def save(self, path):
+        """압축하지 않은 .npz로 저장 (pickle 없이 배열만)"""
+        meta = json.dumps({'version': FORMAT_VERSION, 'ranks': self.ranks}, ensure_ascii=False)
+        with open(path, 'wb') as f:
+            np.savez(f, meta=np.frombuffer(meta.encode('utf-8'), dtype=np.uint8),
+                     **{name: getattr(self, name) for name in self.ARRAYS})
+
+    @classmethod
+    def load(cls, path, **options):
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(data['meta'].tobytes().decode('utf-8'))
+            if meta.get('version') != FORMAT_VERSION:
+                raise ValueError(f"지원하지 않는 시세 인덱스 버전: {meta.get('version')} ({path})")
+            arrays = {name: data[name] for name in cls.ARRAYS}
+        return cls(arrays, meta['ranks'], **options)
+
+    # ---- 조회 ----
+
+    def _text(self, index):
+        start, end = self.name_offsets[index], self.name_offsets[index + 1]
+        return self.name_blob[start:end].tobytes().decode('utf-8')
+
+    def name(self, doc):
+        """모델 번호의 '브랜드 모델명'"""
+        brand_count = len(self.brand_starts) - 1
+        brand = self._text(int(np.searchsorted(self.brand_starts, doc, side='right')) - 1)
+        model = self._text(brand_count + doc)
+        return f"{brand} {model}" if brand else model
+
+    def find_brand(self, text, brand=''):
+        """(인덱스에 있는 브랜드, 브랜드를 뺀 모델명): 브랜드 필드를 먼저 보고 없으면 이름 속 단어로 찾음"""
+        brand_text = normalize_name(brand) if brand else ''
+        if brand_text and brand_text in self.brands:
+            return brand_text, strip_brand(text, brand_text)
+        tokens = text.split()
+        for size in range(min(self.brand_words, len(tokens)), 0, -1):
+            for start in range(len(tokens) - size + 1):
+                candidate = ' '.join(tokens[start:start + size])
+                if candidate and candidate in self.brands:
+                    return candidate, strip_brand(text, candidate)
+        return '', strip_brand(text, brand_text)
+
+    def match(self, model_text, brand=''):
+        """모델명과 Dice 유사도가 가장 높은 (모델 번호, 유사도) (기준 미달이면 None)
+
+        브랜드를 주면 그 브랜드 구간의 모델만 본다. Dice ≥ s인 모델은 쿼리 트라이그램 q개 중
+        최소 s·q/(2-s)개를 공유하므로, 포스팅이 짧은 트라이그램부터 (있는 것 수 - 최소 공유 수 + 1)개에서만
+        후보를 모으고(prefix filtering) 나머지 흔한 트라이그램은 후보에 대해서만 이진 탐색으로 센다.
+        동점이면 판매 수가 많은 모델을 고른다.
+        """
+        keys = self.keys
+        grams = np.fromiter(trigram_keys(model_text), dtype=np.int64)
+        if not len(keys):
+            return None
+        positions = np.minimum(np.searchsorted(keys, grams), len(keys) - 1)
+        positions = positions[keys[positions] == grams]
+        required = max(1, math.ceil(self.min_similarity * len(grams) / (2 - self.min_similarity) - 1e-9))
+        if len(positions) < required:
+            return None
+
+        postings = self.postings
+        starts = self.offsets[positions]
+        ends = self.offsets[positions + 1]
+        if brand:
+            # 포스팅은 키마다 모델 번호 오름차순이라 브랜드 구간은 이진 탐색으로 잘라냄
+            low, high = self.brands[brand]
+            bounded = [(start + int(np.searchsorted(postings[start:end], low)),
+                        start + int(np.searchsorted(postings[start:end], high)))
+                       for start, end in zip(starts.tolist(), ends.tolist())]
+            starts = [start for start, _ in bounded]
+            ends = [end for _, end in bounded]
+        else:
+            starts = starts.tolist()
+            ends = ends.tolist()
+
+        order = sorted((index for index in range(len(starts)) if ends[index] > starts[index]),
+                       key=lambda index: ends[index] - starts[index])
+        prefix_size = len(order) - required + 1
+        if prefix_size <= 0:
+            return None
+
+        hits = [postings[starts[index]:ends[index]] for index in order[:prefix_size]]
+        docs, overlap = np.unique(np.concatenate(hits) if len(hits) > 1 else hits[0], return_counts=True)
+        for index in order[prefix_size:]:
+            posting = postings[starts[index]:ends[index]]
+            found = np.minimum(np.searchsorted(posting, docs), len(posting) - 1)
+            overlap += posting[found] == docs
+
+        similarity = 2.0 * overlap / (len(grams) + self.gram_counts[docs])
+        best = similarity.max()
+        if best < self.min_similarity:
+            return None
+        tied = docs[similarity == best]
+        doc = int(tied[np.argmax(self.counts[tied])]) if len(tied) > 1 else int(tied[0])
+        return doc, float(best)
+
+    def estimate(self, name, brand='', rank=''):
+        """이름(과 브랜드/랭크)으로 국내 시세 추정 (PriceEstimate, 못 찾으면 None)
+
+        같은 랭크 판매 기록이 있으면 그 중앙값, 없으면 모델 전체 중앙값을 쓴다.
+        """
+        key = (name, brand, rank)
+        memo = self._memo
+        if key in memo:
+            return memo[key]
+
+        estimate = None
+        brand_text, model_text = self.find_brand(normalize_name(name), brand)
+        found = self.match(model_text, brand_text) if model_text else None
+        if found is not None:
+            doc, similarity = found
+            rank_column = self.rank_index.get(rank)
+            if rank_column is not None and self.rank_counts[doc, rank_column]:
+                price = int(self.rank_prices[doc, rank_column])
+                sales = int(self.rank_counts[doc, rank_column])
+                rank_matched = True
+            else:
+                price = int(self.prices[doc])
+                sales = int(self.counts[doc])
+                rank_matched = False
+            estimate = PriceEstimate(price, self.name(doc), round(similarity, 3), rank_matched, sales)
+
+        if len(memo) >= self.memo_size:
+            memo.clear()
+        memo[key] = estimate
+        return estimate
+
+    def estimate_many(self, items):
+        """아이템 목록의 국내 시세 일괄 추정 (같은 이름/브랜드/랭크는 한 번만 검색)"""
+        estimate = self.estimate
+        results = []
+        for item_data in items:
+            item = Item.coerce(item_data)
+            results.append(estimate(item.name, item.brand, item.rank))
+        return results
+
+    def fill_missing(self, items):
+        """국내 시세가 없는 아이템만 추정값을 채운 Item 목록 반환 (원본 dict는 바꾸지 않음)
+
+        채운 아이템의 원본(item_info)에는 domestic_price_krw와 함께 domestic_price_estimate
+        (매칭된 모델명, 유사도, 랭크 일치 여부, 판매 수)가 추가된다.
+        """
+        filled = []
+        for item_data in items:
+            item = Item.coerce(item_data)
+            if not item.domestic_price_krw:
+                estimate = self.estimate(item.name, item.brand, item.rank)
+                if estimate is not None:
+                    source = dict(item.source)
+                    source['domestic_price_krw'] = estimate.price_krw
+                    source['domestic_price_estimate'] = {
+                        'matched_name': estimate.matched_name,
+                        'similarity': estimate.similarity,
+                        'rank_matched': estimate.rank_matched,
+                        'sales_count': estimate.sales_count
+                    }
+                    item = Item.from_dict(source)
+            filled.append(item)
+        return filled
+
+
+def _iter_sales(path):
+    """판매 CSV 행을 (브랜드, 모델명, 랭크, 판매가)로"""
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        reader = csv.DictReader(f)
+        fields = reader.fieldnames or []
+        name_field = next((field for field in NAME_FIELDS if field in fields), None)
+        price_field = next((field for field in PRICE_FIELDS if field in fields), None)
+        if name_field is None or price_field is None:
+            raise ValueError(f"판매 CSV에는 {'/'.join(NAME_FIELDS)} 열과 {'/'.join(PRICE_FIELDS)} 열이 필요합니다: {path}")
+        for row in reader:
+            price = row.get(price_field)
+            if not price:
+                continue
+            yield row.get('brand') or '', row[name_field], row.get('rank') or '', float(price)
+
+
+def build_index(csv_path, output_path):
+    """판매 CSV로 인덱스를 만들어 저장하고 인덱스 반환"""
+    index = DomesticPriceIndex.from_csv(csv_path)
+    index.save(output_path)
+    logger.info("💹 시세 인덱스: 브랜드 %s개, 모델 %s개, 트라이그램 %s개 → %s",
+                f"{len(index.brands):,}", f"{len(index):,}", f"{len(index.keys):,}", output_path)
+    return index
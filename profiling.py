@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+프로파일링 모듈
+샘플링한 아이템의 파이프라인 단계(가격 계산, 전략 분석, 페르소나, CTA 등)를 단계별 cProfile과
+tracemalloc으로 측정해 pstats, flamegraph용 collapsed stack, 상위 메모리 할당 위치로 저장
+    - 켜기: --profile DIR (또는 환경 변수 CASATRADE_PROFILE=DIR), 샘플링 비율: --profile-rate / CASATRADE_PROFILE_RATE
+    - 출력(프로세스별): <단계>.<pid>.pstats, <단계>.<pid>.collapsed, memory.<pid>.txt, summary.<pid>.json
+"""
+
+import cProfile
+import json
+import multiprocessing.util
+import os
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+
+PROFILE_ENV = 'CASATRADE_PROFILE'
+PROFILE_RATE_ENV = 'CASATRADE_PROFILE_RATE'
+DEFAULT_SAMPLE_RATE = 0.01
+DEFAULT_TOP_ALLOCATORS = 20
+# collapsed stack 변환 시 이보다 작은 몫(초)의 하위 경로는 생략
+MIN_STACK_SECONDS = 1e-6
+MAX_STACK_DEPTH = 64
+
+# 프로세스별 환경 변수 프로파일러 (같은 프로세스의 마케터들이 공유)
+_env_profiler = None
+
+
+class _ProfiledStage:
+    """샘플링된 단계 하나: 안쪽 컨텍스트(지표 타이머) 안에서 cProfile과 tracemalloc 측정"""
+    __slots__ = ('profiler', 'name', 'inner', 'profile', 'tracing', 'start')
+
+    def __init__(self, profiler, name, inner):
+        self.profiler = profiler
+        self.name = name
+        self.inner = inner
+
+    def __enter__(self):
+        # 잠금은 stage()에서 잡았으므로 진입 중 예외가 나면 __exit__ 대신 여기서 풀어야 함
+        profiler = self.profiler
+        entered = False
+        self.tracing = False
+        try:
+            self.inner.__enter__()
+            entered = True
+            self.profile = profiler.profiles.get(self.name)
+            if self.profile is None:
+                self.profile = profiler.profiles[self.name] = cProfile.Profile()
+            # 다른 곳(벤치마크 등)에서 이미 추적 중이면 메모리 측정은 건너뜀
+            self.tracing = profiler.trace_memory and not tracemalloc.is_tracing()
+            if self.tracing:
+                tracemalloc.start()
+            self.start = time.perf_counter()
+            self.profile.enable()
+        except BaseException as error:
+            try:
+                if self.tracing and tracemalloc.is_tracing():
+                    tracemalloc.stop()
+                if entered:
+                    self.inner.__exit__(type(error), error, error.__traceback__)
+            finally:
+                profiler._lock.release()
+            raise
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profile.disable()
+        elapsed = time.perf_counter() - self.start
+        profiler = self.profiler
+        try:
+            peak = 0
+            if self.tracing:
+                snapshot = tracemalloc.take_snapshot().filter_traces(profiler.trace_filters)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                profiler._add_allocations(self.name, snapshot)
+            stats = profiler.stage_stats.setdefault(self.name, {'calls': 0, 'seconds': 0.0, 'peak_bytes': 0})
+            stats['calls'] += 1
+            stats['seconds'] += elapsed
+            stats['peak_bytes'] = max(stats['peak_bytes'], peak)
+        finally:
+            profiler._lock.release()
+        return self.inner.__exit__(*exc_info)
+
+
+class StageProfiler:
+    """아이템 단위 샘플링 단계별 프로파일러
+
+    start_item()이 아이템(또는 process_items 묶음)마다 프로파일 여부를 정하고, 샘플링된 동안만
+    stage()가 cProfile/tracemalloc을 켠다. 샘플링되지 않은 단계는 안쪽 컨텍스트를 그대로 반환하므로
+    추가 비용은 난수 하나와 속성 확인뿐이다. cProfile은 한 번에 하나만 켤 수 있어 여러 스레드가
+    동시에 샘플링된 단계에 들어가면 먼저 들어간 쪽만 측정한다.
+    """
+
+    def __init__(self, output_dir, sample_rate=DEFAULT_SAMPLE_RATE, trace_memory=True,
+                 top_allocators=DEFAULT_TOP_ALLOCATORS, seed=None):
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(f"샘플링 비율은 0~1이어야 합니다: {sample_rate}")
+        self.output_dir = output_dir
+        self.sample_rate = sample_rate
+        self.trace_memory = trace_memory
+        self.top_allocators = top_allocators
+        self.profiles = {}
+        self.allocations = {}
+        self.stage_stats = {}
+        self.items = 0
+        self.sampled_items = 0
+        self.pid = os.getpid()
+        self.trace_filters = (tracemalloc.Filter(False, tracemalloc.__file__),
+                              tracemalloc.Filter(False, __file__))
+        self._random = random.Random(seed)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, environ=None):
+        """CASATRADE_PROFILE이 있으면 이 프로세스의 공유 프로파일러 (종료 시 자동 저장), 없으면 None"""
+        global _env_profiler
+        environ = os.environ if environ is None else environ
+        output_dir = environ.get(PROFILE_ENV)
+        if not output_dir:
+            return None
+        if _env_profiler is None or _env_profiler.pid != os.getpid():
+            profiler = cls(output_dir, float(environ.get(PROFILE_RATE_ENV, DEFAULT_SAMPLE_RATE)))
+            # 메인 프로세스(atexit)와 multiprocessing 워커(os._exit 전 종료 처리) 모두에서 실행됨
+            multiprocessing.util.Finalize(profiler, profiler.write, exitpriority=0)
+            _env_profiler = profiler
+        return _env_profiler
+
+    def start_item(self):
+        """아이템 처리 시작: 이 아이템을 프로파일할지 샘플링"""
+        sampled = self._random.random() < self.sample_rate
+        self._local.sampled = sampled
+        self.items += 1
+        if sampled:
+            self.sampled_items += 1
+
+    def stage(self, name, inner):
+        """단계 컨텍스트 (샘플링되지 않았으면 inner 그대로)"""
+        if not getattr(self._local, 'sampled', False) or not self._lock.acquire(blocking=False):
+            return inner
+        return _ProfiledStage(self, name, inner)
+
+    def _add_allocations(self, name, snapshot):
+        """단계가 끝날 때 남아 있는 할당을 위치(파일:줄)별 (크기, 개수)로 누적"""
+        allocations = self.allocations.setdefault(name, {})
+        for stat in snapshot.statistics('lineno'):
+            frame = stat.traceback[0]
+            key = f"{frame.filename}:{frame.lineno}"
+            size, count = allocations.get(key, (0, 0))
+            allocations[key] = (size + stat.size, count + stat.count)
+
+    def write(self):
+        """단계별 pstats/collapsed stack, 상위 할당 위치, 요약 저장 (처리한 아이템이 없으면 저장 안 함)"""
+        if not self.items:
+            return None
+        os.makedirs(self.output_dir, exist_ok=True)
+        pid = os.getpid()
+        with self._lock:
+            for name, profile in self.profiles.items():
+                profile.dump_stats(os.path.join(self.output_dir, f"{name}.{pid}.pstats"))
+                stacks = collapsed_stacks(pstats.Stats(profile).stats)
+                with open(os.path.join(self.output_dir, f"{name}.{pid}.collapsed"), 'w', encoding='utf-8') as f:
+                    for stack, microseconds in sorted(stacks.items()):
+                        f.write(f"{stack} {microseconds}\n")
+
+            if self.allocations:
+                with open(os.path.join(self.output_dir, f"memory.{pid}.txt"), 'w', encoding='utf-8') as f:
+                    for name, allocations in sorted(self.allocations.items()):
+                        calls = self.stage_stats[name]['calls']
+                        f.write(f"[{name}] 샘플 {calls}회, 단계 종료 시점에 남은 할당 상위 {self.top_allocators}개\n")
+                        top = sorted(allocations.items(), key=lambda entry: entry[1][0], reverse=True)
+                        for location, (size, count) in top[:self.top_allocators]:
+                            f.write(f"{size / 1024:>12,.1f} KiB {count:>10,}개  {location}\n")
+                        f.write('\n')
+
+            summary = {
+                'pid': pid,
+                'sample_rate': self.sample_rate,
+                'items': self.items,
+                'sampled_items': self.sampled_items,
+                'stages': self.stage_stats
+            }
+            path = os.path.join(self.output_dir, f"summary.{pid}.json")
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2)
+        return path
+
+
+def _frame_label(func):
+    filename, lineno, name = func
+    if filename == '~':
+        return name
+    return f"{name} ({os.path.basename(filename)}:{lineno})"
+
+
+def collapsed_stacks(stats):
+    """pstats 호출 그래프를 flamegraph용 collapsed stack {'a;b;c': 자기 시간(µs)}으로 근사 변환
+
+    cProfile은 호출자-피호출자 간선만 기록하므로, 함수의 자기 시간을 각 호출 경로에
+    그 경로 간선의 누적 시간 비율만큼 나눠 준다 (재귀 간선은 생략).
+    """
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    stacks = {}
+
+    def walk(func, path, on_path, scale):
+        total_time, cumulative_time = stats[func][2], stats[func][3]
+        stack = f"{path};{_frame_label(func)}" if path else _frame_label(func)
+        self_time = total_time * scale
+        if self_time > 0:
+            stacks[stack] = stacks.get(stack, 0.0) + self_time
+        if len(on_path) >= MAX_STACK_DEPTH:
+            return
+        on_path.add(func)
+        for child, edge_time in callees.get(func, ()):
+            child_time = stats[child][3]
+            if child in on_path or child_time <= 0:
+                continue
+            share = scale * min(1.0, edge_time / child_time)
+            if share * child_time >= MIN_STACK_SECONDS:
+                walk(child, stack, on_path, share)
+        on_path.discard(func)
+
+    for func, (_, _, _, _, callers) in stats.items():
+        if not any(caller in stats for caller in callers):
+            walk(func, '', set(), 1.0)
+    return {stack: round(seconds * 1e6) for stack, seconds in stacks.items() if round(seconds * 1e6) > 0}
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+기회 랭킹 모듈
+카탈로그를 스트리밍으로 훑으며 가격 계산 결과로 점수를 매겨 전체/전략별 상위 K개만 힙에 유지하고,
+살아남은 아이템에 대해서만 전략 결과·페르소나 콘텐츠·CTA를 생성
+"""
+
+import heapq
+import logging
+import math
+import time
+
+from lazy_import import lazy_import
+from records import Item
+
+np = lazy_import('numpy')
+
+logger = logging.getLogger('casatrade.ranking')
+
+# margin:   수익률(%)
+# profit:   예상 이익(원) = 국내 시세 - 총 매입가
+# combined: 이익 × |수익률| (절대 이익이 크면서 수익률도 높은 아이템 우선, 손실이면 음수라 모든 이익보다 아래)
+SCORES = ('margin', 'profit', 'combined')
+DEFAULT_CHUNK_SIZE = 4096
+
+
+class TopK:
+    """크기 k의 최소 힙으로 점수 상위 k개 유지 (동점이면 먼저 들어온 항목 우선)"""
+    __slots__ = ('k', 'heap')
+
+    def __init__(self, k):
+        self.k = k
+        self.heap = []
+
+    def push(self, score, seq, value):
+        """항목 추가 (들어갔으면 True)"""
+        entry = (score, -seq, value)
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+            return True
+        if (score, -seq) > self.heap[0][:2]:
+            heapq.heapreplace(self.heap, entry)
+            return True
+        return False
+
+    def floor(self):
+        """들어가려면 넘어야 하는 점수 (아직 덜 찼으면 -inf)"""
+        return self.heap[0][0] if len(self.heap) >= self.k else -math.inf
+
+    def ranked(self):
+        """(점수, 순번, 값) 리스트를 점수 내림차순으로 반환"""
+        return [(score, -neg_seq, value) for score, neg_seq, value in sorted(self.heap, reverse=True)]
+
+    def __len__(self):
+        return len(self.heap)
+
+
+def score_columns(batch, domestic_price, score='margin'):
+    """calculate_total_cost_batch 결과로 점수 배열 계산 (국내 시세가 없으면 NaN)
+
+    combined는 부호를 이익에서만 가져온다 (손실 × 음수 수익률이 큰 양수 점수가 되지 않도록):
+
+    >>> import numpy as np
+    >>> batch = {'total_cost_krw': np.array([100000, 200000]), 'profit_margin': np.array([50.0, -95.0])}
+    >>> score_columns(batch, np.array([150000.0, 10000.0]), 'combined').tolist()
+    [25000.0, -180500.0]
+    """
+    if score not in SCORES:
+        raise ValueError(f"지원하지 않는 점수: {score} (가능: {', '.join(SCORES)})")
+    profit = domestic_price - batch['total_cost_krw']
+    if score == 'margin':
+        values = batch['profit_margin'].astype(np.float64)
+    elif score == 'profit':
+        values = profit.astype(np.float64)
+    else:
+        values = profit * np.abs(batch['profit_margin']) / 100
+    values[domestic_price <= 0] = np.nan
+    return values
+
+
+class OpportunityRanker:
+    """스트리밍 상위 K개 랭킹 (O(n log k) 시간, O(k) 메모리)
+
+    청크마다 가격 계산과 점수는 배열 연산으로 한 번에 구하고, 현재 힙의 하한을 넘는 아이템만
+    전략을 분류해 전체 힙과 해당 전략 힙에 넣는다. 콘텐츠 생성은 끝까지 살아남은 아이템만 한다.
+    """
+
+    def __init__(self, marketer, k=200, score='margin', strategy_k=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        if score not in SCORES:
+            raise ValueError(f"지원하지 않는 점수: {score} (가능: {', '.join(SCORES)})")
+        self.marketer = marketer
+        self.k = k
+        self.score = score
+        self.chunk_size = chunk_size
+        self.overall = TopK(k)
+        strategy_k = k if strategy_k is None else strategy_k
+        self.by_strategy = {
+            strategy_name: TopK(strategy_k) for strategy_name in marketer.strategy_analyzer.strategies
+        } if strategy_k > 0 else {}
+        self.stats = {'scanned': 0, 'unscored': 0, 'candidates': 0, 'survivors': 0}
+        self._seq = 0
+
+    def feed(self, items):
+        """아이템을 청크 단위로 읽어 힙 갱신"""
+        chunk = []
+        for item_data in items:
+            chunk.append(Item.coerce(item_data))
+            if len(chunk) >= self.chunk_size:
+                self._feed_chunk(chunk)
+                chunk = []
+        if chunk:
+            self._feed_chunk(chunk)
+        return self
+
+    def _floor(self):
+        """전체 힙과 모든 전략 힙 중 가장 낮은 하한 (이보다 낮으면 어느 힙에도 못 들어감)"""
+        floor = self.overall.floor()
+        for heap in self.by_strategy.values():
+            floor = min(floor, heap.floor())
+        return floor
+
+    def _feed_chunk(self, items):
+        marketer = self.marketer
+        marketer._start_item()
+        items = marketer.fill_domestic_prices(items)
+        count = len(items)
+        domestic_price = np.fromiter((item.domestic_price_krw or 0 for item in items), dtype=np.float64, count=count)
+        with marketer._stage('pricing_batch'):
+            batch = marketer.calculator.calculate_total_cost_batch(items)
+        scores = score_columns(batch, domestic_price, self.score)
+
+        start = self._seq
+        self._seq += count
+        self.stats['scanned'] += count
+        scored = ~np.isnan(scores)
+        self.stats['unscored'] += count - int(scored.sum())
+
+        candidates = np.flatnonzero(scored & (scores > self._floor()))
+        self.stats['candidates'] += len(candidates)
+        if not len(candidates):
+            return
+
+        if self.by_strategy:
+            with marketer._stage('strategy_batch'):
+                strategy_names = marketer.strategy_analyzer.classify_batch(
+                    [items[index] for index in candidates], batch['total_cost_krw'][candidates])
+        else:
+            strategy_names = [None] * len(candidates)
+
+        overall = self.overall
+        by_strategy = self.by_strategy
+        for index, strategy_name, score in zip(candidates.tolist(), strategy_names, scores[candidates].tolist()):
+            seq = start + index
+            item = items[index]
+            overall.push(score, seq, item)
+            if strategy_name is not None:
+                by_strategy[strategy_name].push(score, seq, item)
+
+    def results(self, **process_options):
+        """살아남은 아이템의 최종 결과를 전체 순위 → 전략별 순위 순으로 반환 (인자는 process_items로 전달)
+
+        각 결과에는 ranking 항목(score, overall_rank, strategy_rank)이 붙는다.
+        전략 힙에만 남은 아이템은 overall_rank가 None이다.
+        """
+        rankings = {}
+        order = []
+        for rank, (score, seq, item) in enumerate(self.overall.ranked(), 1):
+            rankings[seq] = {'score': round(score, 2), 'overall_rank': rank, 'strategy_rank': None}
+            order.append((seq, item))
+        for heap in self.by_strategy.values():
+            for rank, (score, seq, item) in enumerate(heap.ranked(), 1):
+                if seq not in rankings:
+                    rankings[seq] = {'score': round(score, 2), 'overall_rank': None, 'strategy_rank': None}
+                    order.append((seq, item))
+                rankings[seq]['strategy_rank'] = rank
+
+        self.stats['survivors'] = len(order)
+        if not order:
+            return []
+
+        results = self.marketer.process_items([item for _, item in order], **process_options)
+        for (seq, _), result in zip(order, results):
+            result['ranking'] = {'score_type': self.score, **rankings[seq]}
+        return results
+
+
+def run_ranking_batch(marketer, input_path, output_path, k=200, score='margin', strategy_k=None, dedup=None,
+                      process_options=None):
+    """카탈로그 파일에서 상위 K개를 골라 결과를 기록하고 (처리 통계, 랭킹 통계) 반환"""
+    from batch_processor import iter_items, write_results
+
+    start = time.perf_counter()
+    ranker = OpportunityRanker(marketer, k, score, strategy_k).feed(iter_items(input_path))
+    scan_elapsed = time.perf_counter() - start
+    stats = write_results(ranker.results(**(process_options or {})), output_path, dedup)
+    ranker.stats['scan_sec'] = scan_elapsed
+    return stats, ranker.stats
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+환율 API 스텁 서버
+테스트와 로컬 개발용으로 고정 환율을 응답하는 HTTP 서버
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class RateStubServer:
+    def __init__(self, rates=None, host='127.0.0.1', port=0, delay=0.0):
+        self.rates = dict(rates or {'JPY': 9.0})
+        self.delay = delay
+        self.fail = False
+        self.request_count = 0
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/rates"
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.request_count += 1
+                if stub.delay:
+                    time.sleep(stub.delay)
+
+                if stub.fail:
+                    self.send_error(503, "stub failure")
+                    return
+
+                body = json.dumps({'rates': stub.rates}).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        """백그라운드 스레드에서 서버 시작"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """서버 종료"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    """스텁 서버 단독 실행"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="환율 API 스텁 서버")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--jpy', type=float, default=9.0)
+    args = parser.parse_args()
+
+    server = RateStubServer({'JPY': args.jpy}, port=args.port)
+    print(f"💱 환율 스텁 서버: {server.url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
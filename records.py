@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+레코드 타입 모듈
+아이템, 가격 계산 결과, 전략 결과를 __slots__ 기반 레코드로 표현
+(읽기 전용 Mapping이기도 해서 기존 dict 방식 접근 record['total_cost_krw']도 그대로 동작)
+"""
+
+from collections.abc import Mapping
+
+# 경매가는 (금액, 통화, 단위)로 읽는다: 통화 금액 = auction_price × price_unit
+# 예전 입력의 auction_price_jpy는 100엔 단위 엔화 경매가
+DEFAULT_CURRENCY = 'JPY'
+LEGACY_JPY_UNIT = 100
+
+
+def auction_price_fields(data):
+    """아이템 dict에서 (경매가, 통화, 단위) 읽기 (auction_price가 없으면 auction_price_jpy)"""
+    get = data.get
+    price = get('auction_price')
+    if price is None:
+        return data['auction_price_jpy'], DEFAULT_CURRENCY, LEGACY_JPY_UNIT
+    return price, (get('currency') or DEFAULT_CURRENCY).upper(), get('price_unit') or 1
+
+
+def legacy_jpy_price(price, currency, price_unit):
+    """엔화 경매가를 예전 auction_price_jpy(100엔 단위) 값으로 (엔화가 아니면 None)"""
+    if currency != DEFAULT_CURRENCY:
+        return None
+    if price_unit == LEGACY_JPY_UNIT:
+        return price
+    return price * price_unit / LEGACY_JPY_UNIT
+
+
+class Record(Mapping):
+    """__slots__ 레코드 공통 부분: 필드 이름으로 dict처럼 읽기, to_dict/from_dict 변환"""
+    __slots__ = ()
+    _fields = ()
+
+    def __getitem__(self, key):
+        if key in self._fields:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __repr__(self):
+        values = ', '.join(f"{field}={getattr(self, field)!r}" for field in self._fields)
+        return f"{type(self).__name__}({values})"
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self._fields}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(*(data[field] for field in cls._fields))
+
+    @classmethod
+    def coerce(cls, value):
+        """레코드는 그대로, dict는 레코드로 변환"""
+        return value if isinstance(value, cls) else cls.from_dict(value)
+
+
+class Item(Record):
+    """입력 아이템
+
+    자주 쓰는 필드는 기본값을 채운 슬롯으로 읽고, dict 방식 접근·순회·to_dict는 원본 dict(source)를 그대로 따른다.
+    """
+    __slots__ = ('name', 'brand', 'auction_price', 'currency', 'price_unit', 'rank', 'month', 'category', 'notes',
+                 'domestic_price_krw', 'lot_id', 'source')
+
+    def __init__(self, name, brand, auction_price, currency, price_unit, rank, month, category, notes,
+                 domestic_price_krw, lot_id=None, source=None):
+        self.name = name
+        self.brand = brand
+        self.auction_price = auction_price
+        self.currency = currency
+        self.price_unit = price_unit
+        self.rank = rank
+        self.month = month
+        self.category = category
+        self.notes = notes
+        self.domestic_price_krw = domestic_price_krw
+        self.lot_id = lot_id
+        self.source = source if source is not None else {}
+
+    def __getitem__(self, key):
+        return self.source[key]
+
+    def __iter__(self):
+        return iter(self.source)
+
+    def __len__(self):
+        return len(self.source)
+
+    def __repr__(self):
+        return f"Item({self.source!r})"
+
+    def to_dict(self):
+        return dict(self.source)
+
+    @classmethod
+    def from_dict(cls, data):
+        # 아이템마다 불리는 경로라 auction_price_fields를 펼쳐 씀
+        get = data.get
+        price = get('auction_price')
+        if price is None:
+            price, currency, price_unit = data['auction_price_jpy'], DEFAULT_CURRENCY, LEGACY_JPY_UNIT
+        else:
+            currency, price_unit = (get('currency') or DEFAULT_CURRENCY).upper(), get('price_unit') or 1
+        return cls(
+            get('name', ''),
+            get('brand', ''),
+            price,
+            currency,
+            price_unit,
+            get('rank', ''),
+            get('month', 0),
+            get('category', ''),
+            get('notes', ''),
+            get('domestic_price_krw') or 0,  # null 시세도 '시세 없음'
+            get('lot_id'),
+            data
+        )
+
+
+class PriceBreakdown(Record):
+    """PriceCalculator.calculate_total_cost 결과 (auction_price는 통화 금액, exchange_rate는 통화 1단위당 원화)
+
+    엔화 아이템은 예전 키 auction_price_jpy(100엔 단위)를 맨 앞에 함께 담는다 (다른 통화는 키 없음).
+    """
+    _fields = ('auction_price', 'currency', 'auction_price_krw', 'customs_fee', 'service_fee',
+               'total_cost_krw', 'exchange_rate', 'profit_margin')
+    __slots__ = _fields + ('auction_price_jpy',)
+
+    def __init__(self, auction_price, currency, auction_price_krw, customs_fee, service_fee,
+                 total_cost_krw, exchange_rate, profit_margin, auction_price_jpy=None):
+        self.auction_price_jpy = auction_price_jpy
+        self.auction_price = auction_price
+        self.currency = currency
+        self.auction_price_krw = auction_price_krw
+        self.customs_fee = customs_fee
+        self.service_fee = service_fee
+        self.total_cost_krw = total_cost_krw
+        self.exchange_rate = exchange_rate
+        self.profit_margin = profit_margin
+
+    def _keys(self):
+        return self._fields if self.auction_price_jpy is None else ('auction_price_jpy',) + self._fields
+
+    def __getitem__(self, key):
+        if key == 'auction_price_jpy' and self.auction_price_jpy is not None:
+            return self.auction_price_jpy
+        return super().__getitem__(key)
+
+    def __iter__(self):
+        return iter(self._keys())
+
+    def __len__(self):
+        return len(self._keys())
+
+    def to_dict(self):
+        if self.auction_price_jpy is None:
+            return {
+                'auction_price': self.auction_price,
+                'currency': self.currency,
+                'auction_price_krw': self.auction_price_krw,
+                'customs_fee': self.customs_fee,
+                'service_fee': self.service_fee,
+                'total_cost_krw': self.total_cost_krw,
+                'exchange_rate': self.exchange_rate,
+                'profit_margin': self.profit_margin
+            }
+        return {
+            'auction_price_jpy': self.auction_price_jpy,
+            'auction_price': self.auction_price,
+            'currency': self.currency,
+            'auction_price_krw': self.auction_price_krw,
+            'customs_fee': self.customs_fee,
+            'service_fee': self.service_fee,
+            'total_cost_krw': self.total_cost_krw,
+            'exchange_rate': self.exchange_rate,
+            'profit_margin': self.profit_margin
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(*(data[field] for field in cls._fields), data.get('auction_price_jpy'))
+
+
+class StrategyDecision(Record):
+    """StrategyAnalyzer.analyze_strategy 결과"""
+    __slots__ = _fields = ('strategy_name', 'angle', 'recommended_personas', 'reasoning', 'key_points')
+
+    def __init__(self, strategy_name, angle, recommended_personas, reasoning, key_points):
+        self.strategy_name = strategy_name
+        self.angle = angle
+        self.recommended_personas = recommended_personas
+        self.reasoning = reasoning
+        self.key_points = key_points
+
+    def to_dict(self):
+        return {
+            'strategy_name': self.strategy_name,
+            'angle': self.angle,
+            'recommended_personas': self.recommended_personas,
+            'reasoning': self.reasoning,
+            'key_points': self.key_points
+        }
+
+
+def json_default(value):
+    """json.dumps(default=json_default): 레코드 등 Mapping 값을 dict로 변환"""
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
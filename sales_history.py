@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+판매 이력 모듈
+과거 판매 기록(브랜드, 카테고리, 판매 월, 판매가, 판매 기간)을 고정 길이 레코드 파일에 덧붙여 쓰고 mmap으로 읽으며,
+카테고리 × 월 집계(판매 수, 판매가 합, 판매 기간 합)를 덧붙인 행만으로 갱신해 수요 곡선을 만듦
+    - sales.bin:       24바이트 구조 레코드를 이어 쓴 append-only 파일 (헤더 없음, 행 수 = 파일 크기 / 레코드 크기)
+    - labels.json:     브랜드/카테고리 코드 → 이름 (새 이름은 뒤에만 추가)
+    - aggregates.npz:  카테고리 × 12개월 집계와 반영된 행 수 (중간에 끊겨도 다음에 열 때 나머지 행만 반영)
+"""
+
+import csv
+import json
+import logging
+import os
+
+from lazy_import import lazy_import
+
+np = lazy_import('numpy')
+
+logger = logging.getLogger('casatrade.sales_history')
+
+DEFAULT_HISTORY_PATH = 'casatrade_sales_history'
+SALES_FILE = 'sales.bin'
+LABELS_FILE = 'labels.json'
+AGGREGATES_FILE = 'aggregates.npz'
+
+# 카테고리 수요 곡선을 쓰기 위한 최소 판매 수 (적으면 전략 설정의 기본 월 목록 사용)
+DEFAULT_MIN_SALES = 120
+
+LABEL_FIELDS = ('brand', 'category')
+
+
+def _sale_dtype():
+    """판매 레코드 구조 (브랜드/카테고리는 labels.json 코드, 8바이트 필드가 경계에 오도록 배치)"""
+    return np.dtype([('brand', '<i4'), ('category', '<i4'), ('month', '<i4'),
+                     ('days_to_sell', '<f4'), ('price_krw', '<i8')])
+
+
+class SalesHistory:
+    """append-only 판매 기록 저장소 + 카테고리 × 월 증분 집계
+
+    한 프로세스만 쓴다고 가정한다. append는 라벨 → 레코드 → 집계 순으로 기록하며,
+    집계 파일에 반영된 행 수보다 레코드가 많으면(집계 저장 전에 끊김) 열 때 나머지 행만 다시 반영한다.
+    """
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.dtype = _sale_dtype()
+        self.sales_path = os.path.join(path, SALES_FILE)
+
+        labels_path = os.path.join(path, LABELS_FILE)
+        if os.path.exists(labels_path):
+            with open(labels_path, encoding='utf-8') as f:
+                self.labels = json.load(f)
+        else:
+            self.labels = {field: [] for field in LABEL_FIELDS}
+        self.codes = {field: {label: code for code, label in enumerate(self.labels[field])}
+                      for field in LABEL_FIELDS}
+        self._labels_changed = False
+
+        size = os.path.getsize(self.sales_path) if os.path.exists(self.sales_path) else 0
+        self.rows, partial = divmod(size, self.dtype.itemsize)
+        if partial:
+            # 레코드 중간에 끊긴 꼬리는 버림
+            logger.warning("⚠️ 판매 이력 끝의 불완전한 레코드 %s바이트 제거: %s", partial, self.sales_path)
+            os.truncate(self.sales_path, self.rows * self.dtype.itemsize)
+
+        self.counts = np.zeros((0, 12), dtype=np.int64)
+        self.price_sums = np.zeros((0, 12), dtype=np.float64)
+        self.days_sums = np.zeros((0, 12), dtype=np.float64)
+        self.aggregated_rows = 0
+        aggregates_path = os.path.join(path, AGGREGATES_FILE)
+        if os.path.exists(aggregates_path):
+            with np.load(aggregates_path, allow_pickle=False) as data:
+                self.counts = data['counts']
+                self.price_sums = data['price_sums']
+                self.days_sums = data['days_sums']
+                self.aggregated_rows = int(data['rows'])
+        if self.aggregated_rows > self.rows:
+            raise ValueError(f"판매 이력 집계({self.aggregated_rows}행)가 레코드({self.rows}행)보다 많습니다: {path}")
+        if self.aggregated_rows < self.rows:
+            self._fold(self.records()[self.aggregated_rows:])
+            self._save_aggregates()
+
+    def __len__(self):
+        return self.rows
+
+    def records(self):
+        """전체 레코드를 읽기 전용 mmap 구조 배열로 반환"""
+        if not self.rows:
+            return np.zeros(0, dtype=self.dtype)
+        return np.memmap(self.sales_path, dtype=self.dtype, mode='r', shape=(self.rows,))
+
+    def append(self, sales):
+        """판매 기록 dict들(brand, category, month, price_krw, days_to_sell)을 덧붙이고 추가된 행 수 반환
+
+        집계는 새 행만 더하므로 기존 이력 크기와 무관하게 O(새 행 수)다.
+        """
+        rows = [self._encode(sale) for sale in sales]
+        if not rows:
+            return 0
+        records = np.array(rows, dtype=self.dtype)
+
+        if self._labels_changed:
+            self._save_labels()
+            self._labels_changed = False
+        with open(self.sales_path, 'ab') as f:
+            f.write(records.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        self.rows += len(records)
+        self._fold(records)
+        self._save_aggregates()
+        return len(records)
+
+    def _encode(self, sale):
+        month = int(sale['month'])
+        if not 1 <= month <= 12:
+            raise ValueError(f"판매 월은 1~12여야 합니다: {month}")
+        return (self._code('brand', sale.get('brand') or ''), self._code('category', sale.get('category') or ''),
+                month, float(sale.get('days_to_sell') or 0), int(sale['price_krw']))
+
+    def _code(self, field, label):
+        codes = self.codes[field]
+        code = codes.get(label)
+        if code is None:
+            code = codes[label] = len(self.labels[field])
+            self.labels[field].append(label)
+            self._labels_changed = True
+        return code
+
+    def _fold(self, records):
+        """레코드를 카테고리 × 월 집계에 더함"""
+        categories = len(self.labels['category'])
+        if len(self.counts) < categories:
+            grow = ((0, categories - len(self.counts)), (0, 0))
+            self.counts = np.pad(self.counts, grow)
+            self.price_sums = np.pad(self.price_sums, grow)
+            self.days_sums = np.pad(self.days_sums, grow)
+        cells = (records['category'], records['month'] - 1)
+        np.add.at(self.counts, cells, 1)
+        np.add.at(self.price_sums, cells, records['price_krw'])
+        np.add.at(self.days_sums, cells, records['days_to_sell'])
+        self.aggregated_rows += len(records)
+
+    def _save_labels(self):
+        self._replace(LABELS_FILE, lambda f: f.write(json.dumps(self.labels, ensure_ascii=False).encode('utf-8')))
+
+    def _save_aggregates(self):
+        self._replace(AGGREGATES_FILE, lambda f: np.savez(
+            f, counts=self.counts, price_sums=self.price_sums, days_sums=self.days_sums,
+            rows=np.int64(self.aggregated_rows)))
+
+    def _replace(self, name, write):
+        path = os.path.join(self.path, name)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+
+    def demand_curves(self, min_sales=DEFAULT_MIN_SALES):
+        """판매가 min_sales건 이상인 카테고리의 월별 곡선 {카테고리: {...}} (1월부터 12개)
+
+        demand:      월 판매 수 / 월평균 판매 수 (1보다 크면 평균보다 잘 팔리는 달)
+        price_index: 월 평균 판매가 / 연평균 판매가 (판매가 없는 달은 1)
+        avg_days:    월 평균 판매 기간(일) (판매가 없는 달은 연평균)
+        """
+        curves = {}
+        for code, category in enumerate(self.labels['category']):
+            if code >= len(self.counts):
+                break
+            counts = self.counts[code]
+            total = int(counts.sum())
+            if total < min_sales:
+                continue
+            sold = counts > 0
+            average_price = self.price_sums[code].sum() / total
+            average_days = self.days_sums[code].sum() / total
+            month_prices = np.where(sold, self.price_sums[code] / np.maximum(counts, 1), average_price)
+            month_days = np.where(sold, self.days_sums[code] / np.maximum(counts, 1), average_days)
+            curves[category] = {
+                'sales': total,
+                'demand': np.round(counts * 12 / total, 4).tolist(),
+                'price_index': np.round(month_prices / average_price, 4).tolist() if average_price else [1.0] * 12,
+                'avg_days': np.round(month_days, 1).tolist()
+            }
+        return curves
+
+
+def iter_sales_csv(path):
+    """판매 기록 CSV(brand, category, month, price_krw, days_to_sell) 행을 dict로"""
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        reader = csv.DictReader(f)
+        missing = [field for field in ('category', 'month', 'price_krw') if field not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"판매 기록 CSV에 필요한 열이 없습니다: {', '.join(missing)} ({path})")
+        for row in reader:
+            if not row.get('price_krw') or not row.get('month'):
+                continue
+            yield {
+                'brand': row.get('brand') or '',
+                'category': row['category'],
+                'month': int(float(row['month'])),
+                'price_krw': int(float(row['price_krw'])),
+                'days_to_sell': float(row.get('days_to_sell') or 0)
+            }
+
+
+def append_sales_csv(history, csv_path, chunk_size=100000):
+    """CSV 판매 기록을 청크 단위로 덧붙이고 추가된 행 수 반환"""
+    added = 0
+    chunk = []
+    for sale in iter_sales_csv(csv_path):
+        chunk.append(sale)
+        if len(chunk) >= chunk_size:
+            added += history.append(chunk)
+            chunk = []
+    if chunk:
+        added += history.append(chunk)
+    logger.info("📚 판매 이력 %s건 추가 (전체 %s건, 카테고리 %s개) → %s",
+                f"{added:,}", f"{len(history):,}", f"{len(history.labels['category']):,}", history.path)
+    return added
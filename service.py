@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTP 서비스 모듈
+POST /items, POST /items:batch 요청을 마이크로 배치로 묶어 CasaTradeAIMarketer로 처리
+"""
+
+import asyncio
+import json
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from async_http import HTTPError, build_response, read_request, wants_keep_alive
+
+logger = logging.getLogger('casatrade.service')
+
+
+def process_batch_safely(marketer, items):
+    """배치 처리 후 (성공 여부, 결과 또는 오류 메시지) 리스트 반환
+
+    배치 전체가 실패하면 아이템별로 다시 처리해 잘못된 아이템만 오류로 돌려준다.
+    """
+    try:
+        return [(True, result) for result in marketer.process_items(items)]
+    except Exception:
+        outcomes = []
+        for item in items:
+            try:
+                outcomes.append((True, marketer.process_item(item)))
+            except Exception as e:
+                outcomes.append((False, f"{type(e).__name__}: {e}"))
+        return outcomes
+
+
+def _process_batch_in_worker(items):
+    """프로세스 풀 워커에서 배치 처리"""
+    from parallel_processor import get_worker_marketer
+    return process_batch_safely(get_worker_marketer(), items)
+
+
+class MarketerService:
+    def __init__(self, marketer_factory, host='127.0.0.1', port=8080, max_batch_size=64,
+                 batch_wait_ms=5.0, max_queue=1024, executor='thread', workers=1, marketer_options=None):
+        self.host = host
+        self.port = port
+        self.max_batch_size = max_batch_size
+        self.batch_wait = batch_wait_ms / 1000.0
+        self.max_queue = max_queue
+        self.workers = workers
+        self.stats = {'requests': 0, 'items': 0, 'batches': 0, 'rejected': 0}
+
+        if executor == 'process':
+            from parallel_processor import _init_worker
+            self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                                 initargs=(marketer_options or {},))
+            self._run_batch = _process_batch_in_worker
+        elif executor == 'thread':
+            # 마케터는 스레드 안전하지 않으므로 전용 스레드 하나에서만 사용
+            marketer = marketer_factory()
+            self._executor = ThreadPoolExecutor(max_workers=1)
+            self._run_batch = lambda items: process_batch_safely(marketer, items)
+            self.workers = 1
+        else:
+            raise ValueError(f"지원하지 않는 executor: {executor}")
+
+        self._queue = None
+        self._server = None
+        self._batcher = None
+        self._in_flight = None
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._in_flight = asyncio.Semaphore(self.workers)
+        self._batcher = asyncio.create_task(self._batch_loop())
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+        self._batcher.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def serve_forever(self):
+        await self.start()
+        logger.info("🌐 서비스 시작: http://%s:%s", self.host, self.port)
+        async with self._server:
+            await self._server.serve_forever()
+
+    # 마이크로 배치 -------------------------------------------------------
+
+    async def _batch_loop(self):
+        """대기열에서 요청을 모아 배치 단위로 executor에 전달"""
+        loop = asyncio.get_running_loop()
+        while True:
+            entries = [await self._queue.get()]
+            deadline = loop.time() + self.batch_wait
+            while len(entries) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entries.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._in_flight.acquire()
+            asyncio.create_task(self._dispatch(entries))
+
+    async def _dispatch(self, entries):
+        loop = asyncio.get_running_loop()
+        try:
+            items = [item for item, _ in entries]
+            outcomes = await loop.run_in_executor(self._executor, self._run_batch, items)
+            self.stats['batches'] += 1
+            for (_, future), outcome in zip(entries, outcomes):
+                if not future.done():
+                    future.set_result(outcome)
+        except Exception as e:
+            for _, future in entries:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._in_flight.release()
+
+    def _enqueue(self, items):
+        """아이템을 대기열에 넣고 결과 future 리스트 반환
+
+        배치 전체를 먼저 검사하므로 오류 응답이면 아무것도 대기열에 들어가지 않는다.
+        대기열보다 큰 배치는 413, 대기열이 잠시 가득 찼으면 503 (Retry-After).
+        """
+        if not all(isinstance(item, dict) for item in items):
+            raise HTTPError(400, "아이템은 JSON 객체여야 합니다.")
+        if len(items) > self.max_queue:
+            self.stats['rejected'] += 1
+            raise HTTPError(413, f"배치가 너무 큽니다 (최대 {self.max_queue}개).")
+        if self._queue.qsize() + len(items) > self.max_queue:
+            self.stats['rejected'] += 1
+            raise HTTPError(503, "대기열이 가득 찼습니다.", {'Retry-After': '1'})
+
+        loop = asyncio.get_running_loop()
+        futures = []
+        for item in items:
+            future = loop.create_future()
+            self._queue.put_nowait((item, future))
+            futures.append(future)
+        self.stats['items'] += len(items)
+        return futures
+
+    # HTTP ---------------------------------------------------------------
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    keep_alive = wants_keep_alive(headers)
+                    status, payload = await self._route(method, path, body)
+                    response = build_response(status, payload, keep_alive)
+                except HTTPError as e:
+                    response = build_response(e.status, {'error': e.message}, keep_alive, e.headers)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except Exception as e:
+                    # 배치 처리 실패(future 예외), 잘못된 Content-Length 등: 연결을 끊지 않고 500 응답
+                    logger.exception("❌ 요청 처리 오류")
+                    response = build_response(500, {'error': f"{type(e).__name__}: {e}"}, keep_alive)
+
+                writer.write(response)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, body):
+        self.stats['requests'] += 1
+        if path == '/health':
+            return 200, {'status': 'ok', 'queued': self._queue.qsize(), **self.stats}
+        if path not in ('/items', '/items:batch'):
+            raise HTTPError(404, f"{path} 없음")
+        if method != 'POST':
+            raise HTTPError(405, "POST만 지원합니다.")
+
+        try:
+            payload = json.loads(body or b'null')
+        except ValueError:
+            raise HTTPError(400, "JSON 파싱 오류")
+
+        if path == '/items':
+            (future,) = self._enqueue([payload])
+            ok, result = await future
+            if not ok:
+                raise HTTPError(400, result)
+            return 200, result
+
+        items = payload.get('items') if isinstance(payload, dict) else payload
+        if not isinstance(items, list):
+            raise HTTPError(400, "items 배열이 필요합니다.")
+        started = time.perf_counter()
+        outcomes = await asyncio.gather(*self._enqueue(items))
+        return 200, {
+            'results': [result if ok else {'error': result} for ok, result in outcomes],
+            'elapsed_sec': time.perf_counter() - started
+        }
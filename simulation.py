@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+마진 시뮬레이션 모듈
+환율/관세율/국내 시세 변동 시나리오(그리드 또는 몬테카를로)에서 카탈로그 전체의 수익률을
+벡터 연산으로 평가하고 아이템별 수익률 분위수와 손실 확률을 계산
+"""
+
+import json
+import logging
+
+from calculator import PriceCalculator
+from lazy_import import lazy_import
+
+np = lazy_import('numpy')
+
+logger = logging.getLogger('casatrade.simulation')
+
+DEFAULT_PERCENTILES = (5, 50, 95)
+# 청크당 (아이템 × 시나리오) 셀 수 (float64 배열 하나가 약 16MB)
+DEFAULT_MAX_CELLS = 2_000_000
+
+
+class MarginSimulator:
+    """시나리오별 수익률 시뮬레이터
+
+    시나리오는 calculate_total_cost_batch 입력과 같은 컬럼 형태의 dict로 표현한다.
+        exchange_rate:  엔화 환율 (다른 통화도 현재 환율 대비 같은 비율로 변동: 원화 쪽 변동)
+        customs_rate:   관세율
+        domestic_drift: 국내 시세 배율 (시장 전체 변동, 1.0 = 현재 시세)
+    """
+
+    def __init__(self, calculator=None, percentiles=DEFAULT_PERCENTILES, max_cells=DEFAULT_MAX_CELLS):
+        self.calculator = calculator or PriceCalculator()
+        self.percentiles = tuple(percentiles)
+        self.max_cells = max_cells
+
+    # 시나리오 생성 ---------------------------------------------------------
+
+    def grid(self, exchange_rates=None, customs_rates=None, domestic_drifts=None):
+        """값 목록의 모든 조합으로 시나리오 생성 (생략한 축은 현재 값 고정)"""
+        axes = [
+            [self.calculator.exchange_rate] if exchange_rates is None else exchange_rates,
+            [self.calculator.customs_rate] if customs_rates is None else customs_rates,
+            [1.0] if domestic_drifts is None else domestic_drifts
+        ]
+        rate, customs, drift = np.meshgrid(*(np.asarray(axis, dtype=np.float64) for axis in axes), indexing='ij')
+        return {
+            'exchange_rate': rate.ravel(),
+            'customs_rate': customs.ravel(),
+            'domestic_drift': drift.ravel()
+        }
+
+    def monte_carlo(self, count, rate_volatility=0.05, drift_volatility=0.1, customs_rates=None, seed=0):
+        """로그정규 환율/국내 시세 변동과 관세율 후보로 시나리오 샘플링"""
+        rng = np.random.default_rng(seed)
+        rate = self.calculator.exchange_rate * np.exp(rng.normal(0.0, rate_volatility, count))
+        drift = np.exp(rng.normal(0.0, drift_volatility, count))
+        if customs_rates is not None:
+            customs = rng.choice(np.asarray(customs_rates, dtype=np.float64), size=count)
+        else:
+            customs = np.full(count, self.calculator.customs_rate)
+        return {'exchange_rate': rate, 'customs_rate': customs, 'domestic_drift': drift}
+
+    # 평가 -----------------------------------------------------------------
+
+    def simulate(self, items, scenarios, item_volatility=0.0, seed=0):
+        """모든 아이템 × 시나리오의 수익률 평가
+
+        item_volatility > 0이면 아이템마다 독립적인 국내 시세 변동(로그정규)을 추가하고,
+        이때는 전체 행렬을 메모리에 올리지 않도록 max_cells 단위 청크로 나눠 계산한다.
+        국내 시세가 없는 아이템은 수익률을 정의할 수 없으므로 결과가 NaN이다.
+
+        반환값 (배열은 아이템 순서):
+            margin_p{p}:       수익률(%) 분위수
+            expected_margin:   평균 수익률(%)
+            loss_probability:  수익률 < 0 인 시나리오 비율
+            portfolio_profit:  시나리오별 전체 카탈로그 이익 합계 (원)
+        """
+        calculator = self.calculator
+        calculator.refresh_rates()
+        auction_price, currency_codes, domestic_price = calculator._to_price_columns(items)
+        # 현재 환율 기준 원화 경매가 (통화별 환율은 교차 환율 행렬에서 행별 코드로 인덱싱)
+        auction_price_krw = calculator.cross_rates.convert(auction_price, currency_codes)
+        count = len(auction_price_krw)
+        rate = np.asarray(scenarios['exchange_rate'], dtype=np.float64)
+        customs = np.asarray(scenarios['customs_rate'], dtype=np.float64)
+        drift = np.asarray(scenarios['domestic_drift'], dtype=np.float64)
+        # 총 매입가 = 원화 경매가 × (시나리오 환율 / 현재 환율) × (1 + 관세율 + 수수료율)
+        cost_factor = rate / calculator.exchange_rate * (1 + customs + calculator.service_fee_rate)
+        scenario_count = len(cost_factor)
+
+        results = {f"margin_p{p:g}": np.full(count, np.nan) for p in self.percentiles}
+        results['expected_margin'] = np.full(count, np.nan)
+        results['loss_probability'] = np.full(count, np.nan)
+        portfolio_profit = np.zeros(scenario_count)
+
+        has_price = (domestic_price > 0) & (auction_price_krw > 0)
+        if item_volatility:
+            self._simulate_chunked(auction_price_krw, domestic_price, has_price, cost_factor, drift,
+                                   item_volatility, seed, results, portfolio_profit)
+        else:
+            self._simulate_separable(auction_price_krw, domestic_price, has_price, cost_factor, drift,
+                                     results, portfolio_profit)
+
+        results['portfolio_profit'] = portfolio_profit
+        return results
+
+    def _simulate_separable(self, auction_price_krw, domestic_price, has_price, cost_factor, drift,
+                            results, portfolio_profit):
+        """시나리오 변동이 시장 전체에만 있을 때의 정확한 계산 (행렬 없이 O(N + S log S))
+
+        수익률 = (국내시세/원화 경매가) × (시세 배율/매입 계수) - 1 로 아이템 항과 시나리오 항의 곱이므로
+        분위수·평균은 시나리오 항의 분위수·평균에서, 손실 확률은 정렬된 시나리오 항의 이진 탐색으로 구한다.
+        """
+        index = np.flatnonzero(has_price)
+        ratio = domestic_price[index] / auction_price_krw[index]
+        scenario_term = np.sort(drift / cost_factor)
+
+        for p, quantile in zip(self.percentiles, np.percentile(scenario_term, self.percentiles)):
+            results[f"margin_p{p:g}"][index] = (ratio * quantile - 1) * 100
+        results['expected_margin'][index] = (ratio * scenario_term.mean() - 1) * 100
+        # 수익률 < 0 ⇔ 시나리오 항 < 1/ratio
+        losses = np.searchsorted(scenario_term, 1 / ratio, side='left')
+        results['loss_probability'][index] = losses / len(scenario_term)
+
+        portfolio_profit += drift * domestic_price[index].sum() - cost_factor * auction_price_krw[index].sum()
+
+    def _simulate_chunked(self, auction_price_krw, domestic_price, has_price, cost_factor, drift,
+                          item_volatility, seed, results, portfolio_profit):
+        """아이템별 독립 변동이 있을 때 (아이템 × 시나리오) 행렬을 max_cells 크기 청크로 나눠 평가"""
+        rng = np.random.default_rng(seed)
+        count = len(auction_price_krw)
+        rows = max(1, self.max_cells // max(len(cost_factor), 1))
+
+        for start in range(0, count, rows):
+            stop = min(start + rows, count)
+            mask = has_price[start:stop]
+            if not mask.any():
+                continue
+            index = np.flatnonzero(mask) + start
+
+            total_cost = np.multiply.outer(auction_price_krw[index], cost_factor)
+            domestic = np.multiply.outer(domestic_price[index], drift)
+            noise = rng.standard_normal(domestic.shape)
+            noise *= item_volatility
+            domestic *= np.exp(noise, out=noise)
+            del noise
+
+            profit = np.subtract(domestic, total_cost, out=domestic)
+            portfolio_profit += profit.sum(axis=0)
+            margin = np.divide(profit, total_cost, out=profit)
+            margin *= 100
+            del total_cost
+
+            for p, values in zip(self.percentiles, np.percentile(margin, self.percentiles, axis=1)):
+                results[f"margin_p{p:g}"][index] = values
+            results['expected_margin'][index] = margin.mean(axis=1)
+            results['loss_probability'][index] = (margin < 0).mean(axis=1)
+
+    def to_records(self, items, results):
+        """simulate 결과를 아이템별 dict 리스트로 변환 (NaN은 None)"""
+        keys = [key for key in results if key != 'portfolio_profit']
+        columns = [np.round(results[key], 4).tolist() for key in keys]
+        records = []
+        for item_data, values in zip(items, zip(*columns)):
+            record = {'lot_id': item_data.get('lot_id'), 'name': item_data.get('name')}
+            record.update((key, None if value != value else value) for key, value in zip(keys, values))
+            records.append(record)
+        return records
+
+
+def _float_list(text):
+    return [float(value) for value in text.split(',')] if text else None
+
+
+def main(argv=None):
+    """카탈로그 시뮬레이션 실행"""
+    import argparse
+    import time
+
+    from batch_processor import iter_items
+
+    parser = argparse.ArgumentParser(description="환율/관세/시세 변동 수익률 시뮬레이션")
+    parser.add_argument('--input', required=True, help="카탈로그 파일 (JSONL 또는 CSV)")
+    parser.add_argument('--output', default='simulation.jsonl', help="아이템별 결과 JSONL")
+    parser.add_argument('--scenarios', type=int, default=10000, help="몬테카를로 시나리오 수")
+    parser.add_argument('--rate-vol', type=float, default=0.05, help="환율 로그 변동성")
+    parser.add_argument('--drift-vol', type=float, default=0.1, help="국내 시세(시장 전체) 로그 변동성")
+    parser.add_argument('--item-vol', type=float, default=0.0, help="아이템별 국내 시세 로그 변동성")
+    parser.add_argument('--rates', help="그리드 모드: 환율 목록 (쉼표 구분)")
+    parser.add_argument('--customs', help="관세율 목록 (쉼표 구분)")
+    parser.add_argument('--drifts', help="그리드 모드: 국내 시세 배율 목록 (쉼표 구분)")
+    parser.add_argument('--percentiles', default='5,50,95')
+    parser.add_argument('--max-cells', type=int, default=DEFAULT_MAX_CELLS)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    simulator = MarginSimulator(percentiles=_float_list(args.percentiles), max_cells=args.max_cells)
+    if args.rates or args.drifts:
+        scenarios = simulator.grid(_float_list(args.rates), _float_list(args.customs), _float_list(args.drifts))
+    else:
+        scenarios = simulator.monte_carlo(args.scenarios, args.rate_vol, args.drift_vol,
+                                          _float_list(args.customs), args.seed)
+
+    items = list(iter_items(args.input))
+    start = time.perf_counter()
+    results = simulator.simulate(items, scenarios, args.item_vol, args.seed)
+    elapsed = time.perf_counter() - start
+
+    with open(args.output, 'w', encoding='utf-8') as out:
+        for record in simulator.to_records(items, results):
+            out.write(json.dumps(record, ensure_ascii=False))
+            out.write('\n')
+
+    profit = results['portfolio_profit']
+    logger.info("✅ %s개 × %s개 시나리오 → %s (%.2f초)", f"{len(items):,}",
+                f"{len(scenarios['exchange_rate']):,}", args.output, elapsed)
+    logger.info("📉 카탈로그 전체 이익 p5 %s원 / p50 %s원 / 손실 확률 %.1f%%",
+                f"{np.percentile(profit, 5):,.0f}", f"{np.percentile(profit, 50):,.0f}",
+                (profit < 0).mean() * 100)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,114 +5,300 @@
 아이템 정보를 바탕으로 최적의 마케팅 전략 결정
 """
 
+from lazy_import import lazy_import
+from records import Item, StrategyDecision
+
+np = lazy_import('numpy')
+
+DEFAULT_STRATEGY = '기본_영수증스타일'
+SEASONAL_STRATEGY = '겨울준비_시즌선점'
+
+# 전략별 선택 이유 (str.format 필드: month, category, total_cost, domestic_price, season_prefix)
+REASONING_TEMPLATES = {
+    '겨울준비_시즌선점': "가을({month}월)에 {category} 아이템은 겨울 준비 수요가 높아 시즌 선점 투자로 적합합니다.",
+    '핑계불가_소액투자': "총 매입가 {total_cost:,}원으로 소액 투자에 적합하며, 실패해도 부담이 적습니다.",
+    '묶음판매_개당단가': "묶음 판매로 개당 단가를 높여 수익률을 극대화할 수 있습니다.",
+    '수리후재판매_사업가관점': "수리 후 재판매로 원가 대비 높은 수익을 얻을 수 있습니다.",
+    '역수출_차익거래': "{season_prefix}국내 시세 {domestic_price:,}원 대비 매입가 {total_cost:,}원으로 역수출 기회가 있습니다.",
+    '기본_영수증스타일': "투명한 가격 공개로 신뢰도를 높이고 고객을 확보할 수 있습니다."
+}
+
 class StrategyAnalyzer:
-    def __init__(self):
-        self.strategies = {
-            '겨울준비_시즌선점': {
-                'conditions': ['아우터/머플러', '가을/겨울'],
-                'months': [8, 9, 10, 11, 12],
+    def __init__(self, strategies=None, demand_curves=None):
+        # 카테고리별 월 수요 곡선 (sales_history.SalesHistory.demand_curves, 없으면 설정의 기본 월 목록 사용)
+        self.demand_curves = demand_curves or {}
+        # conditions: 조건 키는 모두 만족(match='all') 또는 하나만 만족(match='any')
+        # priority가 낮은 전략부터 검사하며, 조건이 없는 전략은 기본 전략
+        self.strategies = strategies or {
+            SEASONAL_STRATEGY: {
+                'priority': 1,
+                'conditions': {
+                    # 앞으로 months_ahead개월 평균 수요 지수가 min_index 이상인 카테고리/월
+                    # (수요 곡선이 없는 카테고리는 categories × months)
+                    'seasonal_demand': {
+                        'months_ahead': 3,
+                        'min_index': 1.2,
+                        'categories': ['아우터/머플러', '부츠', '가방'],
+                        'months': [8, 9, 10, 11, 12]
+                    }
+                },
                 'angle': '시즌 선점 투자',
                 'personas': ['mz', 'startup', 'sidehustle']
             },
             '핑계불가_소액투자': {
-                'conditions': ['저가', '소액'],
-                'max_price': 50000,
+                'priority': 2,
+                'conditions': {'max_total_cost': 50000},
                 'angle': '핑계 불가 소액 투자',
                 'personas': ['mz', 'sidehustle']
             },
             '묶음판매_개당단가': {
-                'conditions': ['묶음', 'F등급'],
+                'priority': 3,
+                'conditions': {'name_keywords': ['묶음'], 'ranks': ['F']},
+                'match': 'any',
                 'angle': '묶음 판매로 개당 단가 높이기',
                 'personas': ['sidehustle', 'business']
             },
             '수리후재판매_사업가관점': {
-                'conditions': ['수리필요', 'Immovable'],
+                'priority': 4,
+                'conditions': {'notes_keywords': ['immovable', '수리']},
                 'angle': '수리 후 재판매로 수익 극대화',
                 'personas': ['business', 'sidehustle']
             },
             '역수출_차익거래': {
-                'conditions': ['역수출'],
+                'priority': 5,
+                'conditions': {'max_cost_to_domestic_ratio': 0.7},
                 'angle': '국내보다 해외가 비싼 역수출 기회',
                 'personas': ['business', 'startup']
             },
-            '기본_영수증스타일': {
-                'conditions': ['기본'],
+            DEFAULT_STRATEGY: {
+                'priority': 99,
+                'conditions': {},
                 'angle': '영수증 스타일 투명한 가격 공개',
                 'personas': ['mz', 'sidehustle', 'startup']
             }
         }
+        self.decision_table, self.default_strategy = self._compile_decision_table(self.strategies)
+    
+    def _compile_decision_table(self, strategies):
+        """전략 설정을 우선순위 순 결정 테이블로 컴파일"""
+        table = []
+        default_strategy = None
+        
+        for name, config in sorted(strategies.items(), key=lambda entry: entry[1].get('priority', 99)):
+            conditions = config.get('conditions', {})
+            if not conditions:
+                default_strategy = default_strategy or name
+                continue
+            
+            match = config.get('match', 'all')
+            if match not in ('all', 'any'):
+                raise ValueError(f"{name}: match는 'all' 또는 'any'여야 합니다: {match}")
+            
+            checks = [self._compile_condition(name, key, value) for key, value in conditions.items()]
+            table.append((name, match == 'all', checks))
+        
+        if default_strategy is None:
+            raise ValueError("조건이 없는 기본 전략이 필요합니다.")
+        
+        return table, default_strategy
+    
+    def _compile_condition(self, strategy_name, key, value):
+        """조건 하나를 (단건 판정 함수, 배열 판정 함수) 쌍으로 변환"""
+        if key == 'categories':
+            allowed = frozenset(value)
+            return (lambda f: f['category'] in allowed,
+                    lambda c: np.isin(c['category'], list(allowed)))
+        if key == 'months':
+            allowed = frozenset(value)
+            return (lambda f: f['month'] in allowed,
+                    lambda c: np.isin(c['month'], list(allowed)))
+        if key == 'ranks':
+            allowed = frozenset(value)
+            return (lambda f: f['rank'] in allowed,
+                    lambda c: np.isin(c['rank'], list(allowed)))
+        if key == 'seasonal_demand':
+            pairs = self._seasonal_pairs(value)
+            pair_keys = [f"{category}|{month}" for category, month in pairs]
+            return (lambda f: (f['category'], f['month']) in pairs,
+                    lambda c: np.isin(np.char.add(np.char.add(c['category'], '|'), c['month'].astype(str)),
+                                      pair_keys))
+        if key == 'max_total_cost':
+            return (lambda f: f['total_cost'] < value,
+                    lambda c: c['total_cost'] < value)
+        if key == 'min_total_cost':
+            return (lambda f: f['total_cost'] >= value,
+                    lambda c: c['total_cost'] >= value)
+        if key == 'max_cost_to_domestic_ratio':
+            return (lambda f: f['domestic_price'] > 0 and f['total_cost'] < f['domestic_price'] * value,
+                    lambda c: (c['domestic_price'] > 0) & (c['total_cost'] < c['domestic_price'] * value))
+        if key in ('name_keywords', 'notes_keywords'):
+            field = key.split('_')[0]
+            keywords = tuple(keyword.lower() for keyword in value)
+            return (lambda f: any(keyword in f[field] for keyword in keywords),
+                    lambda c: np.logical_or.reduce([np.char.find(c[field], keyword) >= 0 for keyword in keywords]))
+        raise ValueError(f"{strategy_name}: 알 수 없는 조건 '{key}'")
+    
+    def upcoming_demand(self, category, month, months_ahead):
+        """수요 곡선 기준 month 다음 months_ahead개월의 평균 수요 지수 (곡선이 없거나 월이 잘못되면 None)"""
+        curve = self.demand_curves.get(category)
+        if curve is None or not 1 <= month <= 12:
+            return None
+        demand = curve['demand']
+        return sum(demand[(month + offset - 1) % 12] for offset in range(1, months_ahead + 1)) / months_ahead
+    
+    def price_factor(self, category, month):
+        """카테고리/월의 시세 지수 (월 평균 판매가 / 연평균, 곡선이 없으면 1)"""
+        curve = self.demand_curves.get(category)
+        if curve is None or not 1 <= month <= 12:
+            return 1.0
+        return curve['price_index'][month - 1]
+    
+    def seasonal_domestic_price(self, item):
+        """판매 월 시세 지수로 보정한 국내 시세 (마진 조건과 근거 문구에 사용)"""
+        if not self.demand_curves:
+            return item.domestic_price_krw
+        return int(item.domestic_price_krw * self.price_factor(item.category, item.month))
+    
+    def _seasonal_pairs(self, params):
+        """seasonal_demand 조건을 만족하는 (카테고리, 월) 집합 (수요 곡선은 생성 시 한 번만 평가)"""
+        months_ahead = params.get('months_ahead', 3)
+        min_index = params.get('min_index', 1.2)
+        pairs = {
+            (category, month)
+            for category in self.demand_curves
+            for month in range(1, 13)
+            if self.upcoming_demand(category, month, months_ahead) >= min_index
+        }
+        pairs.update(
+            (category, month)
+            for category in params.get('categories', ())
+            if category not in self.demand_curves
+            for month in params.get('months', ())
+        )
+        return frozenset(pairs)
     
     def analyze_strategy(self, item_data, calculated_price):
         """아이템 정보를 바탕으로 최적 전략 분석"""
-        item_name = item_data.get('name', '').lower()
-        category = item_data.get('category', '')
-        month = item_data.get('month', 0)
-        rank = item_data.get('rank', '')
-        notes = item_data.get('notes', '').lower()
+        item = Item.coerce(item_data)
         total_cost = calculated_price['total_cost_krw']
-        domestic_price = item_data.get('domestic_price_krw', 0)
-        
-        # 1. 계절성 분석
-        if self._is_winter_prep_item(category, month):
-            return self._create_strategy_result('겨울준비_시즌선점', item_data, calculated_price)
+        return self._create_strategy_result(self._classify(item, total_cost), item, total_cost).to_dict()
+    
+    def decide(self, item, price):
+        """Item/PriceBreakdown 레코드로 최적 전략 분석 (StrategyDecision 레코드 반환)"""
+        total_cost = price.total_cost_krw
+        return self._create_strategy_result(self._classify(item, total_cost), item, total_cost)
+    
+    def classify(self, item_data, total_cost):
+        """결정 테이블을 순서대로 평가해 전략 이름 반환"""
+        return self._classify(Item.coerce(item_data), total_cost)
+    
+    def _classify(self, item, total_cost):
+        features = {
+            'name': item.name.lower(),
+            'notes': item.notes.lower(),
+            'category': item.category,
+            'month': item.month,
+            'rank': item.rank,
+            'total_cost': total_cost,
+            'domestic_price': self.seasonal_domestic_price(item) if self.demand_curves else item.domestic_price_krw
+        }
         
-        # 2. 가격대 분석
-        if total_cost < 50000:
-            return self._create_strategy_result('핑계불가_소액투자', item_data, calculated_price)
+        for strategy_name, match_all, checks in self.decision_table:
+            if match_all:
+                if all(check(features) for check, _ in checks):
+                    return strategy_name
+            elif any(check(features) for check, _ in checks):
+                return strategy_name
         
-        # 3. 등급/상태 분석
-        if '묶음' in item_name or rank == 'F':
-            return self._create_strategy_result('묶음판매_개당단가', item_data, calculated_price)
+        return self.default_strategy
+    
+    def classify_batch(self, items, total_costs):
+        """아이템 묶음 전체의 전략을 배열 연산으로 한 번에 결정"""
+        items = [Item.coerce(item) for item in items]
+        count = len(items)
+        columns = {
+            'name': np.char.lower(np.array([item.name for item in items], dtype=str)),
+            'notes': np.char.lower(np.array([item.notes for item in items], dtype=str)),
+            'category': np.array([item.category for item in items], dtype=str),
+            'month': np.fromiter((item.month for item in items), dtype=np.int64, count=count),
+            'rank': np.array([item.rank for item in items], dtype=str),
+            'total_cost': np.asarray(total_costs, dtype=np.float64),
+            'domestic_price': np.fromiter(
+                (item.domestic_price_krw or 0 for item in items), dtype=np.float64, count=count)
+        }
+        if self.demand_curves:
+            # 시세 지수 보정 후 단건 경로와 같도록 정수로 내림
+            factors = np.fromiter((self.price_factor(item.category, item.month) for item in items),
+                                  dtype=np.float64, count=count)
+            columns['domestic_price'] = np.floor(columns['domestic_price'] * factors)
         
-        if 'immovable' in notes or '수리' in notes:
-            return self._create_strategy_result('수리후재판매_사업가관점', item_data, calculated_price)
+        names = [self.default_strategy]
+        assigned = np.zeros(count, dtype=np.int64)
+        undecided = np.ones(count, dtype=bool)
         
-        # 4. 역수출 분석
-        if domestic_price > 0 and total_cost < domestic_price * 0.7:
-            return self._create_strategy_result('역수출_차익거래', item_data, calculated_price)
+        for index, (strategy_name, match_all, checks) in enumerate(self.decision_table, 1):
+            masks = [vector_check(columns) for _, vector_check in checks]
+            mask = np.logical_and.reduce(masks) if match_all else np.logical_or.reduce(masks)
+            hit = mask & undecided
+            assigned[hit] = index
+            undecided &= ~hit
+            names.append(strategy_name)
         
-        # 5. 기본 전략
-        return self._create_strategy_result('기본_영수증스타일', item_data, calculated_price)
+        return np.array(names, dtype=object)[assigned]
     
-    def _is_winter_prep_item(self, category, month):
-        """겨울 준비 아이템인지 확인"""
-        winter_categories = ['아우터/머플러', '부츠', '가방']
-        winter_months = [8, 9, 10, 11, 12]
+    def analyze_strategy_batch(self, items, calculated_prices):
+        """calculate_total_cost_batch 결과와 함께 전략 결과 리스트 생성"""
+        return [decision.to_dict() for decision in self.decide_batch(items, calculated_prices)]
+    
+    def decide_batch(self, items, calculated_prices):
+        """calculate_total_cost_batch 결과와 함께 StrategyDecision 레코드 리스트 생성"""
+        items = [Item.coerce(item) for item in items]
+        total_costs = np.asarray(calculated_prices['total_cost_krw'], dtype=np.int64)
+        strategy_names = self.classify_batch(items, total_costs)
         
-        return category in winter_categories and month in winter_months
+        return [
+            self._create_strategy_result(strategy_name, item, total_cost)
+            for item, strategy_name, total_cost in zip(items, strategy_names, total_costs.tolist())
+        ]
     
-    def _create_strategy_result(self, strategy_name, item_data, calculated_price):
+    def _create_strategy_result(self, strategy_name, item, total_cost):
         """전략 결과 생성"""
         strategy = self.strategies[strategy_name]
         
-        return {
-            'strategy_name': strategy_name,
-            'angle': strategy['angle'],
-            'recommended_personas': strategy['personas'],
-            'reasoning': self._generate_reasoning(strategy_name, item_data, calculated_price),
-            'key_points': self._extract_key_points(strategy_name, item_data, calculated_price)
-        }
+        return StrategyDecision(
+            strategy_name,
+            strategy['angle'],
+            strategy['personas'],
+            self._generate_reasoning(strategy_name, item, total_cost),
+            self._extract_key_points(strategy_name, item, total_cost)
+        )
     
-    def _generate_reasoning(self, strategy_name, item_data, calculated_price):
+    def _generate_reasoning(self, strategy_name, item, total_cost):
         """전략 선택 이유 생성"""
-        total_cost = calculated_price['total_cost_krw']
-        domestic_price = item_data.get('domestic_price_krw', 0)
+        if strategy_name == SEASONAL_STRATEGY:
+            params = self.strategies[strategy_name]['conditions'].get('seasonal_demand', {})
+            months_ahead = params.get('months_ahead', 3)
+            demand = self.upcoming_demand(item.category, item.month, months_ahead)
+            if demand is not None:
+                return (f"판매 이력상 {item.category} 아이템은 {item.month}월 이후 {months_ahead}개월 수요가 "
+                        f"평균의 {demand:.1f}배로 높아 시즌 선점 투자로 적합합니다.")
         
-        reasoning_templates = {
-            '겨울준비_시즌선점': f"가을({item_data.get('month', 0)}월)에 {item_data.get('category', '')} 아이템은 겨울 준비 수요가 높아 시즌 선점 투자로 적합합니다.",
-            '핑계불가_소액투자': f"총 매입가 {total_cost:,}원으로 소액 투자에 적합하며, 실패해도 부담이 적습니다.",
-            '묶음판매_개당단가': f"묶음 판매로 개당 단가를 높여 수익률을 극대화할 수 있습니다.",
-            '수리후재판매_사업가관점': f"수리 후 재판매로 원가 대비 높은 수익을 얻을 수 있습니다.",
-            '역수출_차익거래': f"국내 시세 {domestic_price:,}원 대비 매입가 {total_cost:,}원으로 역수출 기회가 있습니다.",
-            '기본_영수증스타일': f"투명한 가격 공개로 신뢰도를 높이고 고객을 확보할 수 있습니다."
-        }
-        
-        return reasoning_templates.get(strategy_name, "기본 전략을 적용합니다.")
+        template = REASONING_TEMPLATES.get(strategy_name)
+        if template is None:
+            return "기본 전략을 적용합니다."
+        # 선택된 전략의 문구만 포맷
+        domestic_price = self.seasonal_domestic_price(item)
+        return template.format(
+            month=item.month,
+            category=item.category,
+            total_cost=total_cost,
+            domestic_price=domestic_price,
+            season_prefix='시즌 보정 ' if domestic_price != item.domestic_price_krw else ''
+        )
     
-    def _extract_key_points(self, strategy_name, item_data, calculated_price):
+    def _extract_key_points(self, strategy_name, item, total_cost):
         """핵심 포인트 추출"""
-        total_cost = calculated_price['total_cost_krw']
-        domestic_price = item_data.get('domestic_price_krw', 0)
+        domestic_price = item.domestic_price_krw
         
         key_points = {
             'price_info': f"매입가: {total_cost:,}원",
@@ -120,4 +306,13 @@ class StrategyAnalyzer:
             'strategy_focus': self.strategies[strategy_name]['angle']
         }
         
+        curve = self.demand_curves.get(item.category)
+        if curve is not None and 1 <= item.month <= 12:
+            month_index = item.month - 1
+            key_points['season_info'] = (f"{item.month}월 수요 지수 {curve['demand'][month_index]:.2f}, "
+                                         f"평균 판매 기간 {curve['avg_days'][month_index]:.0f}일")
+            if domestic_price > 0:
+                seasonal_price = self.seasonal_domestic_price(item)
+                key_points['seasonal_profit_info'] = f"시즌 시세 보정 예상 수익: {seasonal_price - total_cost:,}원"
+        
         return key_points
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+합성 카탈로그 생성 모듈
+벤치마크/부하 테스트용으로 6가지 전략과 모든 카테고리를 고루 포함하는 아이템 생성
+"""
+
+import json
+import random
+
+from exchange_rate import DEFAULT_RATES
+from records import LEGACY_JPY_UNIT
+
+CATEGORIES = ['아우터/머플러', '부츠', '가방', '시계', '주얼리', '지갑', '신발', '의류']
+WINTER_CATEGORIES = ['아우터/머플러', '부츠', '가방']
+OTHER_CATEGORIES = [category for category in CATEGORIES if category not in WINTER_CATEGORIES]
+WINTER_MONTHS = [8, 9, 10, 11, 12]
+OTHER_MONTHS = [1, 2, 3, 4, 5, 6, 7]
+
+BRANDS = {
+    'Burberry': ['트렌치코트', '체크 머플러', '퀼팅 자켓', '노바체크 가방'],
+    'Chanel': ['클래식 플랩백', '보이백', '트위드 자켓', '카드지갑'],
+    'Hermes': ['버킨백', '켈리백', '오란 샌들', '실크 스카프'],
+    'Louis Vuitton': ['스피디 30', '네버풀 MM', '모노그램 지갑', '앵클 부츠'],
+    'Gucci': ['마몬트 숄더백', '홀스빗 로퍼', '디오니서스 지갑', '에이스 스니커즈'],
+    'Prada': ['리나일론 백팩', '사피아노 지갑', '패딩 자켓', '첼시 부츠'],
+    'Rolex': ['서브마리너', '데이저스트', '익스플로러'],
+    'Cartier': ['탱크 머스트', '러브 팔찌', '산토스 워치']
+}
+RANKS = ['S', 'A', 'B', 'C', 'D', 'F']
+# 판매 기록 모델명 변형 (색상/소재/사이즈)
+COLORS = ['', '블랙', '베이지', '네이비', '브라운', '화이트', '레드', '카키', '그레이', '핑크', '골드', '실버']
+MATERIALS = ['', '레더', '캔버스', '스웨이드', '캐시미어', '울', '나일론', '페이턴트']
+SIZES = ['', 'small', 'medium', 'large', 'mini', '30']
+RANK_PRICE_FACTORS = {'S': 1.3, 'A': 1.15, 'B': 1.0, 'C': 0.85, 'D': 0.7, 'F': 0.5}
+# 판매 이력 월별 수요 가중치 (1월부터, 겨울 카테고리는 10~1월, 시계/주얼리는 12월·5월 선물 시즌)
+WINTER_DEMAND = [1.6, 0.9, 0.6, 0.5, 0.4, 0.4, 0.4, 0.6, 0.9, 1.5, 2.0, 2.2]
+GIFT_DEMAND = [0.9, 1.0, 0.9, 0.9, 1.4, 0.8, 0.7, 0.7, 0.8, 0.9, 1.1, 1.9]
+FLAT_DEMAND = [1.0] * 12
+# 다통화 카탈로그에서 엔화 대신 쓸 경매 통화
+FOREIGN_CURRENCIES = ['USD', 'EUR', 'HKD']
+NOTES = ['', '클래식한 디자인', '가을 신상', '약간의 사용감', '희귀 모델', '보증서 있음', 'vintage 감성']
+
+STRATEGY_WEIGHTS = {
+    '겨울준비_시즌선점': 0.25,
+    '핑계불가_소액투자': 0.10,
+    '묶음판매_개당단가': 0.10,
+    '수리후재판매_사업가관점': 0.10,
+    '역수출_차익거래': 0.20,
+    '기본_영수증스타일': 0.25
+}
+
+# PriceCalculator 기본값 기준 경매가 1단위당 총 매입가 (9.0 * 100 * 1.14)
+COST_PER_UNIT = 1026
+
+
+def _auction_price(rng, low=50, high=20000):
+    """로그정규 분포 경매가 (대부분 수백~수천, 가끔 고가)"""
+    return int(min(high, max(low, rng.lognormvariate(7.0, 1.0))))
+
+
+def _make_item(rng, strategy_name, index):
+    brand = rng.choice(list(BRANDS))
+    name = f"{brand} {rng.choice(BRANDS[brand])}"
+    item = {
+        'lot_id': f"SYN-{index:08d}",
+        'name': name,
+        'brand': brand,
+        'auction_price_jpy': _auction_price(rng),
+        'rank': rng.choice(RANKS[:5]),
+        'month': rng.choice(OTHER_MONTHS),
+        'category': rng.choice(OTHER_CATEGORIES),
+        'notes': rng.choice(NOTES)
+    }
+
+    if strategy_name == '겨울준비_시즌선점':
+        item['category'] = rng.choice(WINTER_CATEGORIES)
+        item['month'] = rng.choice(WINTER_MONTHS)
+    elif strategy_name == '핑계불가_소액투자':
+        item['auction_price_jpy'] = rng.randint(5, 45)
+    elif strategy_name == '묶음판매_개당단가':
+        if rng.random() < 0.5:
+            item['name'] = f"{name} {rng.randint(2, 10)}개 묶음"
+        else:
+            item['rank'] = 'F'
+    elif strategy_name == '수리후재판매_사업가관점':
+        item['notes'] = rng.choice(['수리 필요', '지퍼 수리', 'Immovable 잠금장치', '수리 후 판매 가능'])
+    elif strategy_name == '역수출_차익거래':
+        cost = item['auction_price_jpy'] * COST_PER_UNIT
+        item['domestic_price_krw'] = int(cost * rng.uniform(1.5, 3.0))
+        return item
+
+    # 국내 시세: 대부분 매입가 근처, 일부는 누락
+    if rng.random() < 0.85:
+        cost = item['auction_price_jpy'] * COST_PER_UNIT
+        item['domestic_price_krw'] = int(cost * rng.uniform(0.8, 1.4))
+    return item
+
+
+def generate_items(count, seed=0, strategy_weights=None):
+    """재현 가능한 합성 아이템 제너레이터"""
+    rng = random.Random(seed)
+    weights = strategy_weights or STRATEGY_WEIGHTS
+    names = list(weights)
+    cumulative = list(weights.values())
+
+    for index in range(count):
+        strategy_name = rng.choices(names, cumulative)[0]
+        yield _make_item(rng, strategy_name, index)
+
+
+def to_currency(item, currency):
+    """auction_price_jpy(100엔 단위) 아이템을 기본 환율로 원화 경매가가 같은 (auction_price, currency) 아이템으로 변환"""
+    item = dict(item)
+    krw_price = item.pop('auction_price_jpy') * LEGACY_JPY_UNIT * DEFAULT_RATES['JPY']
+    item['auction_price'] = round(krw_price / DEFAULT_RATES[currency], 2)
+    item['currency'] = currency
+    return item
+
+
+def mix_currencies(items, currencies=FOREIGN_CURRENCIES, share=0.5, seed=0):
+    """아이템 중 share 비율을 currencies 중 하나로 바꾼 다통화 카탈로그 (나머지는 그대로)"""
+    rng = random.Random(seed)
+    for item in items:
+        if rng.random() < share:
+            item = to_currency(item, rng.choice(currencies))
+        yield item
+
+
+def generate_sales(count, seed=0):
+    """재현 가능한 과거 판매 기록 제너레이터 (brand, model, rank, price_krw)
+
+    모델 기준가는 (브랜드, 기본 모델, 변형)마다 고정하고 랭크 계수와 ±15% 잡음을 곱한다.
+    """
+    rng = random.Random(seed)
+    base_prices = {}
+    brands = list(BRANDS)
+    for _ in range(count):
+        brand = rng.choice(brands)
+        model = ' '.join(part for part in (rng.choice(BRANDS[brand]), rng.choice(MATERIALS),
+                                           rng.choice(COLORS), rng.choice(SIZES)) if part)
+        base = base_prices.get((brand, model))
+        if base is None:
+            base = base_prices[brand, model] = rng.randint(20, 800) * 10000
+        rank = rng.choice(RANKS)
+        price = int(base * RANK_PRICE_FACTORS[rank] * rng.uniform(0.85, 1.15)) // 1000 * 1000
+        yield {'brand': brand, 'model': model, 'rank': rank, 'price_krw': price}
+
+
+def generate_history(count, seed=0):
+    """재현 가능한 판매 이력 제너레이터 (brand, category, month, price_krw, days_to_sell)
+
+    수요가 많은 달일수록 판매 기간은 짧고 판매가는 조금 높다.
+    """
+    rng = random.Random(seed)
+    demand = {category: WINTER_DEMAND if category in WINTER_CATEGORIES
+              else GIFT_DEMAND if category in ('시계', '주얼리') else FLAT_DEMAND
+              for category in CATEGORIES}
+    months = list(range(1, 13))
+    brands = list(BRANDS)
+    for _ in range(count):
+        category = rng.choice(CATEGORIES)
+        month = rng.choices(months, demand[category])[0]
+        weight = demand[category][month - 1]
+        yield {
+            'brand': rng.choice(brands),
+            'category': category,
+            'month': month,
+            'price_krw': int(rng.randint(20, 800) * 10000 * (0.9 + 0.1 * weight)) // 1000 * 1000,
+            'days_to_sell': round(rng.uniform(5, 60) / weight, 1)
+        }
+
+
+def write_sales_csv(path, count, seed=0):
+    """합성 판매 기록을 CSV로 저장 (price_index 입력 형식)"""
+    import csv
+
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['brand', 'model', 'rank', 'price_krw'])
+        writer.writeheader()
+        writer.writerows(generate_sales(count, seed))
+
+
+def write_history_csv(path, count, seed=0):
+    """합성 판매 이력을 CSV로 저장 (sales_history 입력 형식)"""
+    import csv
+
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['brand', 'category', 'month', 'price_krw', 'days_to_sell'])
+        writer.writeheader()
+        writer.writerows(generate_history(count, seed))
+
+
+def write_catalog(path, count, seed=0, currencies=None, foreign_share=0.5):
+    """합성 카탈로그를 JSONL로 저장 (currencies를 주면 foreign_share 비율을 해당 통화 경매가로)"""
+    items = generate_items(count, seed)
+    if currencies:
+        items = mix_currencies(items, currencies, foreign_share, seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        for item in items:
+            f.write(json.dumps(item, ensure_ascii=False))
+            f.write('\n')
+
+
+def main():
+    """합성 카탈로그 파일 생성"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="합성 카탈로그 생성")
+    parser.add_argument('--count', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='synthetic_catalog.jsonl')
+    parser.add_argument('--sales', action='store_true', help="카탈로그 대신 과거 판매 기록 CSV 생성 (시세 인덱스용)")
+    parser.add_argument('--history', action='store_true', help="카탈로그 대신 판매 이력 CSV 생성 (수요 곡선용)")
+    parser.add_argument('--currencies', help=f"다통화 카탈로그 경매 통화 (쉼표 구분, 예: {','.join(FOREIGN_CURRENCIES)})")
+    parser.add_argument('--foreign-share', type=float, default=0.5, help="--currencies 통화로 바꿀 아이템 비율")
+    args = parser.parse_args()
+
+    if args.history:
+        write_history_csv(args.output, args.count, args.seed)
+        print(f"✅ 판매 이력 {args.count:,}건 → {args.output}")
+        return
+    if args.sales:
+        write_sales_csv(args.output, args.count, args.seed)
+        print(f"✅ 판매 기록 {args.count:,}건 → {args.output}")
+        return
+    currencies = args.currencies.upper().split(',') if args.currencies else None
+    write_catalog(args.output, args.count, args.seed, currencies, args.foreign_share)
+    print(f"✅ {args.count:,}개 아이템 → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
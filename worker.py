@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+상주 워커 모듈
+CasaTradeAIMarketer를 한 번만 생성해 두고 stdin 또는 유닉스 소켓으로 들어오는 아이템을 처리
+"""
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import sys
+
+from records import json_default
+
+logger = logging.getLogger('casatrade.worker')
+
+
+def handle_line(marketer, line):
+    """JSON 한 줄을 처리해 결과 JSON 한 줄 반환 (오류도 JSON으로 응답)"""
+    try:
+        item = json.loads(line)
+        result = marketer.process_item(item)
+    except Exception as e:
+        logger.exception("아이템 처리 실패")
+        result = {'error': f"{type(e).__name__}: {e}"}
+    return json.dumps(result, ensure_ascii=False, default=json_default) + '\n'
+
+
+def serve_stream(marketer, reader, writer):
+    """줄 단위 JSONL 요청/응답 루프 (응답마다 flush)"""
+    count = 0
+    for line in reader:
+        if not line.strip():
+            continue
+        writer.write(handle_line(marketer, line))
+        writer.flush()
+        count += 1
+    return count
+
+
+def serve_stdin(marketer):
+    """stdin으로 아이템을 받아 stdout으로 결과 출력"""
+    return serve_stream(marketer, sys.stdin, sys.stdout)
+
+
+class _ItemHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        reader = (line.decode('utf-8') for line in self.rfile)
+        writer = _SocketWriter(self.wfile)
+        serve_stream(self.server.marketer, reader, writer)
+
+
+class _SocketWriter:
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def write(self, text):
+        self.wfile.write(text.encode('utf-8'))
+
+    def flush(self):
+        self.wfile.flush()
+
+
+class WorkerServer(socketserver.UnixStreamServer):
+    """유닉스 소켓 워커 (마케터 인스턴스를 공유하므로 연결을 순서대로 처리)"""
+
+    def __init__(self, path, marketer):
+        if os.path.exists(path):
+            os.unlink(path)
+        self.marketer = marketer
+        super().__init__(path, _ItemHandler)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+
+def serve_socket(marketer, path):
+    """유닉스 소켓에서 연결을 받아 처리 (Ctrl+C로 종료)"""
+    with WorkerServer(path, marketer) as server:
+        logger.info("🔌 워커 대기 중: %s", path)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def request_items(path, items):
+    """실행 중인 워커 소켓에 아이템을 보내고 결과를 순서대로 반환"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        with sock.makefile('rwb') as stream:
+            results = []
+            for item in items:
+                stream.write(json.dumps(item, ensure_ascii=False).encode('utf-8') + b'\n')
+                stream.flush()
+                results.append(json.loads(stream.readline()))
+            return results